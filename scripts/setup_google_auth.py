@@ -29,12 +29,16 @@ from src.firestore.firestore_client import FirestoreClient
 
 
 def detect_data_uid(fc: FirestoreClient) -> str:
-    """Firestore の既存コレクションから data_uid (ドキュメントID) を自動検出"""
+    """
+    Firestore の既存コレクションから data_uid (ドキュメントID) を自動検出
+
+    表示に使うフィールドだけを select で取得する（ダッシュボードデータ本体や APIキーは読まない）。
+    """
     db = fc._get_db()
 
     # dashboard_data コレクションから検出
     print("  🔍 dashboard_data コレクションを検索中...")
-    docs = list(db.collection("dashboard_data").limit(5).stream())
+    docs = list(db.collection("dashboard_data").select(["updated_at"]).limit(5).stream())
     if docs:
         for doc in docs:
             print(f"     発見: {doc.id}")
@@ -55,7 +59,9 @@ def detect_data_uid(fc: FirestoreClient) -> str:
 
     # api_keys コレクションから検出
     print("  🔍 api_keys コレクションを検索中...")
-    docs = list(db.collection("api_keys").limit(5).stream())
+    # ドキュメントIDだけを射影する（空の select([]) は全フィールドを返すため使わない）
+    from google.cloud.firestore_v1.field_path import FieldPath
+    docs = list(db.collection("api_keys").select([FieldPath.document_id()]).limit(5).stream())
     if docs:
         for doc in docs:
             print(f"     発見: {doc.id}")
@@ -64,7 +70,7 @@ def detect_data_uid(fc: FirestoreClient) -> str:
 
     # users コレクションから検出
     print("  🔍 users コレクションを検索中...")
-    docs = list(db.collection("users").limit(5).stream())
+    docs = list(db.collection("users").select(["twitterUsername"]).limit(5).stream())
     if docs:
         for doc in docs:
             data = doc.to_dict()
@@ -118,7 +124,7 @@ def main():
         return
 
     # 既存チェック
-    existing = db.collection("x_accounts").document(account_id).get()
+    existing = db.collection("x_accounts").document(account_id).get(field_paths=["allowed_emails"])
     if existing.exists:
         print(f"\n⚠️ x_accounts/{account_id} は既に存在します")
         data = existing.to_dict()
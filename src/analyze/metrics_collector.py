@@ -31,19 +31,19 @@ class MetricsCollector:
         # 最近のツイートを取得
         tweets = self.poster.get_recent_tweets(max_results=min(days * 3, 50))
 
+        # メトリクスは1リクエストでまとめて取得
+        metrics_by_id = self.poster.get_tweets_metrics([t["id"] for t in tweets])
+
         results = []
         for tweet in tweets:
-            try:
-                metrics = self.poster.get_tweet_metrics(tweet["id"])
-                results.append({
-                    "tweet_id": tweet["id"],
-                    "text": tweet["text"][:100],  # 先頭100文字
-                    "created_at": str(tweet.get("created_at", "")),
-                    **metrics,
-                    "collected_at": datetime.now(JST).isoformat()
-                })
-            except Exception as e:
-                print(f"⚠️ メトリクス取得エラー ({tweet['id']}): {e}")
+            metrics = metrics_by_id.get(str(tweet["id"]), {})
+            results.append({
+                "tweet_id": tweet["id"],
+                "text": tweet["text"][:100],  # 先頭100文字
+                "created_at": str(tweet.get("created_at", "")),
+                **metrics,
+                "collected_at": datetime.now(JST).isoformat()
+            })
 
         return results
 
@@ -15,8 +15,6 @@ from collections import Counter
 from dataclasses import dataclass, field, asdict
 from typing import Optional
 
-from google import genai
-
 from src.config import Config
 
 
@@ -169,6 +167,9 @@ class PersonaAnalyzer:
     def __init__(self, config: Config):
         self.config = config
         if config.gemini_api_key:
+            # google-genai は読み込みが重いため、APIキーがある場合のみ import
+            from google import genai
+
             self.client = genai.Client(api_key=config.gemini_api_key)
             self.model_name = config.gemini_model
         else:
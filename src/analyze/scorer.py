@@ -7,6 +7,39 @@ import re
 from dataclasses import dataclass
 
 
+# 具体性: 数字+単位 / 比較表現 / ツール名
+_NUMBER_RE = re.compile(r'\d+[時間分万円%倍個件本日週月]')
+_COMPARISON_RE = re.compile(r'[→⇒]|から|が.+に')
+_TOOL_RE = re.compile(
+    r'(Claude|ChatGPT|GAS|Gemini|note|スプシ|スプレッドシート|Python|GitHub)',
+    re.IGNORECASE
+)
+
+# 人間味: カジュアル表現 / AI感のある表現
+_CASUAL_MARKERS = (
+    'ぶっちゃけ', 'マジで', 'ガチ', 'なんだよね', 'してた',
+    'だよな', 'じゃん', 'えぐい', 'やばい', 'なんだけど',
+    '正直', '結論から', 'これは'
+)
+_AI_MARKERS = (
+    '素晴らしい', '革新的', '画期的', 'いかがでしたか',
+    '活用してみてください', '重要です', '解説します',
+    'しましょう', 'おすすめです'
+)
+
+# CTA: 末尾2行のいずれかのパターン
+_CTA_RE = re.compile("|".join([
+    r'ブクマ', r'保存', r'プロフ', r'リンク',
+    r'べき[。．]?$', r'一択[。．]?$', r'間違いない[。．]?$',
+    r'ガチ[。．]?$', r'マジ[。．]?$',
+    r'[。．]$',
+]))
+
+# ペナルティ
+_URL_RE = re.compile(r'https?://')
+_HASHTAG_RE = re.compile(r'#\S+')
+
+
 @dataclass
 class ScoreResult:
     """スコアリング結果"""
@@ -49,6 +82,28 @@ class PostScorer:
         r'^.{1,10}[。、]$',                    # 短い体言止め1行目
     ]
 
+    # 各パターン群を1つの正規表現にまとめる（呼び出しごとに再コンパイル・複数回走査しない）
+    _STRONG_HOOK_RE = re.compile("|".join(map("(?:{})".format, STRONG_HOOKS)))
+    _MEDIUM_HOOK_RE = re.compile("|".join(map("(?:{})".format, MEDIUM_HOOKS)))
+
+    @staticmethod
+    def _scan(text: str) -> dict:
+        """スコア算出に使う本文の統計をまとめて取得（各項目はこの結果だけを参照）"""
+        lines = text.strip().split('\n')
+        return {
+            "lines": lines,
+            "first_line": lines[0] if lines else "",
+            "numbers": len(_NUMBER_RE.findall(text)),
+            "has_comparison": _COMPARISON_RE.search(text) is not None,
+            "tools": len(_TOOL_RE.findall(text)),
+            "casual": sum(1 for m in _CASUAL_MARKERS if m in text),
+            "ai": sum(1 for m in _AI_MARKERS if m in text),
+            "text_len": len(text) - text.count('\n'),
+            "line_count": sum(1 for l in lines if l.strip()),
+            "has_url": _URL_RE.search(text) is not None,
+            "hashtags": len(_HASHTAG_RE.findall(text)),
+        }
+
     def score(self, text: str, post_type: str = "") -> ScoreResult:
         """
         8点満点でスコアリング
@@ -61,15 +116,16 @@ class PostScorer:
         - ペナルティ (-1 per violation)
         """
         details = {}
-        lines = text.strip().split('\n')
-        first_line = lines[0] if lines else ""
+        stats = self._scan(text)
+        lines = stats["lines"]
+        first_line = stats["first_line"]
 
         # === フック力 (0-2) ===
         hook = 0
-        if any(re.search(p, first_line) for p in self.STRONG_HOOKS):
+        if self._STRONG_HOOK_RE.search(first_line):
             hook = 2
             details["hook"] = "強フック検出"
-        elif any(re.search(p, first_line) for p in self.MEDIUM_HOOKS):
+        elif self._MEDIUM_HOOK_RE.search(first_line):
             hook = 1
             details["hook"] = "中フック検出"
         else:
@@ -77,37 +133,22 @@ class PostScorer:
 
         # === 具体性 (0-2) ===
         specificity = 0
-        numbers = re.findall(r'\d+[時間分万円%倍個件本日週月]', text)
-        comparisons = re.findall(r'[→⇒]|から|が.+に', text)
-        tools = re.findall(
-            r'(Claude|ChatGPT|GAS|Gemini|note|スプシ|スプレッドシート|Python|GitHub)',
-            text, re.IGNORECASE
-        )
+        numbers = stats["numbers"]
+        tools = stats["tools"]
 
-        if len(numbers) >= 2 or (numbers and comparisons):
+        if numbers >= 2 or (numbers and stats["has_comparison"]):
             specificity = 2
-            details["specificity"] = f"数字{len(numbers)}個, 比較表現あり"
+            details["specificity"] = f"数字{numbers}個, 比較表現あり"
         elif numbers or tools:
             specificity = 1
-            details["specificity"] = f"数字{len(numbers)}個 / ツール名{len(tools)}個"
+            details["specificity"] = f"数字{numbers}個 / ツール名{tools}個"
         else:
             details["specificity"] = "具体性不足"
 
         # === 人間味 (0-2) ===
         humanity = 0
-        casual_markers = [
-            'ぶっちゃけ', 'マジで', 'ガチ', 'なんだよね', 'してた',
-            'だよな', 'じゃん', 'えぐい', 'やばい', 'なんだけど',
-            '正直', '結論から', 'これは'
-        ]
-        ai_markers = [
-            '素晴らしい', '革新的', '画期的', 'いかがでしたか',
-            '活用してみてください', '重要です', '解説します',
-            'しましょう', 'おすすめです'
-        ]
-
-        casual_count = sum(1 for m in casual_markers if m in text)
-        ai_count = sum(1 for m in ai_markers if m in text)
+        casual_count = stats["casual"]
+        ai_count = stats["ai"]
 
         if casual_count >= 2 and ai_count == 0:
             humanity = 2
@@ -120,8 +161,8 @@ class PostScorer:
 
         # === 構成 (0-1) ===
         structure = 0
-        text_len = len(text.replace('\n', ''))
-        line_count = len([l for l in lines if l.strip()])
+        text_len = stats["text_len"]
+        line_count = stats["line_count"]
 
         if 40 <= text_len <= 280 and line_count >= 3:
             structure = 1
@@ -132,13 +173,7 @@ class PostScorer:
         # === CTA (0-1) ===
         cta = 0
         last_lines = '\n'.join(lines[-2:]) if len(lines) >= 2 else text
-        cta_patterns = [
-            r'ブクマ', r'保存', r'プロフ', r'リンク',
-            r'べき[。．]?$', r'一択[。．]?$', r'間違いない[。．]?$',
-            r'ガチ[。．]?$', r'マジ[。．]?$',
-            r'[。．]$',
-        ]
-        if any(re.search(p, last_lines) for p in cta_patterns):
+        if _CTA_RE.search(last_lines):
             cta = 1
             details["cta"] = "CTA検出"
         else:
@@ -149,15 +184,15 @@ class PostScorer:
         penalties = []
 
         # URL検出
-        if re.search(r'https?://', text):
+        if stats["has_url"]:
             penalty -= 1
             penalties.append("URL含有")
 
         # ハッシュタグ過多
-        hashtags = re.findall(r'#\S+', text)
-        if len(hashtags) > 3:
+        hashtags = stats["hashtags"]
+        if hashtags > 3:
             penalty -= 1
-            penalties.append(f"ハッシュタグ{len(hashtags)}個")
+            penalties.append(f"ハッシュタグ{hashtags}個")
 
         # 文字数オーバー
         if text_len > 280:
@@ -15,7 +15,8 @@ from __future__ import annotations
 import json
 import logging
 import os
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
@@ -23,6 +24,7 @@ from src.collect.tweet_parser import TweetParser, ParsedTweet
 from src.collect.queue_manager import QueueManager
 from src.collect.preference_scorer import PreferenceScorer
 from src.config import PROJECT_ROOT
+from src.utils import json_loads
 
 logger = logging.getLogger(__name__)
 JST = ZoneInfo("Asia/Tokyo")
@@ -31,6 +33,41 @@ JST = ZoneInfo("Asia/Tokyo")
 _KEYWORDS_PER_QUERY = 5
 _MAX_ACCOUNTS_PER_QUERY = 8
 
+# 収集対象とする言語（lang 未設定のツイートは通す）
+_ALLOWED_LANGS = frozenset({"en", "und"})
+
+
+# SocialData / X API の日時形式のバリエーション
+_TIMESTAMP_FORMATS = (
+    "%Y-%m-%dT%H:%M:%S.%fZ",     # SocialData (ISO with microseconds and Z)
+    "%Y-%m-%dT%H:%M:%S%z",       # ISO with offset (+0000)
+    "%Y-%m-%dT%H:%M:%SZ",       # ISO with Z
+    "%a %b %d %H:%M:%S %z %Y",    # X API v1.1 / v2 compatible
+)
+
+
+@lru_cache(maxsize=16384)
+def _parse_timestamp(value: str) -> datetime | None:
+    """
+    日時文字列をパース（strptime は重いため同じ文字列はキャッシュから返す）
+
+    Returns:
+        タイムゾーン付き datetime（未指定は UTC 扱い）。パース不可なら None。
+    """
+    for fmt in _TIMESTAMP_FORMATS:
+        try:
+            dt = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+    # fallback: fromisoformat（"Z" を "+00:00" に置換して読めるようにする）
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (ValueError, TypeError):
+        return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
 
 class AutoCollector:
     """バズツイートを自動収集してキューに追加する。
@@ -74,8 +111,7 @@ class AutoCollector:
         """設定ファイル読み込み"""
         # ── target_accounts.json ──
         path = PROJECT_ROOT / "config" / "target_accounts.json"
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = json_loads(path.read_bytes())
 
         self.target_accounts: list[dict] = data.get("accounts", [])
         self.keywords: list[str] = data.get("keywords", [])
@@ -87,15 +123,13 @@ class AutoCollector:
 
         # ── quote_rt_rules.json ──
         rules_path = PROJECT_ROOT / "config" / "quote_rt_rules.json"
-        with open(rules_path, "r", encoding="utf-8") as f:
-            rules = json.load(f)
+        rules = json_loads(rules_path.read_bytes())
         self.buzz_thresholds: dict = rules.get("buzz_thresholds", {})
 
         # ── selection_preferences.json（ダッシュボード設定の上書き）──
         prefs_path = PROJECT_ROOT / "config" / "selection_preferences.json"
         try:
-            with open(prefs_path, "r", encoding="utf-8") as f:
-                prefs = json.load(f)
+            prefs = json_loads(prefs_path.read_bytes())
             self.threshold_overrides: dict = prefs.get("threshold_overrides", {})
         except (FileNotFoundError, json.JSONDecodeError):
             self.threshold_overrides = {}
@@ -191,33 +225,9 @@ class AutoCollector:
         )
         print(f"🔎 フィルタ後: {len(filtered)}件 ({len(raw_tweets) - len(filtered)}件除外)")
 
-        # ── STEP 3: ParsedTweet 変換 ──
+        # ── STEP 3: ParsedTweet 変換 + ブロック除外 + プリファレンススコアリング ──
         source_name = "socialdata" if self._use_socialdata else "x_api_v2"
-        parsed_tweets: list[ParsedTweet] = []
-        for tweet_data in filtered:
-            try:
-                parsed = TweetParser.from_api_data(tweet_data, source=source_name)
-                parsed_tweets.append(parsed)
-            except Exception as exc:
-                logger.warning("パースエラー: %s", exc)
-
-        # ── STEP 3.5: プリファレンススコアリング ──
-        for tweet in parsed_tweets:
-            pref_result = self.preference_scorer.score(
-                tweet_text=tweet.text,
-                author_username=tweet.author_username,
-            )
-            tweet.preference_match_score = pref_result["preference_score"]
-            tweet.matched_topics = pref_result["matched_topics"]
-            tweet.matched_keywords = pref_result["matched_keywords"]
-
-        # ブロックアカウント除外
-        before_block = len(parsed_tweets)
-        parsed_tweets = [
-            t for t in parsed_tweets
-            if not self.preference_scorer.is_account_blocked(t.author_username)
-        ]
-        blocked_count = before_block - len(parsed_tweets)
+        parsed_tweets, blocked_count = self._parse_and_score(filtered, source_name)
         if blocked_count > 0:
             print(f"🚫 ブロックアカウント除外: {blocked_count}件")
 
@@ -231,17 +241,12 @@ class AutoCollector:
         print(f"🎯 プリファレンスマッチ: {pref_matched}/{len(parsed_tweets)}件")
 
         # ── STEP 4: キューに追加 ──
-        added = 0
+        # 既存IDとの重複は _filter_tweets で除外済み。キューの読み書きは1回にまとめる
         skipped_dup = 0
 
         if not dry_run:
-            for tweet in parsed_tweets:
-                if self.queue.add(tweet):
-                    added += 1
-                    if auto_approve:
-                        self.queue.approve(tweet.tweet_id)
-                else:
-                    skipped_dup += 1
+            added = self.queue.add_batch(parsed_tweets, approve=auto_approve)
+            skipped_dup = len(parsed_tweets) - added
         else:
             added = len(parsed_tweets)
 
@@ -411,6 +416,11 @@ class AutoCollector:
 
         excluded_lower = [t.lower() for t in self.excluded_terms]
 
+        # ループ内で参照する設定はローカル変数に束縛しておく
+        use_socialdata = self._use_socialdata
+        min_followers = self.min_followers
+        parse_created_at = self._parse_created_at
+
         # フィルタ統計
         stats = {
             "dup": 0, "likes": 0, "followers": 0, "spam": 0,
@@ -439,20 +449,19 @@ class AutoCollector:
             likes = tweet.get("favorite_count")
             if likes is None:
                 likes = tweet.get("public_metrics", {}).get("like_count")
-            if likes is None:
-                likes = 0
-            
+            likes = int(likes or 0)
+
             # SocialData 使用時はいいね数が取れないツイートはバズ判定不能として除外
-            if self._use_socialdata and int(likes) < min_likes:
+            if use_socialdata and likes < min_likes:
                 stats["likes"] += 1
                 # デバッグ用に、一定以上のいいねがあるものだけログに理由を出す
-                if int(likes) > 0:
+                if likes > 0:
                     logger.debug(f"Skipped {tid}: likes={likes} < {min_likes}")
                 continue
 
             # 3. フォロワー数チェック
             followers = int(user.get("followers_count") or user.get("follower_count") or 0)
-            if followers < self.min_followers:
+            if followers < min_followers:
                 stats["followers"] += 1
                 continue
 
@@ -463,7 +472,7 @@ class AutoCollector:
 
             # 5. 言語チェック
             tweet_lang = tweet.get("lang", "")
-            if tweet_lang and tweet_lang not in ("en", "und"):
+            if tweet_lang and tweet_lang not in _ALLOWED_LANGS:
                 stats["lang"] += 1
                 continue
 
@@ -491,7 +500,7 @@ class AutoCollector:
                 stats["age"] += 1
                 continue
 
-            created_at = self._parse_created_at(str(created_at_str))
+            created_at = parse_created_at(str(created_at_str))
             if created_at is None:
                 print(f"  ⚠️ 日付パース失敗のため除外: {created_at_str}")
                 stats["age"] += 1
@@ -528,6 +537,45 @@ class AutoCollector:
     # Internal: helpers
     # ──────────────────────────────────────────────────────────────
 
+    def _parse_and_score(
+        self,
+        tweets: list[dict],
+        source: str,
+    ) -> tuple[list[ParsedTweet], int]:
+        """フィルタ済みツイートを1パスで ParsedTweet 化・ブロック除外・スコアリングする。
+
+        ブロック対象アカウントはスコアリング前に除外する。
+
+        Returns:
+            (parsed_tweets, blocked_count)
+        """
+        scorer = self.preference_scorer
+        from_api_data = TweetParser.from_api_data
+        parsed_tweets: list[ParsedTweet] = []
+        blocked_count = 0
+
+        for tweet_data in tweets:
+            try:
+                tweet = from_api_data(tweet_data, source=source)
+            except Exception as exc:
+                logger.warning("パースエラー: %s", exc)
+                continue
+
+            if scorer.is_account_blocked(tweet.author_username):
+                blocked_count += 1
+                continue
+
+            pref_result = scorer.score(
+                tweet_text=tweet.text,
+                author_username=tweet.author_username,
+            )
+            tweet.preference_match_score = pref_result["preference_score"]
+            tweet.matched_topics = pref_result["matched_topics"]
+            tweet.matched_keywords = pref_result["matched_keywords"]
+            parsed_tweets.append(tweet)
+
+        return parsed_tweets, blocked_count
+
     def _resolve_param(
         self,
         *,
@@ -557,40 +605,7 @@ class AutoCollector:
         """
         if not value:
             return None
-        
-        # SocialData / X API 形式のバリエーション
-        formats = (
-            "%Y-%m-%dT%H:%M:%S.%fZ",     # SocialData (ISO with microseconds and Z)
-            "%Y-%m-%dT%H:%M:%S%z",       # ISO with offset (+0000)
-            "%Y-%m-%dT%H:%M:%SZ",       # ISO with Z
-            "%a %b %d %H:%M:%S %z %Y",    # X API v1.1 / v2 compatible
-        )
-        
-        clean_value = str(value).strip()
-        
-        for fmt in formats:
-            try:
-                dt = datetime.strptime(clean_value, fmt)
-                if dt.tzinfo is None:
-                    from datetime import timezone
-                    dt = dt.replace(tzinfo=timezone.utc)
-                return dt
-            except ValueError:
-                continue
-        
-        # fallback: fromisoformat (Python 3.7+)
-        try:
-            # "Z" を "+00:00" に置換して fromisoformat で読めるようにする
-            iso_val = clean_value.replace("Z", "+00:00")
-            dt = datetime.fromisoformat(iso_val)
-            if dt.tzinfo is None:
-                from datetime import timezone
-                dt = dt.replace(tzinfo=timezone.utc)
-            return dt
-        except (ValueError, TypeError):
-            pass
-
-        return None
+        return _parse_timestamp(str(value).strip())
 
     @staticmethod
     def _deduplicate(tweets: list[dict]) -> list[dict]:
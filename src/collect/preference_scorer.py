@@ -9,6 +9,7 @@ import re
 from pathlib import Path
 
 from src.config import PROJECT_ROOT
+from src.utils import json_loads
 
 # デフォルトのプリファレンスファイルパス
 PREFERENCES_PATH = PROJECT_ROOT / "config" / "selection_preferences.json"
@@ -24,8 +25,7 @@ class PreferenceScorer:
     def _load_preferences(self):
         """プリファレンス設定を読み込み"""
         try:
-            with open(self._path, "r", encoding="utf-8") as f:
-                self._prefs = json.load(f)
+            self._prefs = json_loads(self._path.read_bytes())
         except (FileNotFoundError, json.JSONDecodeError):
             self._prefs = {}
 
@@ -5,12 +5,18 @@ X Auto Post System — 収集ツイートキュー管理
 キューへの追加・承認・削除・日次取得を管理する。
 """
 import json
+import mmap
+import os
+import struct
+from collections import Counter
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
 from src.collect.tweet_parser import ParsedTweet
 from src.config import PROJECT_ROOT
+from src.utils import _write_all, append_jsonl, json_dumps, json_loads, load_jsonl
 
 JST = ZoneInfo("Asia/Tokyo")
 
@@ -20,6 +26,20 @@ PENDING_FILE = QUEUE_DIR / "pending_tweets.json"
 PROCESSED_FILE = QUEUE_DIR / "processed_tweets.json"
 FEEDBACK_FILE = PROJECT_ROOT / "data" / "feedback" / "selection_feedback.json"
 
+# pendingファイルの変更ジャーナル（1行1操作の JSON Lines、追記のみ）
+JOURNAL_SUFFIX = ".journal.jsonl"
+# ジャーナルの行数がこの倍率 × キュー件数（最低 COMPACT_MIN_ENTRIES）を超えたらスナップショットへ統合
+COMPACT_RATIO = 10
+COMPACT_MIN_ENTRIES = 100
+
+# ジャーナルの保存方式（"file": 追記 write / "mmap": 事前確保ファイルへのメモリマップ書き込み）
+QUEUE_BACKENDS = ("file", "mmap")
+MMAP_JOURNAL_SUFFIX = ".journal.mmap"
+# mmapジャーナルの拡張単位（1 MiB）
+MMAP_CHUNK_SIZE = 1 << 20
+# 先頭8バイトに書き込み済み末尾オフセットを保持
+_MMAP_HEADER = struct.Struct("<Q")
+
 # スキップ理由の選択肢
 SKIP_REASONS = [
     "topic_mismatch",     # トピック不一致
@@ -31,13 +51,89 @@ SKIP_REASONS = [
 ]
 
 
+def _feedback_entries_file(feedback_file: Path) -> Path:
+    """判断記録（1行1件の JSON Lines、追記のみ）のパス。統計は feedback_file 側に保持"""
+    return feedback_file.with_suffix(".jsonl")
+
+
+def _file_signature(path: Path) -> tuple | None:
+    """ファイルの (inode, 更新時刻, サイズ)（存在しなければ None）"""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _mmap_journal_append(path: Path, data: bytes):
+    """
+    mmapジャーナルに追記（write() を呼ばずページキャッシュへ直接書き込む）
+
+    ファイルは MMAP_CHUNK_SIZE 単位で事前確保し、足りなければ ftruncate して再マップする。
+    データを書いてからヘッダーの末尾オフセットを進めるため、中断時は未確定分が無視される。
+    """
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        size = os.fstat(fd).st_size
+        if size < _MMAP_HEADER.size:
+            size = MMAP_CHUNK_SIZE
+            os.ftruncate(fd, size)
+        mm = mmap.mmap(fd, size)
+        try:
+            end = max(_MMAP_HEADER.unpack_from(mm, 0)[0], _MMAP_HEADER.size)
+            needed = end + len(data)
+            if needed > size:
+                mm.close()
+                size = -(-needed // MMAP_CHUNK_SIZE) * MMAP_CHUNK_SIZE
+                os.ftruncate(fd, size)
+                mm = mmap.mmap(fd, size)
+            mm[end:needed] = data
+            _MMAP_HEADER.pack_into(mm, 0, needed)
+        finally:
+            mm.close()
+    finally:
+        os.close(fd)
+
+
+def _mmap_journal_read(path: Path) -> bytes:
+    """mmapジャーナルの確定済み部分を読み込み"""
+    try:
+        raw = path.read_bytes()
+    except FileNotFoundError:
+        return b""
+    if len(raw) < _MMAP_HEADER.size:
+        return b""
+    end = min(_MMAP_HEADER.unpack_from(raw, 0)[0], len(raw))
+    return raw[_MMAP_HEADER.size:end]
+
+
 class QueueManager:
     """収集ツイートのキュー管理"""
 
-    def __init__(self, queue_dir: Path | None = None):
+    # batch() 中の保留データ {"pending": 索引, "entries": ジャーナル, "feedback": 判断記録}
+    _batch: dict | None = None
+    # (キュー・処理済みファイルの状態 + 日付, stats() の結果)
+    _stats_cache: tuple[tuple, dict] | None = None
+
+    def __init__(self, queue_dir: Path | None = None, backend: str | None = None):
+        """
+        Args:
+            queue_dir: キューディレクトリ（省略時は data/queue）
+            backend: ジャーナルの保存方式 "file" | "mmap"（省略時は環境変数 QUEUE_BACKEND、既定 "file"）
+        """
+        backend = backend or os.getenv("QUEUE_BACKEND", "") or "file"
+        if backend not in QUEUE_BACKENDS:
+            raise ValueError(f"無効なキューバックエンド: {backend}（{', '.join(QUEUE_BACKENDS)}）")
+        self._backend = backend
         self._queue_dir = queue_dir or QUEUE_DIR
         self._pending_file = self._queue_dir / "pending_tweets.json"
         self._processed_file = self._queue_dir / "processed_tweets.json"
+        self._journal_file = self._pending_file.with_suffix(
+            MMAP_JOURNAL_SUFFIX if backend == "mmap" else JOURNAL_SUFFIX
+        )
+        self._journal_entries = 0
+        # (ファイルの状態, pending索引) — ファイルが変わっていなければ再読込しない（file バックエンドのみ）
+        self._index_cache: tuple[tuple, dict[str, dict]] | None = None
 
         self._queue_dir.mkdir(parents=True, exist_ok=True)
         self._ensure_file(self._pending_file)
@@ -47,8 +143,7 @@ class QueueManager:
     def _ensure_file(path: Path):
         """ファイルが存在しなければ空配列で初期化"""
         if not path.exists():
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump([], f)
+            path.write_bytes(b"[]")
 
     @staticmethod
     def _load(path: Path) -> list[dict]:
@@ -56,9 +151,148 @@ class QueueManager:
         return safe_json_load(path)
 
     @staticmethod
-    def _save(path: Path, data: list[dict]):
+    def _save(path: Path, data: list[dict], durable: bool = False):
         from src.utils import atomic_json_save
-        atomic_json_save(path, data)
+        atomic_json_save(path, data, durable=durable)
+
+    # === pendingの永続化（スナップショット + 追記ジャーナル） ===
+
+    def _load_pending(self) -> list[dict]:
+        """pendingを追加順のリストで読み込み（batch() 中は未書き込みの変更も含む）"""
+        return list(self._pending_index().values())
+
+    def _load_pending_index(self) -> dict[str, dict]:
+        """
+        pendingを tweet_id → アイテム の辞書（追加順）で読み込み
+        （スナップショットにジャーナルを順に適用）
+
+        途中で書き込みが中断された末尾行は読み飛ばす。
+        スナップショットとジャーナルが前回から変わっていなければメモリ上の索引を使う
+        （呼び出し側が変更してもよいよう、各アイテムはコピーして返す）。
+        """
+        signature = self._pending_signature() if self._backend == "file" else None
+        if signature is not None and self._index_cache and self._index_cache[0] == signature:
+            return {tweet_id: dict(item) for tweet_id, item in self._index_cache[1].items()}
+
+        items = {item["tweet_id"]: item for item in self._load(self._pending_file)}
+        if self._backend == "mmap":
+            lines = _mmap_journal_read(self._journal_file).splitlines()
+        else:
+            try:
+                lines = self._journal_file.read_bytes().splitlines()
+            except FileNotFoundError:
+                lines = []
+
+        self._journal_entries = 0
+        for line in lines:
+            try:
+                entry = json_loads(line)
+            except ValueError:
+                continue
+            self._journal_entries += 1
+            if entry.get("op") == "remove":
+                items.pop(entry.get("tweet_id"), None)
+            elif entry.get("op") == "upsert":
+                item = entry["item"]
+                items[item["tweet_id"]] = item
+
+        if signature is not None:
+            self._index_cache = (signature, items)
+            return {tweet_id: dict(item) for tweet_id, item in items.items()}
+        return items
+
+    def _signature_paths(self) -> tuple[Path, ...]:
+        """pendingキューの保存先ファイル（変更検出に使う）"""
+        return (self._pending_file, self._journal_file)
+
+    def _pending_signature(self) -> tuple:
+        """pendingキューの保存先ファイルの (inode, 更新時刻, サイズ)"""
+        return tuple(_file_signature(path) for path in self._signature_paths())
+
+    def _remember_index(self, pending: dict[str, dict]):
+        """自身の書き込み後の索引を保持（次回の読み込みでファイルを再解析しない）"""
+        if self._backend == "file":
+            self._index_cache = (self._pending_signature(), pending)
+
+    def _journal(self, pending: dict[str, dict], entries: list[dict]):
+        """
+        変更操作をジャーナルに追記（キュー全体の書き直しはしない）
+
+        Args:
+            pending: 変更適用後のpending索引（統合時のスナップショットに使う）
+            entries: {"op": "upsert", "item": {...}} / {"op": "remove", "tweet_id": str}
+        """
+        if not entries:
+            return
+        data = b"".join(json_dumps(entry, indent=False) + b"\n" for entry in entries)
+        if self._backend == "mmap":
+            _mmap_journal_append(self._journal_file, data)
+        else:
+            fd = os.open(self._journal_file, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                # 前回の書き込みが途中で切れて末尾に改行がなければ、改行で区切ってから追記する
+                # （切れた行に続けて書くと、今回の行まで1行として読めなくなる）
+                size = os.fstat(fd).st_size
+                if size and os.pread(fd, 1, size - 1) != b"\n":
+                    data = b"\n" + data
+                _write_all(fd, data)
+            finally:
+                os.close(fd)
+
+        self._journal_entries += len(entries)
+        if self._journal_entries > max(COMPACT_RATIO * len(pending), COMPACT_MIN_ENTRIES):
+            self._save_pending(list(pending.values()))
+        self._remember_index(pending)
+
+    def _save_pending(self, pending: list[dict]):
+        """pendingをスナップショットとして保存し、ジャーナルを空にする"""
+        self._save(self._pending_file, pending)
+        # スナップショット保存後に削除（間で中断しても再適用は冪等）
+        self._journal_file.unlink(missing_ok=True)
+        self._journal_entries = 0
+        self._remember_index({item["tweet_id"]: item for item in pending})
+
+    # === 変更のまとめ書き ===
+
+    def _pending_index(self) -> dict[str, dict]:
+        """変更操作用のpending索引（batch() 中はブロック内で1つの索引を共有）"""
+        if self._batch is None:
+            return self._load_pending_index()
+        if self._batch["pending"] is None:
+            self._batch["pending"] = self._load_pending_index()
+        return self._batch["pending"]
+
+    def _commit(self, pending: dict[str, dict], entries: list[dict]):
+        """変更をジャーナルに書き込み（batch() 中はブロック終了まで保留）"""
+        if self._batch is None:
+            self._journal(pending, entries)
+        else:
+            self._batch["entries"].extend(entries)
+
+    @contextmanager
+    def batch(self):
+        """
+        ブロック内の変更操作をまとめ、終了時にジャーナル・フィードバックを1回ずつ書き込む
+
+        例外で抜けた場合も、それまでの変更は書き込む（1件ずつ書き込む場合と同じ結果）。
+        入れ子にした場合は最も外側のブロックで書き込む。
+        """
+        if self._batch is not None:
+            yield self
+            return
+        self._batch = {"pending": None, "entries": [], "feedback": []}
+        try:
+            yield self
+        finally:
+            batch, self._batch = self._batch, None
+            if batch["entries"]:
+                self._journal(batch["pending"], batch["entries"])
+            if batch["feedback"]:
+                self._record_feedback_batch(batch["feedback"])
+
+    def compact(self):
+        """ジャーナルをスナップショットに統合"""
+        self._save_pending(self._load_pending())
 
     # === 追加 ===
 
@@ -69,82 +303,115 @@ class QueueManager:
         Returns:
             True: 追加成功, False: 重複のためスキップ
         """
-        pending = self._load(self._pending_file)
-        processed = self._load(self._processed_file)
+        return self.add_batch([tweet]) == 1
 
-        # 重複チェック（pending + processed）
-        all_ids = {item["tweet_id"] for item in pending}
-        all_ids.update(item["tweet_id"] for item in processed)
+    def add_batch(self, tweets: list[ParsedTweet], approve: bool = False) -> int:
+        """
+        複数ツイートを一括追加。追加件数を返す
 
-        if tweet.tweet_id in all_ids:
-            return False
+        キューの読み込み・重複判定用のID集合の構築・ジャーナル書き込みは1回ずつ。
 
-        # デフォルトの投稿予定時刻を計算（最後のスケジュール + 1時間）
+        Args:
+            tweets: 追加するツイート
+            approve: True の場合、追加分を承認済みで登録（承認フィードバックも記録）
+        """
+        pending = self._pending_index()
+        processed = self._load(self._processed_file)
+
+        # 重複チェック用（processed + 今回追加分。pending は索引を直接引く）
+        seen_ids = {item["tweet_id"] for item in processed}
+
+        # 投稿予定時刻の基準（最後のスケジュール）
         from datetime import timedelta
         now = datetime.now(JST)
-        last_scheduled = now + timedelta(hours=1)  # デフォルト: 1時間後
-        for item in reversed(pending):
+        last_dt = None
+        for item in reversed(pending.values()):
             if item.get("scheduled_at"):
                 try:
                     last_dt = datetime.fromisoformat(item["scheduled_at"])
-                    next_dt = last_dt + timedelta(hours=1)
-                    if next_dt > now:
-                        last_scheduled = next_dt
                     break
                 except (ValueError, TypeError):
                     pass
 
-        # キューに追加
-        entry = tweet.to_dict()
-        entry["status"] = "pending"  # pending → approved → posted / skipped
-        entry["added_at"] = now.isoformat()
-        entry["generated_text"] = ""  # 生成後に埋める
-        entry["template_id"] = ""     # 使用テンプレートID
-        entry["score"] = None         # スコアリング結果
-        entry["scheduled_at"] = last_scheduled.isoformat()
-        # 選定PDCAフィードバック用
-        entry["skip_reason"] = ""
-        entry["feedback_note"] = ""
-
-        pending.append(entry)
-        self._save(self._pending_file, pending)
-        return True
-
-    def add_batch(self, tweets: list[ParsedTweet]) -> int:
-        """複数ツイートを一括追加。追加件数を返す"""
-        added = 0
+        entries = []
         for tweet in tweets:
-            if self.add(tweet):
-                added += 1
-        return added
+            if tweet.tweet_id in pending or tweet.tweet_id in seen_ids:
+                continue
+            seen_ids.add(tweet.tweet_id)
+
+            # デフォルトの投稿予定時刻（最後のスケジュール + 1時間、過去なら現在 + 1時間）
+            next_dt = last_dt + timedelta(hours=1) if last_dt else None
+            scheduled = next_dt if next_dt and next_dt > now else now + timedelta(hours=1)
+            last_dt = scheduled
+
+            # キューに追加
+            entry = tweet.to_dict()
+            entry["status"] = "approved" if approve else "pending"  # pending → approved → posted / skipped
+            entry["added_at"] = now.isoformat()
+            entry["generated_text"] = ""  # 生成後に埋める
+            entry["template_id"] = ""     # 使用テンプレートID
+            entry["score"] = None         # スコアリング結果
+            entry["scheduled_at"] = scheduled.isoformat()
+            # 選定PDCAフィードバック用
+            entry["skip_reason"] = ""
+            entry["feedback_note"] = ""
+
+            pending[tweet.tweet_id] = entry
+            entries.append({"op": "upsert", "item": entry})
+
+        self._commit(pending, entries)
+        if approve and entries:
+            self._record_feedback_batch([(e["item"], "approved") for e in entries])
+        return len(entries)
 
     # === 取得 ===
 
+    def _items_with_status(self, status: str) -> list[dict]:
+        """指定ステータスのアイテムを取得"""
+        return [item for item in self._load_pending() if item["status"] == status]
+
+    def _status_counts(self) -> Counter:
+        """ステータス別件数（1パスで集計）"""
+        return Counter(item["status"] for item in self._load_pending())
+
+    def status_counts(self) -> dict:
+        """ステータス別件数"""
+        return dict(self._status_counts())
+
+    def change_token(self) -> str:
+        """
+        pendingキューの変更検出用トークン
+
+        保存先ファイルの (inode, 更新時刻, サイズ) から作るため、キューを読み込まずに取得でき、
+        プロセスをまたいで比較できる（同じなら前回取得時から変更なし）。
+        """
+        return json_dumps(self._pending_signature(), indent=False).decode()
+
     def get_pending(self) -> list[dict]:
         """未処理のツイートを取得"""
-        pending = self._load(self._pending_file)
-        return [item for item in pending if item["status"] == "pending"]
+        return self._items_with_status("pending")
 
     def get_approved(self) -> list[dict]:
         """承認済みで未投稿のツイートを取得"""
-        pending = self._load(self._pending_file)
-        return [item for item in pending if item["status"] == "approved"]
+        return self._items_with_status("approved")
 
     def get_generated(self) -> list[dict]:
         """投稿文が生成済みのツイートを取得"""
-        pending = self._load(self._pending_file)
-        return [
-            item for item in pending
-            if item["status"] == "approved" and item.get("generated_text")
-        ]
+        return [item for item in self._items_with_status("approved") if item.get("generated_text")]
 
     def get_all_pending(self) -> list[dict]:
         """pendingファイルの全アイテムを取得"""
-        return self._load(self._pending_file)
+        return self._load_pending()
 
-    def get_today_posted_count(self) -> int:
-        """今日の投稿済み件数を取得"""
-        processed = self._load(self._processed_file)
+    def get_today_posted_count(self, processed: list[dict] | None = None) -> int:
+        """
+        今日の投稿済み件数を取得
+
+        Args:
+            processed: 読み込み済みの処理済みリスト（省略時はファイルから読む）
+        """
+        if processed is None:
+            processed = self._load(self._processed_file)
         today = datetime.now(JST).date().isoformat()
         return sum(
             1 for item in processed
@@ -155,25 +422,27 @@ class QueueManager:
 
     def approve(self, tweet_id: str) -> bool:
         """ツイートを承認"""
-        pending = self._load(self._pending_file)
-        for item in pending:
-            if item["tweet_id"] == tweet_id:
-                item["status"] = "approved"
-                self._save(self._pending_file, pending)
-                self._record_feedback(item, "approved")
-                return True
-        return False
+        pending = self._pending_index()
+        item = pending.get(tweet_id)
+        if item is None:
+            return False
+        item["status"] = "approved"
+        self._commit(pending, [{"op": "upsert", "item": item}])
+        self._record_feedback(item, "approved")
+        return True
 
     def approve_all_pending(self) -> int:
-        """全pendingを一括承認"""
-        pending = self._load(self._pending_file)
-        count = 0
-        for item in pending:
-            if item["status"] == "pending":
-                item["status"] = "approved"
-                count += 1
-        self._save(self._pending_file, pending)
-        return count
+        """全pendingを一括承認（索引を1回走査し、変更は1回のジャーナル書き込みにまとめる）"""
+        pending = self._pending_index()
+        changed = [
+            {"op": "upsert", "item": item}
+            for item in pending.values()
+            if item["status"] == "pending"
+        ]
+        for entry in changed:
+            entry["item"]["status"] = "approved"
+        self._commit(pending, changed)
+        return len(changed)
 
     def skip(self, tweet_id: str) -> bool:
         """ツイートをスキップ（投稿しない）"""
@@ -188,65 +457,106 @@ class QueueManager:
             reason: スキップ理由（SKIP_REASONS参照）
             note: 自由記述のフィードバックメモ
         """
-        pending = self._load(self._pending_file)
-        for item in pending:
-            if item["tweet_id"] == tweet_id:
-                item["status"] = "skipped"
-                item["skip_reason"] = reason
-                item["feedback_note"] = note
-                self._save(self._pending_file, pending)
-                self._record_feedback(item, "skipped")
-                return True
-        return False
+        pending = self._pending_index()
+        item = pending.get(tweet_id)
+        if item is None:
+            return False
+        item["status"] = "skipped"
+        item["skip_reason"] = reason
+        item["feedback_note"] = note
+        self._commit(pending, [{"op": "upsert", "item": item}])
+        self._record_feedback(item, "skipped")
+        return True
+
+    def apply_decisions(
+        self,
+        approvals: list[str],
+        skips: list[tuple[str, str]],
+    ) -> dict:
+        """
+        承認/スキップを一括反映（pendingファイルの読み書きは1回）
+
+        Args:
+            approvals: 承認するツイートIDのリスト
+            skips: (ツイートID, スキップ理由) のリスト
+
+        Returns:
+            {"approved": [tweet_id], "skipped": [tweet_id]}  実際に反映できたID
+        """
+        index = self._pending_index()
+        applied = {"approved": [], "skipped": []}
+        records = []
+
+        for tweet_id in approvals:
+            item = index.get(tweet_id)
+            if item is None:
+                continue
+            item["status"] = "approved"
+            applied["approved"].append(tweet_id)
+            records.append((item, "approved"))
+
+        for tweet_id, reason in skips:
+            item = index.get(tweet_id)
+            if item is None:
+                continue
+            item["status"] = "skipped"
+            item["skip_reason"] = reason
+            item["feedback_note"] = ""
+            applied["skipped"].append(tweet_id)
+            records.append((item, "skipped"))
+
+        if records:
+            self._commit(index, [{"op": "upsert", "item": item} for item, _ in records])
+            self._record_feedback_batch(records)
+        return applied
 
     def remove(self, tweet_id: str) -> bool:
         """ツイートをキューから完全に削除"""
-        pending = self._load(self._pending_file)
-        new_pending = [item for item in pending if item["tweet_id"] != tweet_id]
-        if len(new_pending) < len(pending):
-            self._save(self._pending_file, new_pending)
-            return True
-        return False
+        pending = self._pending_index()
+        if pending.pop(tweet_id, None) is None:
+            return False
+        self._commit(pending, [{"op": "remove", "tweet_id": tweet_id}])
+        return True
 
     def set_generated(self, tweet_id: str, text: str, template_id: str = "", score: dict | None = None):
         """生成済みテキストを設定"""
-        pending = self._load(self._pending_file)
-        for item in pending:
-            if item["tweet_id"] == tweet_id:
-                item["generated_text"] = text
-                item["template_id"] = template_id
-                item["score"] = score
-                break
-        self._save(self._pending_file, pending)
+        pending = self._pending_index()
+        item = pending.get(tweet_id)
+        if item is not None:
+            item["generated_text"] = text
+            item["template_id"] = template_id
+            item["score"] = score
+            self._commit(pending, [{"op": "upsert", "item": item}])
 
     def mark_posted(self, tweet_id: str, posted_tweet_id: str):
         """投稿完了マーク"""
-        pending = self._load(self._pending_file)
+        pending = self._pending_index()
         processed = self._load(self._processed_file)
 
-        for i, item in enumerate(pending):
-            if item["tweet_id"] == tweet_id:
-                item["status"] = "posted"
-                item["posted_tweet_id"] = posted_tweet_id
-                item["posted_at"] = datetime.now(JST).isoformat()
+        removed = []
+        item = pending.pop(tweet_id, None)
+        if item is not None:
+            item["status"] = "posted"
+            item["posted_tweet_id"] = posted_tweet_id
+            item["posted_at"] = datetime.now(JST).isoformat()
 
-                # processedに移動
-                processed.append(item)
-                pending.pop(i)
-                break
+            # processedに移動
+            processed.append(item)
+            removed.append({"op": "remove", "tweet_id": tweet_id})
 
-        self._save(self._pending_file, pending)
-        self._save(self._processed_file, processed)
+        self._commit(pending, removed)
+        # 投稿履歴は二重投稿防止に使うため、失わないよう fsync まで行う
+        self._save(self._processed_file, processed, durable=True)
 
     def _update_status(self, tweet_id: str, new_status: str) -> bool:
         """ステータスを更新"""
-        pending = self._load(self._pending_file)
-        for item in pending:
-            if item["tweet_id"] == tweet_id:
-                item["status"] = new_status
-                self._save(self._pending_file, pending)
-                return True
-        return False
+        pending = self._pending_index()
+        item = pending.get(tweet_id)
+        if item is None:
+            return False
+        item["status"] = new_status
+        self._commit(pending, [{"op": "upsert", "item": item}])
+        return True
 
     # === フィードバック記録（選定PDCA） ===
 
@@ -258,81 +568,100 @@ class QueueManager:
             item: キューアイテム
             decision: "approved" or "skipped"
         """
+        self._record_feedback_batch([(item, decision)])
+
+    def _record_feedback_batch(self, records: list[tuple[dict, str]]):
+        """
+        複数の承認/スキップ判断をまとめて記録（ファイルの読み書きは1回）
+
+        Args:
+            records: [(キューアイテム, "approved" or "skipped")]
+        """
+        if self._batch is not None:
+            self._batch["feedback"].extend(records)
+            return
+
         feedback_file = FEEDBACK_FILE
         feedback_file.parent.mkdir(parents=True, exist_ok=True)
 
-        # フィードバックデータ読み込み
+        # フィードバックデータ読み込み（統計のみ。エントリは JSONL に追記）
         try:
-            with open(feedback_file, "r", encoding="utf-8") as f:
-                feedback_data = json.load(f)
+            feedback_data = json_loads(feedback_file.read_bytes())
         except (FileNotFoundError, json.JSONDecodeError):
-            feedback_data = {"entries": [], "stats": {
+            feedback_data = {"stats": {
                 "total": 0, "approved": 0, "skipped": 0,
                 "approval_rate": 0.0,
                 "by_source": {}, "by_topic": {}, "by_keyword": {}, "by_reason": {},
             }}
 
-        # エントリ追加
-        entry = {
-            "tweet_id": item.get("tweet_id", ""),
-            "author_username": item.get("author_username", ""),
-            "decision": decision,
-            "skip_reason": item.get("skip_reason", ""),
-            "feedback_note": item.get("feedback_note", ""),
-            "preference_match_score": item.get("preference_match_score", 0.0),
-            "matched_topics": item.get("matched_topics", []),
-            "matched_keywords": item.get("matched_keywords", []),
-            "likes": item.get("likes", 0),
-            "decided_at": datetime.now(JST).isoformat(),
-        }
-        feedback_data["entries"].append(entry)
+        # 旧形式（エントリを統計と同じJSONに保持）からの移行
+        new_entries = feedback_data.pop("entries", [])
 
-        # 統計更新
         stats = feedback_data.get("stats", {})
-        stats["total"] = stats.get("total", 0) + 1
-        stats[decision] = stats.get(decision, 0) + 1
-        total = stats["total"]
-        stats["approval_rate"] = round(stats.get("approved", 0) / total, 3) if total else 0.0
-
-        # ソース別統計
-        source = item.get("author_username", "unknown")
-        by_source = stats.setdefault("by_source", {})
-        src_stats = by_source.setdefault(source, {"approved": 0, "skipped": 0})
-        src_stats[decision] = src_stats.get(decision, 0) + 1
-
-        # トピック別統計
-        by_topic = stats.setdefault("by_topic", {})
-        for topic in item.get("matched_topics", []):
-            topic_stats = by_topic.setdefault(topic, {"approved": 0, "skipped": 0})
-            topic_stats[decision] = topic_stats.get(decision, 0) + 1
-
-        # キーワード別統計
-        by_keyword = stats.setdefault("by_keyword", {})
-        for keyword in item.get("matched_keywords", []):
-            kw_stats = by_keyword.setdefault(keyword, {"approved": 0, "skipped": 0})
-            kw_stats[decision] = kw_stats.get(decision, 0) + 1
-
-        # スキップ理由別統計
-        if decision == "skipped" and item.get("skip_reason"):
-            by_reason = stats.setdefault("by_reason", {})
-            reason = item["skip_reason"]
-            by_reason[reason] = by_reason.get(reason, 0) + 1
+        for item, decision in records:
+            # エントリ追加
+            entry = {
+                "tweet_id": item.get("tweet_id", ""),
+                "author_username": item.get("author_username", ""),
+                "decision": decision,
+                "skip_reason": item.get("skip_reason", ""),
+                "feedback_note": item.get("feedback_note", ""),
+                "preference_match_score": item.get("preference_match_score", 0.0),
+                "matched_topics": item.get("matched_topics", []),
+                "matched_keywords": item.get("matched_keywords", []),
+                "likes": item.get("likes", 0),
+                "decided_at": datetime.now(JST).isoformat(),
+            }
+            new_entries.append(entry)
+
+            # 統計更新
+            stats["total"] = stats.get("total", 0) + 1
+            stats[decision] = stats.get(decision, 0) + 1
+            total = stats["total"]
+            stats["approval_rate"] = round(stats.get("approved", 0) / total, 3) if total else 0.0
+
+            # ソース別統計
+            source = item.get("author_username", "unknown")
+            by_source = stats.setdefault("by_source", {})
+            src_stats = by_source.setdefault(source, {"approved": 0, "skipped": 0})
+            src_stats[decision] = src_stats.get(decision, 0) + 1
+
+            # トピック別統計
+            by_topic = stats.setdefault("by_topic", {})
+            for topic in item.get("matched_topics", []):
+                topic_stats = by_topic.setdefault(topic, {"approved": 0, "skipped": 0})
+                topic_stats[decision] = topic_stats.get(decision, 0) + 1
+
+            # キーワード別統計
+            by_keyword = stats.setdefault("by_keyword", {})
+            for keyword in item.get("matched_keywords", []):
+                kw_stats = by_keyword.setdefault(keyword, {"approved": 0, "skipped": 0})
+                kw_stats[decision] = kw_stats.get(decision, 0) + 1
+
+            # スキップ理由別統計
+            if decision == "skipped" and item.get("skip_reason"):
+                by_reason = stats.setdefault("by_reason", {})
+                reason = item["skip_reason"]
+                by_reason[reason] = by_reason.get(reason, 0) + 1
 
         feedback_data["stats"] = stats
 
-        # 保存
-        with open(feedback_file, "w", encoding="utf-8") as f:
-            json.dump(feedback_data, f, ensure_ascii=False, indent=2)
+        # 保存（エントリは追記のみ、書き直すのは件数に依存しない統計だけ）
+        append_jsonl(_feedback_entries_file(feedback_file), new_entries)
+        feedback_file.write_bytes(json_dumps(feedback_data))
 
     def get_feedback_stats(self) -> dict:
         """フィードバック統計を取得"""
         try:
-            with open(FEEDBACK_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = json_loads(FEEDBACK_FILE.read_bytes())
             return data.get("stats", {})
         except (FileNotFoundError, json.JSONDecodeError):
             return {}
 
+    def get_feedback_entries(self) -> list[dict]:
+        """フィードバックの判断記録を古い順に取得"""
+        return load_jsonl(_feedback_entries_file(FEEDBACK_FILE))
+
     # === クリーンアップ ===
 
     def cleanup_old(self, days: int = 7):
@@ -353,14 +682,32 @@ class QueueManager:
     # === 統計 ===
 
     def stats(self) -> dict:
-        """キューの統計情報"""
-        pending = self._load(self._pending_file)
+        """
+        キューの統計情報
+
+        キュー・処理済みファイルと日付が前回の集計時と同じなら再集計しない
+        （mmap バックエンドは書き込みでファイルの更新時刻が変わらないため毎回集計）。
+        """
+        key = None
+        if self._batch is None and self._backend != "mmap":
+            key = (
+                self._pending_signature(),
+                _file_signature(self._processed_file),
+                datetime.now(JST).date().isoformat(),
+            )
+            if self._stats_cache is not None and self._stats_cache[0] == key:
+                return dict(self._stats_cache[1])
+
         processed = self._load(self._processed_file)
+        counts = self._status_counts()
 
-        return {
-            "pending": sum(1 for i in pending if i["status"] == "pending"),
-            "approved": sum(1 for i in pending if i["status"] == "approved"),
-            "skipped": sum(1 for i in pending if i["status"] == "skipped"),
+        result = {
+            "pending": counts["pending"],
+            "approved": counts["approved"],
+            "skipped": counts["skipped"],
             "posted_total": len(processed),
-            "posted_today": self.get_today_posted_count(),
+            "posted_today": self.get_today_posted_count(processed),
         }
+        if key is not None:
+            self._stats_cache = (key, dict(result))
+        return result
@@ -18,6 +18,8 @@ import logging
 from urllib.parse import quote as url_quote
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +28,46 @@ _BASE_URL = "https://api.socialdata.tools"
 _SEARCH_ENDPOINT = f"{_BASE_URL}/twitter/search"
 _DEFAULT_TIMEOUT = 30
 
+# リプライ・RT除外フィルタ（既定の組み合わせは定数で持つ）
+_EXCLUDE_REPLIES = "-filter:replies"
+_EXCLUDE_RETWEETS = "-filter:retweets"
+_EXCLUDE_BOTH = f"{_EXCLUDE_REPLIES} {_EXCLUDE_RETWEETS}"
+
+# 接続プール設定（API ホストは固定なので全インスタンスで共有する）
+_POOL_CONNECTIONS = 4
+_POOL_MAXSIZE = 32
+_RETRY_STATUS = (429, 500, 502, 503, 504)
+
+_session: requests.Session | None = None
+
+
+def _get_session() -> requests.Session:
+    """
+    共有 requests.Session を返す（初回のみ生成）。
+
+    TCP/TLS ハンドシェイクを呼び出し間で使い回すため、
+    SocialDataClient は全インスタンスでこのセッションを共有する。
+    429/5xx はアダプタ層で再試行し、最終レスポンスはそのまま返す
+    （ステータス別のエラー処理は _fetch_page 側で行う）。
+    """
+    global _session
+    if _session is None:
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=_RETRY_STATUS,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=_POOL_CONNECTIONS,
+            pool_maxsize=_POOL_MAXSIZE,
+            max_retries=retry,
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        _session = session
+    return _session
+
 
 class SocialDataError(Exception):
     """SocialData API エラー"""
@@ -56,6 +98,7 @@ class SocialDataClient:
                 "SOCIALDATA_API_KEY が未設定です。\n"
                 "ダッシュボードまたは環境変数に SocialData API キーを設定してください。"
             )
+        self.session = _get_session()
 
     # ──────────────────────────────────────────────────────────────
     # Public API
@@ -138,8 +181,9 @@ class SocialDataClient:
         parts: list[str] = []
 
         if keywords:
-            kw_parts = [f'"{kw}"' if " " in kw else kw for kw in keywords]
-            parts.append(f"({' OR '.join(kw_parts)})")
+            parts.append(
+                "(" + " OR ".join(f'"{kw}"' if " " in kw else kw for kw in keywords) + ")"
+            )
 
         if min_faves > 0:
             parts.append(f"min_faves:{min_faves}")
@@ -150,11 +194,12 @@ class SocialDataClient:
         if lang:
             parts.append(f"lang:{lang}")
 
-        if exclude_replies:
-            parts.append("-filter:replies")
-
-        if exclude_retweets:
-            parts.append("-filter:retweets")
+        if exclude_replies and exclude_retweets:
+            parts.append(_EXCLUDE_BOTH)
+        elif exclude_replies:
+            parts.append(_EXCLUDE_REPLIES)
+        elif exclude_retweets:
+            parts.append(_EXCLUDE_RETWEETS)
 
         return " ".join(parts)
 
@@ -188,7 +233,7 @@ class SocialDataClient:
         }
 
         try:
-            resp = requests.get(
+            resp = self.session.get(
                 _SEARCH_ENDPOINT,
                 headers=headers,
                 params=params,
@@ -3,17 +3,60 @@ X Auto Post System — ツイートURL解析・データ正規化
 
 ツイートURLからIDを抽出し、ツイートデータを標準フォーマットに変換する。
 """
-import re
-from dataclasses import dataclass, field
+import sys
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from urllib.parse import urlsplit
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
 JST = ZoneInfo("Asia/Tokyo")
 
+# X/Twitter URLとして受け付けるホスト
+#   https://x.com/username/status/1234567890（twitter.com も可）
+#   https://mobile.twitter.com/username/status/1234567890（mobile.x.com も可）
+#   https://vxtwitter.com/username/status/1234567890（embed用、fxtwitter も可）
+# 正規表現ではなく urlsplit + ホスト表の照合で判定する
+_VALID_HOSTS = frozenset({
+    "x.com", "www.x.com",
+    "twitter.com", "www.twitter.com",
+    "mobile.x.com", "mobile.twitter.com",
+    "vxtwitter.com", "fxtwitter.com",
+})
+
+
+@lru_cache(maxsize=4096)
+def _parse_url_cached(url: str) -> tuple[str, str] | None:
+    """
+    parse_url の本体（同じURLの再解析はキャッシュから同じタプルを返す）
+
+    パスは /{username}/status/{tweet_id}[/...] の形のみ受け付ける。
+    クエリパラメータ・フラグメントは urlsplit で分離されるため除去不要。
+
+    同じアカウントのURLが多数並ぶため、ユーザー名は intern して共有する。
+    ツイートIDはURLごとに一意なので intern しない。
+    """
+    try:
+        split = urlsplit(url)
+        host = split.hostname
+    except ValueError:
+        return None
+    if split.scheme not in ("https", "http") or host not in _VALID_HOSTS:
+        return None
+
+    parts = split.path.split("/", 4)
+    if len(parts) < 4 or parts[2] != "status":
+        return None
+    username, tweet_id = parts[1], parts[3]
+    # isdigit/isdecimal は "²" や "١" などの非ASCII数字も通すため ASCII に限定する
+    if not (tweet_id.isascii() and tweet_id.isdecimal()) or not username.replace("_", "").isalnum():
+        return None
+    return sys.intern(username), tweet_id
+
 
-@dataclass
+@dataclass(slots=True)
 class ParsedTweet:
-    """解析済みツイートデータ"""
+    """解析済みツイートデータ（収集ごとに大量生成されるため __slots__ で省メモリ化）"""
     tweet_id: str
     author_username: str = ""
     author_name: str = ""
@@ -37,48 +80,31 @@ class ParsedTweet:
     matched_keywords: list[str] = field(default_factory=list)
 
     def to_dict(self) -> dict:
-        return {
-            "tweet_id": self.tweet_id,
-            "author_username": self.author_username,
-            "author_name": self.author_name,
-            "text": self.text,
-            "lang": self.lang,
-            "likes": self.likes,
-            "retweets": self.retweets,
-            "replies": self.replies,
-            "quotes": self.quotes,
-            "bookmarks": self.bookmarks,
-            "url": self.url,
-            "collected_at": self.collected_at,
-            "source": self.source,
-            "tags": self.tags,
-            "memo": self.memo,
-            "image_urls": self.image_urls,
-            "preference_match_score": self.preference_match_score,
-            "matched_topics": self.matched_topics,
-            "matched_keywords": self.matched_keywords,
-        }
+        return {name: getattr(self, name) for name in _FIELD_NAMES}
 
     @classmethod
     def from_dict(cls, data: dict) -> "ParsedTweet":
-        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
+        return cls(**{k: v for k, v in data.items() if k in _FIELD_SET})
+
+
+# API応答の件数フィールド → ParsedTweet フィールド
+_API_COUNT_FIELDS = (
+    ("retweets", "retweet_count"),
+    ("replies", "reply_count"),
+    ("quotes", "quote_count"),
+    ("bookmarks", "bookmark_count"),
+)
+
+# フィールド名はクラス定義時に一度だけ取得（to_dict はこの定義順で出力）
+_FIELD_NAMES = tuple(f.name for f in fields(ParsedTweet))
+_FIELD_SET = frozenset(_FIELD_NAMES)
 
 
 class TweetParser:
     """ツイートURLの解析とデータ正規化"""
 
-    # X/Twitter URLパターン
-    URL_PATTERNS = [
-        # https://x.com/username/status/1234567890
-        re.compile(r"https?://(?:x|twitter)\.com/(\w+)/status/(\d+)"),
-        # https://mobile.twitter.com/username/status/1234567890
-        re.compile(r"https?://mobile\.(?:x|twitter)\.com/(\w+)/status/(\d+)"),
-        # https://vxtwitter.com/username/status/1234567890 (embed用)
-        re.compile(r"https?://(?:vx|fx)twitter\.com/(\w+)/status/(\d+)"),
-    ]
-
-    @classmethod
-    def parse_url(cls, url: str) -> tuple[str, str] | None:
+    @staticmethod
+    def parse_url(url: str) -> tuple[str, str] | None:
         """
         ツイートURLからユーザー名とツイートIDを抽出
 
@@ -89,15 +115,28 @@ class TweetParser:
             (username, tweet_id) or None
         """
         url = url.strip()
-        # クエリパラメータを除去
-        url_clean = url.split("?")[0]
+        # 明らかにツイートURLでない入力はURL解析・キャッシュを通さず除外
+        if not url.startswith(("https://", "http://")) or "/status/" not in url:
+            return None
+        return _parse_url_cached(url)
 
-        for pattern in cls.URL_PATTERNS:
-            match = pattern.match(url_clean)
-            if match:
-                return match.group(1), match.group(2)
+    @staticmethod
+    def parse_urls_batch(urls: list[str]) -> list[tuple[str, str] | None]:
+        """
+        複数URLをまとめて解析（parse_url と同じ判定をループ外に関数参照を出して実行）
 
-        return None
+        Args:
+            urls: ツイートURLのリスト
+
+        Returns:
+            urls と同じ順序の (username, tweet_id) or None のリスト
+        """
+        parse = _parse_url_cached
+        prefixes = ("https://", "http://")
+        return [
+            parse(u) if u.startswith(prefixes) and "/status/" in u else None
+            for u in (url.strip() for url in urls)
+        ]
 
     @classmethod
     def extract_tweet_id(cls, url: str) -> str | None:
@@ -105,9 +144,10 @@ class TweetParser:
         result = cls.parse_url(url)
         return result[1] if result else None
 
-    @classmethod
-    def build_url(cls, username: str, tweet_id: str) -> str:
-        """ツイートURLを構築"""
+    @staticmethod
+    @lru_cache(maxsize=8192)
+    def build_url(username: str, tweet_id: str) -> str:
+        """ツイートURLを構築（同じ組み合わせは承認・生成・投稿の各段で繰り返し使うためキャッシュ）"""
         return f"https://x.com/{username}/status/{tweet_id}"
 
     @classmethod
@@ -115,6 +155,9 @@ class TweetParser:
         """
         URLから手動収集用のParsedTweetを生成
 
+        URL → (ユーザー名, ID) の解析と正規化URLの構築はキャッシュ済みのため、
+        同じURLの再インポートでは ParsedTweet の生成（収集日時・メモ）だけを行う。
+
         Args:
             url: ツイートURL
             text: ツイートのテキスト（手動コピペ）
@@ -125,6 +168,23 @@ class TweetParser:
             raise ValueError(f"無効なツイートURL: {url}")
 
         username, tweet_id = parsed
+        return cls.from_parts(username, tweet_id, text=text, memo=memo)
+
+    @classmethod
+    def from_parts(
+        cls, username: str, tweet_id: str, text: str = "", memo: str = ""
+    ) -> ParsedTweet:
+        """
+        ユーザー名とツイートIDから手動収集用のParsedTweetを生成（URL解析なし）
+
+        (ユーザー名, ID) が既に分かっている呼び出し元向け。from_url と同じ形で生成する。
+
+        Args:
+            username: 投稿者のユーザー名
+            tweet_id: ツイートID
+            text: ツイートのテキスト
+            memo: 収集時のメモ
+        """
         return ParsedTweet(
             tweet_id=tweet_id,
             author_username=username,
@@ -148,6 +208,10 @@ class TweetParser:
         tweet_id = str(data.get("id_str") or data.get("id") or data.get("tweet_id", ""))
         author = data.get("user") or data.get("author") or {}
 
+        username = str(author.get("screen_name") or author.get("username") or "")
+        # 件数系フィールド（いいねは v1.1 / v2 でキー名が異なるため個別に取得）
+        counts = {dst: int(data.get(src) or 0) for dst, src in _API_COUNT_FIELDS}
+
         # テキスト取得 (SocialData は full_text, X API v2 は text)
         text = data.get("full_text") or data.get("text") or ""
 
@@ -165,19 +229,13 @@ class TweetParser:
 
         return ParsedTweet(
             tweet_id=tweet_id,
-            author_username=str(author.get("screen_name") or author.get("username") or ""),
+            author_username=username,
             author_name=str(author.get("name") or ""),
             text=str(text),
             lang=str(data.get("lang") or ""),
             likes=int(data.get("favorite_count") or data.get("like_count") or 0),
-            retweets=int(data.get("retweet_count") or 0),
-            replies=int(data.get("reply_count") or 0),
-            quotes=int(data.get("quote_count") or 0),
-            bookmarks=int(data.get("bookmark_count") or 0),
-            url=TweetParser.build_url(
-                str(author.get("screen_name") or author.get("username") or "unknown"),
-                tweet_id
-            ),
+            **counts,
+            url=TweetParser.build_url(username or "unknown", tweet_id),
             collected_at=datetime.now(JST).isoformat(),
             source=source,
             image_urls=image_urls[:4],
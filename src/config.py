@@ -1,11 +1,12 @@
 """
 X Auto Post System — 設定管理
 """
-import json
 import os
 from pathlib import Path
 from dotenv import load_dotenv
 
+from src.utils import json_loads
+
 # プロジェクトルート
 PROJECT_ROOT = Path(__file__).parent.parent
 load_dotenv(PROJECT_ROOT / ".env")
@@ -17,7 +18,8 @@ class Config:
     def __init__(self, account_id: str = "account_1"):
         self.account_id = account_id
         self._accounts_config = self._load_json("config/accounts.json")
-        self._safety_rules = self._load_json("config/safety_rules.json")
+        from src.post.safety_rules import load_rules
+        self._safety_rules = load_rules()
         self._account = self._get_account(account_id)
         self._firestore_keys: dict = {}
         self._load_firestore_keys()
@@ -68,8 +70,7 @@ class Config:
     @staticmethod
     def _load_json(relative_path: str) -> dict:
         path = PROJECT_ROOT / relative_path
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return json_loads(path.read_bytes())
 
     def _get_account(self, account_id: str) -> dict:
         for acc in self._accounts_config["accounts"]:
@@ -242,8 +243,7 @@ class Config:
         """保存済みペルソナプロファイルを読み込む"""
         path = self.persona_profile_path
         if path.exists():
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return json_loads(path.read_bytes())
         return None
 
     # === アクティブアカウント一覧 ===
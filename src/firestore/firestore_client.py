@@ -5,11 +5,46 @@ Firebase Firestore からユーザー別APIキーを取得する。
 マルチテナント運用: 各ユーザーが自身のAPIキーをダッシュボードで登録し、
 バックエンド（GitHub Actions等）がFirestoreから取得して使用する。
 """
-import json
+import base64
+import hashlib
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from src.config import PROJECT_ROOT
+from src.utils import json_loads
+
+# ユーザーごとのサブコレクション走査を並列実行する最大数（Firestore への同時リクエスト数）
+USER_SCAN_WORKERS = 10
+
+# Base64 認証情報から生成した Certificate（認証情報の SHA-256 指紋 -> Certificate）
+# 鍵そのものはキーに残さない
+_certificates: dict = {}
+
+
+def _certificate_from_base64(creds_b64: str):
+    """
+    Base64 エンコードされたサービスアカウントJSONから Certificate を生成（指紋ごとにキャッシュ）
+
+    デコード・JSONパース・秘密鍵のパースを FirestoreClient 生成のたびに繰り返さない。
+    デコードした鍵JSONは Certificate 生成後すぐに破棄する。
+    """
+    fingerprint = hashlib.sha256(creds_b64.encode()).hexdigest()
+    cred = _certificates.get(fingerprint)
+    if cred is not None:
+        return cred
+
+    from firebase_admin import credentials
+
+    # Base64パディング修正（改行・空白・パディング欠落を全て処理）
+    # 改行・空白・タブを除去し、末尾の=を除いてから正しいパディングを再付与
+    b64str = "".join(creds_b64.split()).rstrip("=")
+    b64str += "=" * (-len(b64str) % 4)
+    cred_dict = json_loads(base64.b64decode(b64str, validate=False))
+    cred = credentials.Certificate(cred_dict)
+    cred_dict.clear()
+    _certificates[fingerprint] = cred
+    return cred
 
 
 class FirestoreClient:
@@ -51,21 +86,7 @@ class FirestoreClient:
         except ValueError:
             # 新規初期化
             if self._credentials_base64:
-                import base64
-                import re as _re
-                # Base64パディング修正（改行・空白・パディング欠落を全て処理）
-                b64str = self._credentials_base64
-                # 1. 改行・空白・タブを全て除去
-                b64str = _re.sub(r'\s+', '', b64str)
-                # 2. 末尾の=をいったん除去して正規化
-                b64str = b64str.rstrip('=')
-                # 3. 正しいパディングを再付与
-                missing_padding = len(b64str) % 4
-                if missing_padding:
-                    b64str += '=' * (4 - missing_padding)
-                cred_json = base64.b64decode(b64str, validate=False).decode("utf-8")
-                cred_dict = json.loads(cred_json)
-                cred = credentials.Certificate(cred_dict)
+                cred = _certificate_from_base64(self._credentials_base64)
             elif Path(self._credentials_path).exists():
                 cred = credentials.Certificate(self._credentials_path)
             else:
@@ -79,6 +100,53 @@ class FirestoreClient:
         self._db = firestore.client()
         return self._db
 
+    def _user_ids(self) -> list[str]:
+        """
+        全ユーザーのUIDのみを取得
+
+        ドキュメントIDだけを射影（select）するため、ユーザーデータ本体は転送しない。
+        """
+        from google.cloud.firestore_v1.field_path import FieldPath
+        db = self._get_db()
+        query = db.collection("users").select([FieldPath.document_id()])
+        return [doc.id for doc in query.stream()]
+
+    def _user_pending_operations(self, uid: str, ordered: bool = True) -> list[dict]:
+        """
+        1ユーザーの pending 操作リクエストを最大10件取得（エラーは呼び出し元で処理）
+
+        Args:
+            uid: Firebase Auth UID
+            ordered: True なら古い順（複合インデックスが必要）。False ならインデックス不要の単純クエリ
+        """
+        from google.cloud.firestore_v1.base_query import FieldFilter
+        query = (
+            self._get_db().collection("users").document(uid).collection("operation_requests")
+            .where(filter=FieldFilter("status", "==", "pending"))
+        )
+        if ordered:
+            query = query.order_by("requested_at")
+        docs = query.limit(10).stream()
+        ops = []
+        for doc in docs:
+            data = doc.to_dict()
+            data["id"] = doc.id
+            data["uid"] = uid
+            ops.append(data)
+        return ops
+
+    def _scan_users(self, fn, uids: list[str]) -> list[tuple]:
+        """
+        ユーザーごとの読み取り fn(uid) を並列実行する
+
+        Firestore クライアントはスレッドセーフなので、ユーザー数分のクエリの待ち時間を重ねられる。
+
+        Returns:
+            [(uid, Future), ...]（uids の順、全て完了済み）
+        """
+        with ThreadPoolExecutor(max_workers=USER_SCAN_WORKERS) as executor:
+            return [(uid, executor.submit(fn, uid)) for uid in uids]
+
     # ========================================
     # ユーザー管理
     # ========================================
@@ -297,17 +365,28 @@ class FirestoreClient:
                 data["uid"] = uid
                 decisions.append(data)
         else:
-            # 全ユーザーをイテレート
-            for user_doc in db.collection("users").stream():
-                user_uid = user_doc.id
-                for doc in db.collection("users").document(user_uid).collection("queue_decisions").stream():
-                    data = doc.to_dict()
-                    data["tweet_id"] = doc.id
-                    data["uid"] = user_uid
-                    decisions.append(data)
+            # 全ユーザー分をコレクショングループで1回のクエリで取得
+            for user_uid, doc in self._queue_decision_docs():
+                data = doc.to_dict()
+                data["tweet_id"] = doc.id
+                data["uid"] = user_uid
+                decisions.append(data)
 
         return decisions
 
+    def _queue_decision_docs(self):
+        """
+        全ユーザーの queue_decisions を (uid, ドキュメント) で列挙
+
+        ユーザーごとにサブコレクションを読むと N+1 回のクエリになるため、
+        コレクショングループで1回だけ読み、パス users/{uid}/queue_decisions/{tweet_id} から uid を得る。
+        """
+        db = self._get_db()
+        for doc in db.collection_group("queue_decisions").stream():
+            user_ref = doc.reference.parent.parent
+            if user_ref is not None:
+                yield user_ref.id, doc
+
     def get_all_queue_decisions(self) -> dict[str, list[dict]]:
         """
         全ユーザーのキュー決定をUID別に取得
@@ -315,19 +394,13 @@ class FirestoreClient:
         Returns:
             {"uid1": [decisions...], "uid2": [decisions...]}
         """
-        db = self._get_db()
         result: dict[str, list[dict]] = {}
 
-        for user_doc in db.collection("users").stream():
-            uid = user_doc.id
-            decisions = []
-            for doc in db.collection("users").document(uid).collection("queue_decisions").stream():
-                data = doc.to_dict()
-                data["tweet_id"] = doc.id
-                data["uid"] = uid
-                decisions.append(data)
-            if decisions:
-                result[uid] = decisions
+        for uid, doc in self._queue_decision_docs():
+            data = doc.to_dict()
+            data["tweet_id"] = doc.id
+            data["uid"] = uid
+            result.setdefault(uid, []).append(data)
 
         return result
 
@@ -433,6 +506,7 @@ class FirestoreClient:
                 docs = (
                     db.collection_group("operation_requests")
                     .where(filter=FieldFilter("status", "==", "pending"))
+                    .order_by("requested_at")
                     .limit(20)
                     .stream()
                 )
@@ -445,21 +519,11 @@ class FirestoreClient:
                     results.append(data)
             except Exception as e:
                 print(f"⚠️ コレクショングループクエリエラー（インデックス未作成の可能性）: {e}")
-                # フォールバック: usersコレクションをイテレート
-                for user_doc in db.collection("users").stream():
-                    user_uid = user_doc.id
+                # フォールバック: ユーザーごとのサブコレクションを並列に走査（インデックス不要のクエリで）
+                unordered = lambda u: self._user_pending_operations(u, ordered=False)
+                for user_uid, future in self._scan_users(unordered, self._user_ids()):
                     try:
-                        fallback_docs = (
-                            db.collection("users").document(user_uid).collection("operation_requests")
-                            .where(filter=FieldFilter("status", "==", "pending"))
-                            .limit(10)
-                            .stream()
-                        )
-                        for doc in fallback_docs:
-                            data = doc.to_dict()
-                            data["id"] = doc.id
-                            data["uid"] = user_uid
-                            results.append(data)
+                        results.extend(future.result())
                     except Exception as e2:
                         print(f"⚠️ ユーザー {user_uid} の操作リクエスト取得エラー: {e2}")
 
@@ -472,26 +536,11 @@ class FirestoreClient:
         Returns:
             {"uid1": [operations...], "uid2": [operations...]}
         """
-        db = self._get_db()
-        from google.cloud.firestore_v1.base_query import FieldFilter
         result: dict[str, list[dict]] = {}
 
-        for user_doc in db.collection("users").stream():
-            uid = user_doc.id
+        for uid, future in self._scan_users(self._user_pending_operations, self._user_ids()):
             try:
-                docs = (
-                    db.collection("users").document(uid).collection("operation_requests")
-                    .where(filter=FieldFilter("status", "==", "pending"))
-                    .order_by("requested_at")
-                    .limit(10)
-                    .stream()
-                )
-                ops = []
-                for doc in docs:
-                    data = doc.to_dict()
-                    data["id"] = doc.id
-                    data["uid"] = uid
-                    ops.append(data)
+                ops = future.result()
                 if ops:
                     result[uid] = ops
             except Exception as e:
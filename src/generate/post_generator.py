@@ -9,8 +9,6 @@ import random
 from datetime import datetime, date
 from pathlib import Path
 
-from google import genai
-
 from src.config import Config
 from src.analyze.scorer import PostScorer
 from src.post.safety_checker import SafetyChecker
@@ -38,6 +36,9 @@ class PostGenerator:
 
         # Gemini初期化
         if config.gemini_api_key:
+            # google-genai は読み込みが重いため、APIキーがある場合のみ import
+            from google import genai
+
             self.client = genai.Client(api_key=config.gemini_api_key)
             self.model_name = config.gemini_model
         else:
@@ -11,11 +11,10 @@ from datetime import datetime, date
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
-from google import genai
-
 from src.config import Config, PROJECT_ROOT
 from src.analyze.scorer import PostScorer
 from src.post.safety_checker import SafetyChecker
+from src.utils import json_loads
 
 JST = ZoneInfo("Asia/Tokyo")
 
@@ -31,19 +30,84 @@ TEMPLATE_IDS = [
     "legend_moment",      # 伝説・歴史型
 ]
 
+# デモモード用のダミー引用RT（テンプレートIDごと。呼び出しのたびに組み立てない）
+_DEMO_TEXTS = {
+    "translate_comment": (
+        "🚨【AI革命】GPT-5のマルチモーダル機能が全業界を変える。\n\n"
+        "市場への影響は計り知れない。🏛️✨\n"
+        "・AI関連銘柄の時価総額が「2兆ドル」を突破する勢い\n"
+        "・従来のSaaS企業は淘汰の危機\n\n"
+        "投資家は今すぐポートフォリオの見直しを。"
+    ),
+    "summary_points": (
+        "💥【速報】OpenAI、企業向けAIエージェントを正式リリース。\n\n"
+        "業界の構図が一変する3つのポイント。🏛️📈\n"
+        "・自律型AIが「月額$200」で導入可能に\n"
+        "・コード不要で業務自動化が完結\n"
+        "・初月で10万社が導入申請\n\n"
+        "SaaS業界、生き残りの分水嶺。"
+    ),
+    "question_prompt": (
+        "🚨【警告】米国AI規制法案、来月にも議会通過の見通し。\n\n"
+        "Web3・暗号資産にも波及する「実績」。🏛️🔥\n"
+        "・AIモデルの学習データに開示義務\n"
+        "・違反企業は最大「売上高10%」の罰金\n\n"
+        "規制は止められない。備えろ。"
+    ),
+    "practice_report": (
+        "💥【激震】Google DeepMind、AGI到達の内部メモが流出。\n\n"
+        "AI業界の「地殻変動」が始まった。🏛️📊\n"
+        "・2026年末までに汎用人工知能の実現を示唆\n"
+        "・GoogleのAI投資額は年間「500億ドル」超\n\n"
+        "もはや止まらない。歴史の転換点。"
+    ),
+    "breaking_news": (
+        "🚨【衝撃】Apple、独自AIチップで「NVIDIA離れ」を宣言。\n\n"
+        "半導体市場に激震が走る。🏛️🇺🇸\n"
+        "・自社開発チップのAI推論性能がH100を「40%」上回る\n"
+        "・NVIDIA株が時間外で8%急落\n\n"
+        "AI覇権の構図が根本から変わる。"
+    ),
+    "exclusive_report": (
+        "💥【独占】ソフトバンク孫正義、さらに「3兆円」のAI投資を決断。\n\n"
+        "世界最大のAIファンドが動いた。🏛️💎\n"
+        "・OpenAI、Anthropicに追加出資\n"
+        "・日本国内にAIデータセンター10拠点建設\n"
+        "・目指すは「AI大国ニッポン」の復権。"
+    ),
+    "dark_alert": (
+        "💀米国失業率、AI自動化で「14.2%」に急騰の予測。\n\n"
+        "ウォール街のAIリサーチが衝撃のデータを公開。🏛️🩸\n"
+        "・ホワイトカラー職の38%が3年以内に消滅リスク\n"
+        "・再就職までの平均期間は「18ヶ月」\n\n"
+        "静かに、しかし確実に雇用崩壊は始まっている。"
+    ),
+    "legend_moment": (
+        "💥【伝説】ビットコイン、ついに「$200,000」の大台を突破。\n\n"
+        "暗号資産の歴史が書き換えられた。🏛️✨\n"
+        "・時価総額は「4兆ドル」でAppleを超える\n"
+        "・機関投資家の参入率が過去最高の67%\n\n"
+        "もう誰もBTCを無視できない。新時代の幕開け。"
+    ),
+}
+
 
 class QuoteGenerator:
     """引用RT投稿文を生成"""
 
-    def __init__(self, config: Config, persona_profile: dict | None = None):
+    def __init__(
+        self,
+        config: Config,
+        persona_profile: dict | None = None,
+        rng: random.Random | None = None,
+    ):
         self.config = config
         self.scorer = PostScorer()
         self.safety_checker = SafetyChecker(config.safety_rules)
 
         # 引用RTルール読み込み
         rules_path = PROJECT_ROOT / "config" / "quote_rt_rules.json"
-        with open(rules_path, "r", encoding="utf-8") as f:
-            self.quote_rules = json.load(f)
+        self.quote_rules = json_loads(rules_path.read_bytes())
 
         # プロンプトテンプレート読み込み
         template_path = PROJECT_ROOT / "src" / "generate" / "templates" / "quote_rt_template.md"
@@ -64,6 +128,9 @@ class QuoteGenerator:
 
         # Gemini初期化
         if config.gemini_api_key:
+            # google-genai は読み込みが重いため、APIキーがある場合のみ import
+            from google import genai
+
             self.client = genai.Client(api_key=config.gemini_api_key)
             self.model_name = config.gemini_model
         else:
@@ -76,13 +143,15 @@ class QuoteGenerator:
         self._usage_date: str = ""
         # 直近使用テンプレート履歴（連続同一パターン防止）
         self._recent_templates: list[str] = []
+        # テンプレート選択用の乱数生成器（テストでシード固定する場合に指定。省略時は random モジュール）
+        # 使用状況はプロセスごとにリセットされるため、既定を決定的にすると毎回同じ順序で選ばれてしまう
+        self._rng = rng or random
 
     def _load_prompt_overrides(self) -> dict:
         """selection_preferences.json から prompt_overrides を読み込み"""
         prefs_path = PROJECT_ROOT / "config" / "selection_preferences.json"
         try:
-            with open(prefs_path, "r", encoding="utf-8") as f:
-                prefs = json.load(f)
+            prefs = json_loads(prefs_path.read_bytes())
             return prefs.get("prompt_overrides", {})
         except (FileNotFoundError, json.JSONDecodeError):
             return {}
@@ -220,7 +289,7 @@ class QuoteGenerator:
             if self._template_usage.get(preferred, 0) < max_daily[preferred]:
                 return preferred
 
-        # 使用可能なテンプレートからランダム選択
+        # 使用可能なテンプレートから選択
         available = [
             tid for tid in enabled_ids
             if tid in TEMPLATE_IDS  # 有効なIDのみ
@@ -239,7 +308,7 @@ class QuoteGenerator:
             if non_recent:
                 available = non_recent
 
-        chosen = random.choice(available)
+        chosen = self._rng.choice(available)
 
         # 履歴を更新（最大10件保持）
         self._recent_templates.append(chosen)
@@ -455,66 +524,7 @@ class QuoteGenerator:
 
     def _generate_demo(self, original_text: str, template_id: str) -> str:
         """デモ用のダミー引用RTを返す"""
-        demos = {
-            "translate_comment": (
-                "🚨【AI革命】GPT-5のマルチモーダル機能が全業界を変える。\n\n"
-                "市場への影響は計り知れない。🏛️✨\n"
-                "・AI関連銘柄の時価総額が「2兆ドル」を突破する勢い\n"
-                "・従来のSaaS企業は淘汰の危機\n\n"
-                "投資家は今すぐポートフォリオの見直しを。"
-            ),
-            "summary_points": (
-                "💥【速報】OpenAI、企業向けAIエージェントを正式リリース。\n\n"
-                "業界の構図が一変する3つのポイント。🏛️📈\n"
-                "・自律型AIが「月額$200」で導入可能に\n"
-                "・コード不要で業務自動化が完結\n"
-                "・初月で10万社が導入申請\n\n"
-                "SaaS業界、生き残りの分水嶺。"
-            ),
-            "question_prompt": (
-                "🚨【警告】米国AI規制法案、来月にも議会通過の見通し。\n\n"
-                "Web3・暗号資産にも波及する「実績」。🏛️🔥\n"
-                "・AIモデルの学習データに開示義務\n"
-                "・違反企業は最大「売上高10%」の罰金\n\n"
-                "規制は止められない。備えろ。"
-            ),
-            "practice_report": (
-                "💥【激震】Google DeepMind、AGI到達の内部メモが流出。\n\n"
-                "AI業界の「地殻変動」が始まった。🏛️📊\n"
-                "・2026年末までに汎用人工知能の実現を示唆\n"
-                "・GoogleのAI投資額は年間「500億ドル」超\n\n"
-                "もはや止まらない。歴史の転換点。"
-            ),
-            "breaking_news": (
-                "🚨【衝撃】Apple、独自AIチップで「NVIDIA離れ」を宣言。\n\n"
-                "半導体市場に激震が走る。🏛️🇺🇸\n"
-                "・自社開発チップのAI推論性能がH100を「40%」上回る\n"
-                "・NVIDIA株が時間外で8%急落\n\n"
-                "AI覇権の構図が根本から変わる。"
-            ),
-            "exclusive_report": (
-                "💥【独占】ソフトバンク孫正義、さらに「3兆円」のAI投資を決断。\n\n"
-                "世界最大のAIファンドが動いた。🏛️💎\n"
-                "・OpenAI、Anthropicに追加出資\n"
-                "・日本国内にAIデータセンター10拠点建設\n"
-                "・目指すは「AI大国ニッポン」の復権。"
-            ),
-            "dark_alert": (
-                "💀米国失業率、AI自動化で「14.2%」に急騰の予測。\n\n"
-                "ウォール街のAIリサーチが衝撃のデータを公開。🏛️🩸\n"
-                "・ホワイトカラー職の38%が3年以内に消滅リスク\n"
-                "・再就職までの平均期間は「18ヶ月」\n\n"
-                "静かに、しかし確実に雇用崩壊は始まっている。"
-            ),
-            "legend_moment": (
-                "💥【伝説】ビットコイン、ついに「$200,000」の大台を突破。\n\n"
-                "暗号資産の歴史が書き換えられた。🏛️✨\n"
-                "・時価総額は「4兆ドル」でAppleを超える\n"
-                "・機関投資家の参入率が過去最高の67%\n\n"
-                "もう誰もBTCを無視できない。新時代の幕開け。"
-            ),
-        }
-        return demos.get(template_id, demos["translate_comment"])
+        return _DEMO_TEXTS.get(template_id, _DEMO_TEXTS["translate_comment"])
 
     def _build_retry_hint(self, score, safety) -> str:
         """リトライ時のヒント"""
@@ -7,7 +7,7 @@ usage:
     python -m src.main curate --account 1 [--dry-run]
     python -m src.main curate-post --account 1
     python -m src.main collect [--dry-run] [--auto-approve] [--min-likes 500]
-    python -m src.main import-urls --account 1 [--auto-approve]
+    python -m src.main import-urls --account 1 [--auto-approve] [--full-scan]
     python -m src.main setup-sheets --account 1
     python -m src.main notify-test
     python -m src.main metrics --account 1 [--days 7]
@@ -356,15 +356,17 @@ def cmd_curate_pipeline(args):
             db = fc._get_db()
 
             # selection_preferences
-            prefs = db.collection("selection_preferences").document(data_uid).get()
+            prefs = db.collection("selection_preferences").document(data_uid).get(
+                field_paths=["min_likes_override", "max_tweets_override", "max_age_hours_override"]
+            )
             if prefs.exists:
                 p = prefs.to_dict()
                 collect_min_likes = int(p.get("min_likes_override", 0))
                 collect_max_tweets = int(p.get("max_tweets_override", 100))
                 collect_max_age = int(p.get("max_age_hours_override", 48))
 
-            # api_keys から SocialData API キーを取得
-            api_keys_doc = db.collection("api_keys").document(data_uid).get()
+            # api_keys から SocialData API キーを取得（他のキーは読まない）
+            api_keys_doc = db.collection("api_keys").document(data_uid).get(field_paths=["socialdata_api_key"])
             if api_keys_doc.exists:
                 api_keys = api_keys_doc.to_dict()
                 socialdata_api_key = api_keys.get("socialdata_api_key", "")
@@ -708,6 +710,7 @@ def cmd_collect(args):
 
     # スプシから設定を読み込み（環境変数が設定されていれば）
     sheet_settings = {}
+    sheet_prefs = None
     sync = None
     try:
         from src.sheets.sheets_client import SheetsClient
@@ -716,7 +719,7 @@ def cmd_collect(args):
         if config_for_sheets.spreadsheet_id:
             sheets = SheetsClient(config_for_sheets)
             sync = QueueSync(sheets)
-            sheet_settings = sync.read_settings()
+            sheet_settings, sheet_prefs = sync.read_settings_and_preferences()
             if sheet_settings:
                 print(f"📋 シート設定を読み込み: {sheet_settings}")
     except Exception as e:
@@ -725,7 +728,7 @@ def cmd_collect(args):
     # プリファレンス同期（Sheets → ローカルJSON）
     if sync:
         try:
-            pref_result = sync.sync_preferences()
+            pref_result = sync.sync_preferences(sheet_prefs)
             if pref_result["updated_keys"]:
                 print(f"🎯 プリファレンス同期(Sheets): {', '.join(pref_result['updated_keys'])}")
         except Exception as e:
@@ -768,7 +771,9 @@ def cmd_collect(args):
             db = fc._get_db()
             
             # 閾値上書き
-            prefs_doc = db.collection("selection_preferences").document(data_uid).get()
+            prefs_doc = db.collection("selection_preferences").document(data_uid).get(
+                field_paths=["min_likes_override", "max_tweets_override", "max_age_hours_override"]
+            )
             if prefs_doc.exists:
                 p = prefs_doc.to_dict()
                 if effective_min_likes is None:
@@ -778,8 +783,8 @@ def cmd_collect(args):
                 if effective_max_age is None:
                     effective_max_age = int(p.get("max_age_hours_override", 48))
 
-            # APIキー
-            api_keys_doc = db.collection("api_keys").document(data_uid).get()
+            # APIキー（SocialData のキーのみ取得）
+            api_keys_doc = db.collection("api_keys").document(data_uid).get(field_paths=["socialdata_api_key"])
             if api_keys_doc.exists:
                 socialdata_api_key = api_keys_doc.to_dict().get("socialdata_api_key", "")
     except Exception as e:
@@ -824,6 +829,7 @@ def cmd_collect(args):
             sync.sync_collection_log(result)
             sync.sync_to_sheet()
             sync.sync_dashboard(collection_result=result)
+            sync.sheets.flush_appends()
             print("📊 スプレッドシートに同期しました")
         except Exception as e:
             print(f"⚠️ スプシ同期エラー: {e}")
@@ -993,7 +999,7 @@ def cmd_import_urls(args):
         return
 
     importer = URLImporter(sheets)
-    result = importer.import_urls(auto_approve=args.auto_approve)
+    result = importer.import_urls(auto_approve=args.auto_approve, full_scan=args.full_scan)
 
     print(f"\n{'='*50}")
     print(importer.format_result(result))
@@ -1698,6 +1704,8 @@ def main():
     # import-urls (パターンA: スプシ→キュー)
     import_parser = add_account_arg(subparsers.add_parser("import-urls", help="スプレッドシートからURL一括インポート"))
     import_parser.add_argument("--auto-approve", action="store_true", help="インポートと同時に承認")
+    import_parser.add_argument("--full-scan", action="store_true",
+                               help="読み取りカーソルを無視してシート全体を再スキャン（ステータスを消して再処理する場合）")
 
     # setup-sheets (初回セットアップ)
     add_account_arg(subparsers.add_parser("setup-sheets", help="スプレッドシートの初期セットアップ"))
@@ -4,13 +4,13 @@ X Auto Post System — 投稿ミックスプランナー
 引用RT / オリジナル投稿の比率管理、時間分散、連続投稿制限を管理。
 BAN対策の核となるモジュール。
 """
-import json
 import random
 from datetime import datetime, timedelta
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
 from src.config import PROJECT_ROOT
+from src.utils import json_loads
 
 JST = ZoneInfo("Asia/Tokyo")
 
@@ -37,12 +37,17 @@ MIN_INTERVAL_MINUTES = 60
 class MixPlanner:
     """引用RT/オリジナルの投稿ミックスを計画"""
 
-    def __init__(self):
+    def __init__(self, rng: random.Random | None = None):
+        """
+        Args:
+            rng: 乱数生成器（テストでシード固定する場合に指定。省略時は random モジュール）
+        """
+        self._rng = rng or random
+
         # 引用RTルール読み込み
         rules_path = PROJECT_ROOT / "config" / "quote_rt_rules.json"
         if rules_path.exists():
-            with open(rules_path, "r", encoding="utf-8") as f:
-                self.rules = json.load(f)
+            self.rules = json_loads(rules_path.read_bytes())
         else:
             self.rules = {}
 
@@ -136,7 +141,7 @@ class MixPlanner:
         for i in range(min_count, max_count + 1):
             # 多い方が高確率（例: 7=5%, 8=15%, 9=30%, 10=50%）
             weights.append((i - min_count + 1) ** 2)
-        return random.choices(range(min_count, max_count + 1), weights=weights)[0]
+        return self._rng.choices(range(min_count, max_count + 1), weights=weights)[0]
 
     def _select_slots(self, count: int) -> list[dict]:
         """使用するスロットを選択（count件）"""
@@ -146,7 +151,7 @@ class MixPlanner:
         # 最初と最後は必ず含める + 残りをランダム選択
         selected = [DEFAULT_SLOTS[0], DEFAULT_SLOTS[-1]]
         remaining = DEFAULT_SLOTS[1:-1]
-        random.shuffle(remaining)
+        self._rng.shuffle(remaining)
         selected.extend(remaining[:count - 2])
 
         # 時間順にソート
@@ -157,25 +162,21 @@ class MixPlanner:
         """各スロットに投稿タイプを割り当て"""
         plan = []
         quote_count = 0
-        original_count = 0
 
         # 目標比率
         quote_ratio_max = self.mix_rules.get("quote_rt_ratio_max", 0.7)
         max_quotes = int(len(slots) * quote_ratio_max)
         max_quotes = min(max_quotes, available_quotes)
 
-        for slot in slots:
-            pool = slot["type_pool"]
-
-            # 連続引用RT制限チェック
-            max_consecutive = self.rules.get("quote_rt", {}).get("max_consecutive_quotes", 2)
-            recent_types = [p["type"] for p in plan[-max_consecutive:]]
-            consecutive_quotes = all(t == "quote_rt" for t in recent_types) if recent_types else False
+        # 連続引用RT制限（直前の引用RT連続数をカウンタで保持し、過去分を見直さない）
+        max_consecutive = self.rules.get("quote_rt", {}).get("max_consecutive_quotes", 2)
+        consecutive = 0
 
-            if consecutive_quotes and len(recent_types) >= max_consecutive:
+        for slot in slots:
+            if plan and consecutive >= max_consecutive:
                 # 連続制限に達した → オリジナルを強制
                 post_type = "original"
-            elif "quote_rt" in pool and quote_count < max_quotes:
+            elif "quote_rt" in slot["type_pool"] and quote_count < max_quotes:
                 post_type = "quote_rt"
             else:
                 # 引用RT枠を使い切った or poolにquote_rtがない → オリジナル
@@ -183,8 +184,9 @@ class MixPlanner:
 
             if post_type == "quote_rt":
                 quote_count += 1
+                consecutive += 1
             else:
-                original_count += 1
+                consecutive = 0
 
             plan.append({
                 **slot,
@@ -196,7 +198,7 @@ class MixPlanner:
     def _randomize_times(self, plan: list[dict]) -> list[dict]:
         """投稿時間にランダムジッターを追加"""
         for item in plan:
-            jitter = random.randint(-item["jitter_min"], item["jitter_min"])
+            jitter = self._rng.randint(-item["jitter_min"], item["jitter_min"])
             hour = item["base_hour"]
             minute = item["base_minute"] + jitter
 
@@ -219,17 +221,18 @@ class MixPlanner:
 
     def _enforce_min_interval(self, plan: list[dict]) -> list[dict]:
         """最小投稿間隔を確保"""
-        for i in range(1, len(plan)):
-            prev_time = plan[i - 1]["scheduled_hour"] * 60 + plan[i - 1]["scheduled_minute"]
-            curr_time = plan[i]["scheduled_hour"] * 60 + plan[i]["scheduled_minute"]
-            diff = curr_time - prev_time
+        if not plan:
+            return plan
+        prev_time = plan[0]["scheduled_hour"] * 60 + plan[0]["scheduled_minute"]
+        for item in plan[1:]:
+            curr_time = item["scheduled_hour"] * 60 + item["scheduled_minute"]
 
-            if diff < MIN_INTERVAL_MINUTES:
+            if curr_time - prev_time < MIN_INTERVAL_MINUTES:
                 # 現在のスロットを後ろにずらす
-                new_minute = prev_time + MIN_INTERVAL_MINUTES
-                plan[i]["scheduled_hour"] = new_minute // 60
-                plan[i]["scheduled_minute"] = new_minute % 60
-                plan[i]["time"] = f"{plan[i]['scheduled_hour']:02d}:{plan[i]['scheduled_minute']:02d}"
+                curr_time = prev_time + MIN_INTERVAL_MINUTES
+                item["scheduled_hour"], item["scheduled_minute"] = divmod(curr_time, 60)
+                item["time"] = f"{item['scheduled_hour']:02d}:{item['scheduled_minute']:02d}"
+            prev_time = curr_time
 
         return plan
 
@@ -7,6 +7,34 @@ import re
 from dataclasses import dataclass, field
 from difflib import SequenceMatcher
 
+from src.post.simhash import similarity as simhash_similarity, simhash
+
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick は任意依存（未インストール時は単語ごとの部分一致で代替）
+    ahocorasick = None
+
+
+# チェック用パターン（投稿ごとに呼ばれるためモジュール読み込み時に1回だけコンパイル）
+_HASHTAG_RE = re.compile(r'#\S+')
+_LINK_RE = re.compile(r'https?://\S+')
+_EMOJI_RE = re.compile(
+    "["
+    "\U0001F600-\U0001F64F"  # emoticons
+    "\U0001F300-\U0001F5FF"  # symbols & pictographs
+    "\U0001F680-\U0001F6FF"  # transport & map symbols
+    "\U0001F1E0-\U0001F1FF"  # flags
+    "\U00002702-\U000027B0"  # dingbats
+    "\U0001F900-\U0001F9FF"  # supplemental symbols
+    "\U0001FA00-\U0001FA6F"  # chess symbols
+    "\U0001FA70-\U0001FAFF"  # symbols extended-A
+    "\U00002600-\U000026FF"  # misc symbols
+    "\U0000FE00-\U0000FE0F"  # variation selectors
+    "\U0000200D"             # zero width joiner
+    "]",
+    flags=re.UNICODE
+)
+
 
 @dataclass
 class SafetyResult:
@@ -28,7 +56,34 @@ class SafetyChecker:
         self.rules = safety_rules
         self._ng_words = []
         for category_words in safety_rules.get("ng_words", {}).values():
-            self._ng_words.extend(category_words)
+            self._ng_words.extend(w for w in category_words if w)
+        self._ng_lower = [w.lower() for w in self._ng_words]
+        self._ng_automaton = self._build_ng_automaton(self._ng_lower)
+        # オートマトンが使えない場合の事前判定用（全NGワードの和集合を1回の走査で探す）
+        self._ng_pattern = (
+            re.compile("|".join(map(re.escape, dict.fromkeys(self._ng_lower))))
+            if self._ng_automaton is None and self._ng_lower else None
+        )
+
+    @staticmethod
+    def _build_ng_automaton(words_lower: list[str]):
+        """
+        NGワード（小文字化済み）から Aho-Corasick オートマトンを構築
+
+        本文を1回走査するだけで全NGワードを検出できる。
+        値は該当する self._ng_words のインデックス（カテゴリ間の重複に対応）。
+        pyahocorasick 未インストール時は None。
+        """
+        if ahocorasick is None or not words_lower:
+            return None
+        indices: dict[str, list[int]] = {}
+        for i, word in enumerate(words_lower):
+            indices.setdefault(word, []).append(i)
+        automaton = ahocorasick.Automaton()
+        for word, idx in indices.items():
+            automaton.add_word(word, tuple(idx))
+        automaton.make_automaton()
+        return automaton
 
     def check(
         self,
@@ -37,6 +92,8 @@ class SafetyChecker:
         last_post_minutes_ago: int | None = None,
         is_quote_rt: bool = False,
         quote_rt_context: dict | None = None,
+        past_post_hashes: list[int] | None = None,
+        short_circuit: bool = True,
     ) -> SafetyResult:
         """
         全安全チェックを実行
@@ -51,18 +108,19 @@ class SafetyChecker:
                 "today_same_source_count": int,
                 "consecutive_quote_count": int,
             }
+            past_post_hashes: 過去投稿の SimHash（指定時は past_posts より優先し、
+                              difflib の代わりにハミング距離で重複検出）
+            short_circuit: True なら他の違反が見つかった時点で重複チェックを省略
+                           （False で全項目を判定したレポートを返す）
         """
         violations = []
         warnings = []
 
-        # 1. NGワードチェック
-        ng_found = self._check_ng_words(text)
-        if ng_found:
-            violations.append(f"NGワード検出: {', '.join(ng_found)}")
+        # 軽い判定から順に実行し、最も重い重複チェックは最後に回す
 
-        # 2. 文字数チェック
+        # 1. 文字数チェック
         content_rules = self.rules.get("content_rules", {})
-        text_len = len(text.replace('\n', ''))
+        text_len = len(text) - text.count('\n')
 
         if is_quote_rt:
             # 引用RTは短め（URL分を考慮）
@@ -77,58 +135,34 @@ class SafetyChecker:
         if text_len > max_len:
             violations.append(f"文字数超過: {text_len}字 (最大{max_len}字)")
 
-        # 3. ハッシュタグ数チェック
+        # 2. ハッシュタグ数チェック（'#' を含まなければ走査しない）
         max_hashtags = content_rules.get("max_hashtags", 3)
-        hashtags = re.findall(r'#\S+', text)
-        if len(hashtags) > max_hashtags:
-            violations.append(f"ハッシュタグ過多: {len(hashtags)}個 (最大{max_hashtags}個)")
+        hashtag_count = len(_HASHTAG_RE.findall(text)) if '#' in text else 0
+        if hashtag_count > max_hashtags:
+            violations.append(f"ハッシュタグ過多: {hashtag_count}個 (最大{max_hashtags}個)")
 
-        # 4. リンク数チェック（引用RTはURL不要、APIが付与）
+        # 3. リンク数チェック（引用RTはURL不要、APIが付与）
+        link_count = len(_LINK_RE.findall(text)) if 'http' in text else 0
         if is_quote_rt:
-            links = re.findall(r'https?://\S+', text)
-            if len(links) > 0:
+            if link_count > 0:
                 warnings.append("引用RTコメントにURL不要（APIが自動付与）")
         else:
             max_links = content_rules.get("max_links", 1)
-            links = re.findall(r'https?://\S+', text)
-            if len(links) > max_links:
-                violations.append(f"リンク過多: {len(links)}個 (最大{max_links}個)")
+            if link_count > max_links:
+                violations.append(f"リンク過多: {link_count}個 (最大{max_links}個)")
 
-        # 5. 絵文字数チェック
+        # 4. 絵文字数チェック
         max_emoji = content_rules.get("max_emoji", 3)
-        emoji_pattern = re.compile(
-            "["
-            "\U0001F600-\U0001F64F"  # emoticons
-            "\U0001F300-\U0001F5FF"  # symbols & pictographs
-            "\U0001F680-\U0001F6FF"  # transport & map symbols
-            "\U0001F1E0-\U0001F1FF"  # flags
-            "\U00002702-\U000027B0"  # dingbats
-            "\U0001F900-\U0001F9FF"  # supplemental symbols
-            "\U0001FA00-\U0001FA6F"  # chess symbols
-            "\U0001FA70-\U0001FAFF"  # symbols extended-A
-            "\U00002600-\U000026FF"  # misc symbols
-            "\U0000FE00-\U0000FE0F"  # variation selectors
-            "\U0000200D"             # zero width joiner
-            "]",
-            flags=re.UNICODE
-        )
-        emojis = emoji_pattern.findall(text)
-        emoji_count = len(emojis)
+        emoji_count = len(_EMOJI_RE.findall(text))
         if emoji_count > max_emoji:
             warnings.append(f"絵文字{emoji_count}個 (推奨{max_emoji}個以下)")
 
-        # 6. 重複チェック
-        if past_posts:
-            threshold = self.rules.get("quality_rules", {}).get("duplicate_threshold", 0.8)
-            for past in past_posts:
-                similarity = SequenceMatcher(None, text, past).ratio()
-                if similarity >= threshold:
-                    violations.append(
-                        f"過去投稿と類似度{similarity:.0%} (閾値{threshold:.0%})"
-                    )
-                    break
+        # 5. NGワードチェック
+        ng_found = self._check_ng_words(text)
+        if ng_found:
+            violations.append(f"NGワード検出: {', '.join(ng_found)}")
 
-        # 7. 投稿間隔チェック（10投稿対応: 60分間隔）
+        # 6. 投稿間隔チェック（10投稿対応: 60分間隔）
         if last_post_minutes_ago is not None:
             min_interval = self.rules.get("posting_rules", {}).get(
                 "posting_interval_min_minutes", 60
@@ -138,15 +172,42 @@ class SafetyChecker:
                     f"投稿間隔不足: {last_post_minutes_ago}分 (最低{min_interval}分)"
                 )
 
-        # 8. 引用RT専用チェック
+        # 7. 引用RT専用チェック
         if is_quote_rt and quote_rt_context:
             qt_violations, qt_warnings = self._check_quote_rt(text, quote_rt_context)
             violations.extend(qt_violations)
             warnings.extend(qt_warnings)
 
+        # 8. 重複チェック（既に違反があり short_circuit なら省略）
+        if not (violations and short_circuit):
+            duplicate = self._check_duplicate(text, past_posts, past_post_hashes)
+            if duplicate:
+                violations.append(duplicate)
+
         is_safe = len(violations) == 0
         return SafetyResult(is_safe=is_safe, violations=violations, warnings=warnings)
 
+    def _check_duplicate(
+        self,
+        text: str,
+        past_posts: list[str] | None,
+        past_post_hashes: list[int] | None,
+    ) -> str:
+        """過去投稿との重複を判定（該当時は違反メッセージ、なければ空文字）"""
+        threshold = self.rules.get("quality_rules", {}).get("duplicate_threshold", 0.8)
+        if past_post_hashes:
+            text_hash = simhash(text)
+            for past_hash in past_post_hashes:
+                similarity = simhash_similarity(text_hash, past_hash)
+                if similarity >= threshold:
+                    return f"過去投稿と類似度{similarity:.0%} (閾値{threshold:.0%})"
+        elif past_posts:
+            for past in past_posts:
+                similarity = SequenceMatcher(None, text, past).ratio()
+                if similarity >= threshold:
+                    return f"過去投稿と類似度{similarity:.0%} (閾値{threshold:.0%})"
+        return ""
+
     def _check_quote_rt(self, text: str, context: dict) -> tuple[list[str], list[str]]:
         """引用RT専用の安全チェック"""
         violations = []
@@ -177,13 +238,18 @@ class SafetyChecker:
         return violations, warnings
 
     def _check_ng_words(self, text: str) -> list[str]:
-        """NGワードを検出"""
+        """NGワードを検出（定義順で返す）"""
         text_lower = text.lower()
-        found = []
-        for word in self._ng_words:
-            if word.lower() in text_lower:
-                found.append(word)
-        return found
+        if self._ng_automaton is None:
+            # 大半の投稿はNGワードを含まないため、和集合パターンで1回走査して該当なしなら終了
+            if self._ng_pattern is None or not self._ng_pattern.search(text_lower):
+                return []
+            return [w for w, lw in zip(self._ng_words, self._ng_lower) if lw in text_lower]
+
+        hits = set()
+        for _, idx in self._ng_automaton.iter(text_lower):
+            hits.update(idx)
+        return [self._ng_words[i] for i in sorted(hits)]
 
     def format_result(self, result: SafetyResult) -> str:
         """結果をフォーマット"""
@@ -0,0 +1,23 @@
+"""
+X Auto Post System — 安全ルールの読み込み
+
+config/safety_rules.json を同じプロセス内で1回だけ解析し、
+Config・SafetyChecker・テストで共有する。
+"""
+from functools import lru_cache
+from pathlib import Path
+
+from src.config import PROJECT_ROOT
+from src.utils import json_loads
+
+SAFETY_RULES_PATH = PROJECT_ROOT / "config" / "safety_rules.json"
+
+
+@lru_cache(maxsize=4)
+def load_rules(path: str = str(SAFETY_RULES_PATH)) -> dict:
+    """
+    安全ルールJSONを読み込み（同じパスの再読み込みはキャッシュから返す）
+
+    返り値は呼び出し元で共有されるため変更しないこと。
+    """
+    return json_loads(Path(path).read_bytes())
@@ -4,13 +4,13 @@ X Auto Post System — 投稿スケジューラー
 投稿時間管理（7:00, 12:00, 21:00 ±15分ランダム化）。
 GitHub Actions の cron から呼ばれた際に、今が投稿時間かを判定。
 """
-import json
 import random
 from datetime import datetime, timedelta
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
 from src.config import Config, PROJECT_ROOT
+from src.utils import json_dumps, json_loads
 
 
 JST = ZoneInfo("Asia/Tokyo")
@@ -92,8 +92,7 @@ class Scheduler:
 
         pending = []
         for filepath in files:
-            with open(filepath, "r", encoding="utf-8") as f:
-                posts = json.load(f)
+            posts = json_loads(filepath.read_bytes())
             for post in posts:
                 if not post.get("posted", False):
                     pending.append({**post, "_filepath": str(filepath)})
@@ -102,8 +101,7 @@ class Scheduler:
 
     def mark_as_posted(self, filepath: str, slot: str, tweet_id: str):
         """投稿済みマークを付ける"""
-        with open(filepath, "r", encoding="utf-8") as f:
-            posts = json.load(f)
+        posts = json_loads(Path(filepath).read_bytes())
 
         for post in posts:
             if post.get("slot") == slot:
@@ -112,8 +110,7 @@ class Scheduler:
                 post["posted_at"] = datetime.now(JST).isoformat()
                 break
 
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(posts, f, ensure_ascii=False, indent=2)
+        Path(filepath).write_bytes(json_dumps(posts))
 
     def should_post_now(self, post: dict, tolerance_minutes: int = 30) -> bool:
         """この投稿を今投稿すべきかどうか"""
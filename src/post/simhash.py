@@ -0,0 +1,47 @@
+"""
+X Auto Post System — SimHash（重複投稿の近似検出）
+
+文字3-gramの64bit SimHashを計算し、ハミング距離で類似度を近似する。
+過去投稿ごとの比較が整数XOR + popcount になるため、
+difflib.SequenceMatcher（文字列長の2乗）より大量の過去投稿に向く。
+ハッシュは blake2b で計算するため、プロセスをまたいで保存・再利用できる。
+"""
+from hashlib import blake2b
+
+SIMHASH_BITS = 64
+NGRAM = 3
+
+
+def _ngram_hash(gram: str) -> int:
+    """n-gram の64bitハッシュ（PYTHONHASHSEED に依存しない）"""
+    return int.from_bytes(blake2b(gram.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(text: str) -> int:
+    """
+    テキストの64bit SimHash
+
+    改行・空白は除いて比較する（SafetyChecker の文字数判定と同じく本文のみを見る）。
+    3文字未満のテキストは全体を1つの n-gram として扱う。
+    """
+    text = "".join(text.split())
+    if not text:
+        return 0
+    grams = [text[i:i + NGRAM] for i in range(max(len(text) - NGRAM + 1, 1))]
+
+    weights = [0] * SIMHASH_BITS
+    for gram in grams:
+        h = _ngram_hash(gram)
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if h >> bit & 1 else -1
+
+    result = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            result |= 1 << bit
+    return result
+
+
+def similarity(a: int, b: int) -> float:
+    """2つの SimHash の類似度（一致ビットの割合 0.0〜1.0）"""
+    return 1.0 - (a ^ b).bit_count() / SIMHASH_BITS
@@ -5,21 +5,76 @@ tweepy の POST /2/tweets が Pay Per Use プランで403になるため、
 requests-oauthlib による OAuth 1.0a 直接実装に切り替え。
 引用RT・通常投稿・削除に対応。
 """
+import mimetypes
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+from typing import TYPE_CHECKING
+
 import requests
-from requests_oauthlib import OAuth1Session
 
 from src.config import Config
 
+if TYPE_CHECKING:
+    from requests_oauthlib import OAuth1Session
+
+
+class _RateLimitPacer:
+    """
+    x-rate-limit-* ヘッダーに基づき、エンドポイントごとに呼び出し間隔を調整
+
+    残り回数をリセットまでの時間に均等配分して待機するため、
+    上限到達後に15分待たされる事態を避けられる。
+    """
+
+    def __init__(self):
+        self._limits: dict[str, tuple[int, float]] = {}
+
+    def wait(self, endpoint: str):
+        """次の呼び出し前に必要な分だけ待機"""
+        limit = self._limits.get(endpoint)
+        if not limit:
+            return
+        remaining, reset_at = limit
+        delay = max(0.0, reset_at - time.time()) / max(1, remaining)
+        if delay >= 5:
+            print(f"  ⏳ レート制限調整: {endpoint} {delay:.0f}秒待機（残り{remaining}回）")
+        if delay > 0:
+            time.sleep(delay)
+
+    def update(self, endpoint: str, response: requests.Response):
+        """レスポンスヘッダーから残り回数・リセット時刻を記録"""
+        try:
+            remaining = int(response.headers["x-rate-limit-remaining"])
+            reset_at = float(response.headers["x-rate-limit-reset"])
+        except (KeyError, TypeError, ValueError):
+            return
+        self._limits[endpoint] = (remaining, reset_at)
+
 
 class XPoster:
     """X (Twitter) APIを使った投稿 (requests-oauthlib版)"""
 
     BASE_URL = "https://api.twitter.com/2"
+    UPLOAD_URL = "https://upload.twitter.com/1.1/media/upload.json"
+
+    # チャンクアップロードの閾値・分割サイズ（X の APPEND 上限は 5MB/チャンク）
+    CHUNKED_UPLOAD_THRESHOLD = 5 * 1024 * 1024
+    CHUNK_SIZE = 4 * 1024 * 1024
+    CHUNKED_EXTENSIONS = {".mp4", ".mov", ".gif"}
+    APPEND_WORKERS = 4
+    # 動画/GIF のサーバー側処理（STATUS ポーリング）を待つ最大秒数
+    PROCESSING_TIMEOUT = 300
 
     def __init__(self, config: Config):
         self.config = config
         self._session = None
+        self._pacer = _RateLimitPacer()
+        # メトリクスキャッシュ (tweet_id -> (有効期限, metrics))
+        self._metrics_cache: dict[str, tuple[float, dict]] = {}
         self._validate_credentials()
 
     def _validate_credentials(self):
@@ -40,9 +95,11 @@ class XPoster:
             )
 
     @property
-    def session(self) -> OAuth1Session:
+    def session(self) -> "OAuth1Session":
         """OAuth1Session (lazy init)"""
         if self._session is None:
+            from requests_oauthlib import OAuth1Session
+
             self._session = OAuth1Session(
                 self.config.x_api_key,
                 client_secret=self.config.x_api_secret,
@@ -194,21 +251,110 @@ class XPoster:
         """
         メディアをアップロード（v1.1 API — requests-oauthlib版）
 
+        5MB超、または動画/GIFはチャンクアップロードを使用する。
+
         Args:
             file_path: メディアファイルのパス
 
         Returns:
             media_id (str)
         """
-        upload_url = "https://upload.twitter.com/1.1/media/upload.json"
-        with open(file_path, "rb") as f:
-            resp = self.session.post(upload_url, files={"media": f})
+        path = Path(file_path)
+        if (path.suffix.lower() in self.CHUNKED_EXTENSIONS
+                or path.stat().st_size > self.CHUNKED_UPLOAD_THRESHOLD):
+            return self._chunked_upload(path)
+
+        with open(path, "rb") as f:
+            resp = self.session.post(self.UPLOAD_URL, files={"media": f})
         if resp.status_code not in (200, 201, 202):
             raise RuntimeError(
                 f"メディアアップロード失敗: {resp.status_code} {resp.text[:300]}"
             )
         return str(resp.json().get("media_id_string", ""))
 
+    def _chunked_upload(self, path: Path) -> str:
+        """
+        INIT → APPEND（並列）→ FINALIZE → STATUS のチャンクアップロード
+
+        Returns:
+            media_id (str)
+        """
+        total_bytes = path.stat().st_size
+        media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        if media_type == "image/gif":
+            category = "tweet_gif"
+        elif media_type.startswith("video/"):
+            category = "tweet_video"
+        else:
+            category = "tweet_image"
+
+        # INIT
+        resp = self.session.post(self.UPLOAD_URL, data={
+            "command": "INIT",
+            "total_bytes": total_bytes,
+            "media_type": media_type,
+            "media_category": category,
+        })
+        if resp.status_code not in (200, 201, 202):
+            raise RuntimeError(
+                f"メディアアップロード失敗 (INIT): {resp.status_code} {resp.text[:300]}"
+            )
+        media_id = str(resp.json().get("media_id_string", ""))
+
+        # APPEND（segment_index ごとに独立して送れるため並列化）
+        def _append(segment_index: int):
+            with open(path, "rb") as f:
+                f.seek(segment_index * self.CHUNK_SIZE)
+                chunk = f.read(self.CHUNK_SIZE)
+            append_resp = self.session.post(
+                self.UPLOAD_URL,
+                data={"command": "APPEND", "media_id": media_id,
+                      "segment_index": segment_index},
+                files={"media": chunk},
+            )
+            if append_resp.status_code not in (200, 201, 202, 204):
+                raise RuntimeError(
+                    f"メディアアップロード失敗 (APPEND {segment_index}): "
+                    f"{append_resp.status_code} {append_resp.text[:300]}"
+                )
+
+        segments = range(-(-total_bytes // self.CHUNK_SIZE))
+        with ThreadPoolExecutor(max_workers=self.APPEND_WORKERS) as pool:
+            list(pool.map(_append, segments))
+
+        # FINALIZE
+        resp = self.session.post(self.UPLOAD_URL, data={
+            "command": "FINALIZE", "media_id": media_id,
+        })
+        if resp.status_code not in (200, 201, 202):
+            raise RuntimeError(
+                f"メディアアップロード失敗 (FINALIZE): {resp.status_code} {resp.text[:300]}"
+            )
+
+        # 動画/GIFはサーバー側の処理完了を待つ（待機の合計は PROCESSING_TIMEOUT 秒まで）
+        info = resp.json().get("processing_info")
+        waited = 0
+        while info and info.get("state") in ("pending", "in_progress"):
+            wait = info.get("check_after_secs", 1)
+            if waited + wait > self.PROCESSING_TIMEOUT:
+                raise RuntimeError(
+                    f"メディア処理がタイムアウトしました ({self.PROCESSING_TIMEOUT}秒): media_id={media_id}"
+                )
+            time.sleep(wait)
+            waited += wait
+            resp = self.session.get(self.UPLOAD_URL, params={
+                "command": "STATUS", "media_id": media_id,
+            })
+            if resp.status_code != 200:
+                raise RuntimeError(
+                    f"メディアアップロード失敗 (STATUS): {resp.status_code} {resp.text[:300]}"
+                )
+            info = resp.json().get("processing_info")
+        if info and info.get("state") == "failed":
+            raise RuntimeError(f"メディア処理失敗: {info.get('error', info)}")
+
+        return media_id
+
     def post_with_image(self, text: str, image_path: str) -> dict:
         """テキスト + 画像を投稿"""
         media_id = self.upload_media(image_path)
@@ -226,7 +372,9 @@ class XPoster:
         """
         try:
             # 1. 自分のユーザーID取得
+            self._pacer.wait("users/me")
             me_resp = self.session.get(f"{self.BASE_URL}/users/me")
+            self._pacer.update("users/me", me_resp)
             if me_resp.status_code != 200:
                 print(f"  ⚠️ get_recent_tweets: GET /users/me → {me_resp.status_code}")
                 return []
@@ -239,9 +387,11 @@ class XPoster:
                 "max_results": min(max_results, 100),
                 "tweet.fields": "created_at,text",
             }
+            self._pacer.wait("users/tweets")
             tweets_resp = self.session.get(
                 f"{self.BASE_URL}/users/{user_id}/tweets", params=params
             )
+            self._pacer.update("users/tweets", tweets_resp)
             if tweets_resp.status_code != 200:
                 print(f"  ⚠️ get_recent_tweets: GET /users/{{id}}/tweets → {tweets_resp.status_code}")
                 return []
@@ -259,6 +409,12 @@ class XPoster:
             print(f"  ⚠️ get_recent_tweets: {e}")
             return []
 
+    # GET /2/tweets の ids パラメータ上限
+    METRICS_BATCH_SIZE = 100
+    # メトリクスのキャッシュ期間（投稿24時間後にはほぼ確定するため長めに保持）
+    METRICS_TTL_FRESH = 15 * 60
+    METRICS_TTL_SETTLED = 24 * 60 * 60
+
     def get_tweet_metrics(self, tweet_id: str) -> dict:
         """
         ツイートのエンゲージメントを取得（requests版 — tweepy不要）
@@ -266,33 +422,77 @@ class XPoster:
         Returns:
             {"likes": int, "retweets": int, "replies": int, ...}
         """
+        return self.get_tweets_metrics([tweet_id]).get(str(tweet_id), {})
+
+    def get_tweets_metrics(self, tweet_ids: list[str]) -> dict[str, dict]:
+        """
+        複数ツイートのエンゲージメントを一括取得（GET /2/tweets — 100件/リクエスト）
+
+        取得できなかったツイートは結果に含まれない。
+
+        Returns:
+            {tweet_id: {"likes": int, "retweets": int, "replies": int, ...}}
+        """
         bearer = os.getenv("TWITTER_BEARER_TOKEN", "")
         if not bearer:
             print("  ⚠️ get_tweet_metrics: TWITTER_BEARER_TOKEN 未設定")
             return {}
 
         headers = {"Authorization": f"Bearer {bearer}"}
-        params = {"tweet.fields": "public_metrics,created_at"}
-        try:
-            resp = requests.get(
-                f"{self.BASE_URL}/tweets/{tweet_id}",
-                headers=headers, params=params, timeout=30,
-            )
-            if resp.status_code != 200:
-                print(f"  ⚠️ get_tweet_metrics: {resp.status_code}")
-                return {}
+        now = time.time()
+        results: dict[str, dict] = {}
+        ids = []
+        for tid in map(str, tweet_ids):
+            cached = self._metrics_cache.get(tid)
+            if cached and cached[0] > now:
+                results[tid] = cached[1]
+            else:
+                ids.append(tid)
 
-            data = resp.json().get("data", {})
-            metrics = data.get("public_metrics", {})
-            return {
-                "likes": metrics.get("like_count", 0),
-                "retweets": metrics.get("retweet_count", 0),
-                "replies": metrics.get("reply_count", 0),
-                "impressions": metrics.get("impression_count", 0),
-                "quotes": metrics.get("quote_count", 0),
-                "bookmarks": metrics.get("bookmark_count", 0),
-                "created_at": data.get("created_at", ""),
+        for start in range(0, len(ids), self.METRICS_BATCH_SIZE):
+            chunk = ids[start:start + self.METRICS_BATCH_SIZE]
+            params = {
+                "ids": ",".join(chunk),
+                "tweet.fields": "public_metrics,created_at",
             }
-        except Exception as e:
-            print(f"  ⚠️ get_tweet_metrics: {e}")
-            return {}
+            try:
+                self._pacer.wait("tweets")
+                resp = requests.get(
+                    f"{self.BASE_URL}/tweets",
+                    headers=headers, params=params, timeout=30,
+                )
+                self._pacer.update("tweets", resp)
+                if resp.status_code != 200:
+                    print(f"  ⚠️ get_tweet_metrics: {resp.status_code}")
+                    continue
+
+                for data in resp.json().get("data", []):
+                    metrics = data.get("public_metrics", {})
+                    tid = str(data.get("id", ""))
+                    results[tid] = {
+                        "likes": metrics.get("like_count", 0),
+                        "retweets": metrics.get("retweet_count", 0),
+                        "replies": metrics.get("reply_count", 0),
+                        "impressions": metrics.get("impression_count", 0),
+                        "quotes": metrics.get("quote_count", 0),
+                        "bookmarks": metrics.get("bookmark_count", 0),
+                        "created_at": data.get("created_at", ""),
+                    }
+                    ttl = self._metrics_ttl(results[tid]["created_at"], now)
+                    self._metrics_cache[tid] = (now + ttl, results[tid])
+            except Exception as e:
+                print(f"  ⚠️ get_tweet_metrics: {e}")
+
+        return results
+
+    def _metrics_ttl(self, created_at: str, now: float) -> float:
+        """投稿からの経過時間に応じたキャッシュ期間（秒）"""
+        try:
+            created = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+        except (AttributeError, ValueError):
+            return self.METRICS_TTL_FRESH
+        if created.tzinfo is None:
+            created = created.replace(tzinfo=timezone.utc)
+        if now - created.timestamp() >= 24 * 60 * 60:
+            return self.METRICS_TTL_SETTLED
+        return self.METRICS_TTL_FRESH
@@ -0,0 +1,101 @@
+"""
+X Auto Post System — gspread 用リトライ付きHTTPクライアント
+
+Sheets/Drive API の 429（レート制限）と 5xx を指数バックオフで再試行する。
+サーバーが Retry-After を返した場合はその秒数を優先する（retry_with_backoff 側で処理）。
+さらに読み取り/書き込みそれぞれのトークンバケットで送信ペースを抑え、
+そもそも分間クォータ（読み取り300 / 書き込み60）を超えないようにする。
+1回の呼び出しがリトライを使い切るほど障害が続いた場合はサーキットブレーカーを開き、
+以降の呼び出しはクールダウンが明けるまで待機せずに失敗させる。
+
+gspread.authorize(credentials, http_client=BackoffHTTPClient) で使用。
+"""
+import threading
+import time
+from http import HTTPStatus
+
+from gspread.exceptions import APIError
+from gspread.http_client import HTTPClient
+
+from src.utils import CircuitBreaker, retry_with_backoff
+
+RETRY_STATUS = {
+    HTTPStatus.TOO_MANY_REQUESTS,
+    HTTPStatus.INTERNAL_SERVER_ERROR,
+    HTTPStatus.BAD_GATEWAY,
+    HTTPStatus.SERVICE_UNAVAILABLE,
+    HTTPStatus.GATEWAY_TIMEOUT,
+}
+MAX_RETRIES = 5
+BASE_DELAY = 2.0
+
+# Sheets API の分間クォータ（容量, 毎秒補充数）
+READ_QUOTA = (300, 5.0)
+WRITE_QUOTA = (60, 1.0)
+
+
+def _is_retryable(error: Exception) -> bool:
+    """リトライ対象のAPIエラーか"""
+    return isinstance(error, APIError) and error.code in RETRY_STATUS
+
+
+class TokenBucket:
+    """単純なトークンバケット（スレッドセーフ）"""
+
+    def __init__(self, capacity: int, refill_per_sec: float):
+        self.capacity = capacity
+        self.refill_per_sec = refill_per_sec
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int = 1):
+        """トークンを取得（不足していれば補充まで待機）"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._updated) * self.refill_per_sec,
+                )
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                delay = (tokens - self._tokens) / self.refill_per_sec
+            time.sleep(delay)
+
+
+# クォータはプロジェクト単位なのでプロセス内で共有
+_read_bucket = TokenBucket(*READ_QUOTA)
+_write_bucket = TokenBucket(*WRITE_QUOTA)
+
+# Sheets API 全体で共有するサーキットブレーカー
+# 1回の呼び出しの全試行（MAX_RETRIES + 1回）が失敗したら開く
+# window は試行間の待機（最大 RETRY_CAP=60秒）より長くとる
+_breaker = CircuitBreaker(threshold=MAX_RETRIES + 1, window=120.0, cooldown=60.0)
+
+
+def _bucket_for(method: str) -> TokenBucket:
+    """HTTPメソッドから読み取り/書き込みバケットを選択（GET=読み取り）"""
+    return _read_bucket if method.upper() == "GET" else _write_bucket
+
+
+class BackoffHTTPClient(HTTPClient):
+    """429/5xx を Retry-After 優先の指数バックオフで再試行する HTTPClient"""
+
+    def request(self, method: str, *args, **kwargs):
+        bucket = _bucket_for(method)
+
+        def _send():
+            bucket.acquire()
+            return super(BackoffHTTPClient, self).request(method, *args, **kwargs)
+
+        return retry_with_backoff(
+            _send,
+            max_retries=MAX_RETRIES,
+            base_delay=BASE_DELAY,
+            label="Sheets API ",
+            retry_if=_is_retryable,
+            breaker=_breaker,
+        )
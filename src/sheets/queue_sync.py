@@ -7,16 +7,69 @@ GitHub Actions から呼ばれ、以下の同期を行う:
   sync_dashboard():  キュー統計 -> スプシ「ダッシュボード」シート
   sync_preferences(): スプシ「選定プリファレンス」シート -> config/selection_preferences.json
 """
+import hashlib
 import json
+from collections import Counter
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
 from src.collect.queue_manager import QueueManager
-from src.sheets.sheets_client import SheetsClient
+from src.sheets.sheets_client import SheetsClient, _fmt_jst
 from src.config import PROJECT_ROOT
+from src.utils import atomic_json_save, json_dumps, json_loads
 
 JST = ZoneInfo("Asia/Tokyo")
+_now_jst = partial(datetime.now, JST)
+
+
+def _parse_csv(val: str) -> list[str]:
+    """CSV文字列をリストに変換（空白トリム）"""
+    return [v.strip() for v in val.split(",") if v.strip()] if val else []
+
+
+def _parse_settings(raw: dict) -> dict:
+    """設定シートの生の値（文字列）を型変換"""
+    settings = {}
+    for key in ("min_likes", "max_tweets", "max_age_hours",
+                 "daily_post_limit", "auto_post_min_score"):
+        if key in raw:
+            try:
+                settings[key] = int(raw[key])
+            except (ValueError, TypeError):
+                pass
+
+    for key in ("auto_approve",):
+        if key in raw:
+            settings[key] = raw[key].lower() in ("true", "1", "yes")
+
+    for key in ("mode",):
+        if key in raw:
+            settings[key] = raw[key]
+
+    return settings
+
+
+def _dashboard_hash(dashboard: dict) -> str:
+    """ダッシュボード統計のハッシュ（前回書き込み分との比較用）"""
+    return hashlib.sha1(json_dumps(dashboard)).hexdigest()
+
+
+# Sheetsのキー -> ローカルJSONの (セクション, フィールド, 変換関数)
+# 変換関数が None なら文字列のまま保存する
+_PREFERENCE_MAPPINGS = (
+    ("weekly_focus", "weekly_focus", "directive", None),
+    ("focus_keywords", "weekly_focus", "focus_keywords", _parse_csv),
+    ("focus_accounts", "weekly_focus", "focus_accounts", _parse_csv),
+    ("preferred_topics", "topic_preferences", "preferred", _parse_csv),
+    ("avoid_topics", "topic_preferences", "avoid", _parse_csv),
+    ("boosted_accounts", "account_overrides", "boosted", _parse_csv),
+    ("blocked_accounts", "account_overrides", "blocked", _parse_csv),
+    ("min_likes_override", "threshold_overrides", "min_likes", int),
+    ("max_age_hours_override", "threshold_overrides", "max_age_hours", int),
+    ("max_tweets_override", "threshold_overrides", "max_tweets", int),
+)
 
 
 class QueueSync:
@@ -29,43 +82,85 @@ class QueueSync:
     ):
         self.sheets = sheets
         self.queue = queue or QueueManager()
+        # (設定シートの生の値, 型変換済み設定)
+        self._settings_cache: tuple[tuple, dict] | None = None
 
-    def sync_to_sheet(self) -> dict:
+    def sync_to_sheet(self, force: bool = False) -> dict:
         """
         queue JSON -> スプシ「キュー管理」シートに同期
 
         pendingファイルの全アイテムをスプシに書き出す。
+        前回の書き出し以降、キューの内容もシートのリビジョンも
+        変わっていなければ書き出しを省略する（synced=0）。
+
+        Args:
+            force: Trueなら変更の有無にかかわらず書き出す
 
         Returns:
             {"synced": int, "statuses": {"pending": int, "approved": int, ...}}
         """
-        all_items = self.queue.get_all_pending()
-
-        statuses = {}
-        for item in all_items:
-            s = item.get("status", "unknown")
-            statuses[s] = statuses.get(s, 0) + 1
+        all_items, statuses, queue_state, needs_write = self._queue_snapshot(force)
+        if not needs_write:
+            return {"synced": 0, "statuses": statuses}
 
         self.sheets.write_queue_items(all_items)
+        self.sheets.save_sync_state(**queue_state, written_revision=self._get_revision())
 
         return {
             "synced": len(all_items),
             "statuses": statuses,
         }
 
-    def sync_from_sheet(self) -> dict:
+    def _queue_snapshot(self, force: bool = False) -> tuple[list[dict], dict, dict, bool]:
+        """
+        書き出し対象のキューと、書き出しが必要かどうかを判定
+
+        キューの保存ファイルが前回の書き出し時から変わっておらず、シートのリビジョンも
+        同じなら、キューを読み込んでハッシュを取ることなく「書き出し不要」と判定する。
+
+        Returns:
+            (全アイテム, ステータス別件数, 書き出し後に保存する同期状態, 書き出しが必要か)
+            書き出し不要と判定した場合、全アイテムは読み込まない（空リスト）
+        """
+        queue_token = self.queue.change_token()
+        state = {} if force else self.sheets.load_sync_state()
+        revision = None
+
+        def _sheet_unchanged() -> bool:
+            nonlocal revision
+            if revision is None:
+                revision = self._get_revision()
+            return bool(revision) and revision == state.get("written_revision")
+
+        if state.get("queue_token") == queue_token and _sheet_unchanged():
+            return [], self.queue.status_counts(), {}, False
+
+        all_items = self.queue.get_all_pending()
+        statuses = dict(Counter(item.get("status", "unknown") for item in all_items))
+        queue_hash = hashlib.sha1(json_dumps(all_items)).hexdigest()
+        queue_state = {"queue_hash": queue_hash, "queue_token": queue_token}
+
+        if state.get("queue_hash") == queue_hash and _sheet_unchanged():
+            # 内容は同じ（ファイルだけ書き直された）→ トークンを更新して次回はハッシュも省略
+            self.sheets.save_sync_state(queue_token=queue_token)
+            return all_items, statuses, queue_state, False
+
+        return all_items, statuses, queue_state, True
+
+    def sync_from_sheet(self, force: bool = False) -> dict:
         """
         スプシ「キュー管理」シート -> queue JSON に承認/拒否を反映
 
         pending→approved / pending→skipped の変更のみ許可。
+        キューが空、または前回読み取ったときからスプシのリビジョンが変わっていなければ
+        シートを読まずに終了する（自身の書き込み後のリビジョンでは読み飛ばさない）。
+
+        Args:
+            force: Trueならリビジョン比較を行わず必ずシートを読む
 
         Returns:
             {"approved": int, "skipped": int, "unchanged": int, "errors": [str]}
         """
-        decisions = self.sheets.read_queue_decisions()
-        current_items = self.queue.get_all_pending()
-        current_map = {item["tweet_id"]: item for item in current_items}
-
         result = {
             "approved": 0,
             "skipped": 0,
@@ -73,38 +168,73 @@ class QueueSync:
             "errors": [],
         }
 
-        for decision in decisions:
-            tweet_id = decision["tweet_id"]
-            new_status = decision["status"]
+        current_items = self.queue.get_all_pending()
+        if not current_items:
+            return result
+
+        revision = "" if force else self._get_revision()
+        if revision and revision == self.sheets.load_sync_state().get("queue_revision"):
+            return result
+
+        decisions = self.sheets.read_queue_decisions()
+        decision_map = {d["tweet_id"]: d for d in decisions}
+        current_map = {item["tweet_id"]: item for item in current_items}
 
-            if tweet_id not in current_map:
+        # 件数の少ない側を走査し、もう一方は辞書引きで突き合わせる
+        if len(decision_map) <= len(current_map):
+            pairs = ((d, current_map.get(tid)) for tid, d in decision_map.items())
+        else:
+            pairs = ((decision_map.get(tid), item) for tid, item in current_map.items())
+
+        to_approve: list[str] = []
+        to_skip: list[tuple[str, str]] = []
+
+        for decision, current in pairs:
+            if decision is None or current is None:
                 continue
 
-            current_status = current_map[tweet_id]["status"]
+            tweet_id = decision["tweet_id"]
+            new_status = decision["status"]
+            current_status = current["status"]
 
             if current_status == new_status:
                 result["unchanged"] += 1
-                continue
-
             # pending -> approved
-            if current_status == "pending" and new_status == "approved":
-                if self.queue.approve(tweet_id):
-                    result["approved"] += 1
-                else:
-                    result["errors"].append(f"承認失敗: {tweet_id}")
-
+            elif current_status == "pending" and new_status == "approved":
+                to_approve.append(tweet_id)
             # * -> skipped（理由付き）
             elif new_status == "skipped":
-                skip_reason = decision.get("skip_reason", "")
-                if self.queue.skip_with_reason(tweet_id, reason=skip_reason):
-                    result["skipped"] += 1
-                else:
-                    result["errors"].append(f"スキップ失敗: {tweet_id}")
+                to_skip.append((tweet_id, decision.get("skip_reason", "")))
             else:
                 result["unchanged"] += 1
 
+        # キューへの反映は1回の読み書きでまとめて行う
+        if to_approve or to_skip:
+            applied = self.queue.apply_decisions(to_approve, to_skip)
+            result["approved"] = len(applied["approved"])
+            result["skipped"] = len(applied["skipped"])
+            approved_ids = set(applied["approved"])
+            skipped_ids = set(applied["skipped"])
+            result["errors"].extend(
+                f"承認失敗: {tid}" for tid in to_approve if tid not in approved_ids
+            )
+            result["errors"].extend(
+                f"スキップ失敗: {tid}" for tid, _ in to_skip if tid not in skipped_ids
+            )
+
+        if revision:
+            self.sheets.save_sync_state(queue_revision=revision)
+
         return result
 
+    def _get_revision(self) -> str:
+        """スプシのリビジョンを取得（取得失敗時は空文字 = 常に読み取り）"""
+        try:
+            return self.sheets.get_revision()
+        except Exception as e:
+            print(f"  ⚠️ リビジョン取得スキップ: {e}")
+            return ""
+
     def sync_dashboard(self, collection_result: dict | None = None) -> dict:
         """
         ダッシュボードシートを更新
@@ -112,10 +242,22 @@ class QueueSync:
         Args:
             collection_result: 直近のcollect結果 (optional)
         """
+        dashboard = self._dashboard_stats(collection_result)
+        dashboard_hash = _dashboard_hash(dashboard)
+        # 前回書き込んだ統計と同じなら書き込みを省略
+        if self.sheets.load_sync_state().get("dashboard_hash") == dashboard_hash:
+            return dashboard
+
+        self.sheets.update_dashboard(dashboard)
+        self.sheets.save_sync_state(dashboard_hash=dashboard_hash)
+        return dashboard
+
+    def _dashboard_stats(self, collection_result: dict | None = None) -> dict:
+        """ダッシュボードに書き込む統計を集計"""
         stats = self.queue.stats()
-        now = datetime.now(JST).strftime("%Y/%m/%d %H:%M")
+        now = _fmt_jst()
 
-        dashboard = {
+        return {
             "last_collection": now if collection_result else "—",
             "collected_today": (
                 collection_result.get("added", 0) if collection_result else 0
@@ -126,9 +268,6 @@ class QueueSync:
             "api_status": "OK",
         }
 
-        self.sheets.update_dashboard(dashboard)
-        return dashboard
-
     def sync_collection_log(self, result: dict):
         """収集ログシートに結果を追記"""
         self.sheets.append_collection_log({
@@ -141,14 +280,40 @@ class QueueSync:
 
     def full_sync(self) -> dict:
         """
-        完全同期: from_sheet -> to_sheet -> dashboard
+        完全同期: from_sheet -> (to_sheet + dashboard)
+
+        承認/拒否の反映を先に行い、その後のキュー書き出しと
+        ダッシュボード更新は1回の batchUpdate にまとめて送る。
+        前回の書き出しから変わっていないもの（キュー / ダッシュボード）は送らず、
+        どちらも変わっていなければ書き込み自体を省略する。
 
         Returns:
             {"from_sheet": {...}, "to_sheet": {...}, "dashboard": {...}}
         """
         from_result = self.sync_from_sheet()
-        to_result = self.sync_to_sheet()
-        dashboard = self.sync_dashboard()
+
+        all_items, statuses, queue_state, needs_write = self._queue_snapshot()
+        dashboard = self._dashboard_stats()
+        dashboard_hash = _dashboard_hash(dashboard)
+        dashboard_changed = self.sheets.load_sync_state().get("dashboard_hash") != dashboard_hash
+        to_result = {"synced": len(all_items) if needs_write else 0, "statuses": statuses}
+        if not needs_write and not dashboard_changed:
+            return {"from_sheet": from_result, "to_sheet": to_result, "dashboard": dashboard}
+
+        self.sheets.write_queue_and_dashboard(
+            all_items if needs_write else None,
+            dashboard if dashboard_changed else None,
+        )
+
+        # 自身の書き込みで上がったリビジョンを記録（次回キューを書き直すかの判定用）
+        # queue_revision（承認/拒否を読み取り済みのリビジョン）は更新しない。
+        # 書き込みからリビジョン取得までの間のシート編集も、次回の sync_from_sheet で読み取る
+        revision = self._get_revision()
+        state = {**queue_state, "written_revision": revision} if needs_write else {}
+        if dashboard_changed:
+            state["dashboard_hash"] = dashboard_hash
+        if state:
+            self.sheets.save_sync_state(**state)
 
         return {
             "from_sheet": from_result,
@@ -156,45 +321,56 @@ class QueueSync:
             "dashboard": dashboard,
         }
 
-    def read_settings(self) -> dict:
+    def read_settings_and_preferences(self) -> tuple[dict, dict]:
         """
-        設定シートから設定を読み取り、型変換して返す
+        設定シートとプリファレンスシートを1回のAPI呼び出しで読み取り
 
         Returns:
-            {"min_likes": int, "auto_approve": bool, ...}
+            (read_settings() の結果, sync_preferences() に渡す生の値)
         """
-        raw = self.sheets.get_settings()
+        from src.sheets.sheets_client import SHEET_PREFERENCES, SHEET_SETTINGS
 
-        settings = {}
-        for key in ("min_likes", "max_tweets", "max_age_hours",
-                     "daily_post_limit", "auto_post_min_score"):
-            if key in raw:
-                try:
-                    settings[key] = int(raw[key])
-                except (ValueError, TypeError):
-                    pass
+        raw = self.sheets.get_key_value_sheets([SHEET_SETTINGS, SHEET_PREFERENCES])
+        return self.read_settings(raw[SHEET_SETTINGS]), raw[SHEET_PREFERENCES]
 
-        for key in ("auto_approve",):
-            if key in raw:
-                settings[key] = raw[key].lower() in ("true", "1", "yes")
+    def read_settings(self, raw: dict | None = None) -> dict:
+        """
+        設定シートから設定を読み取り、型変換して返す
 
-        for key in ("mode",):
-            if key in raw:
-                settings[key] = raw[key]
+        Args:
+            raw: 読み取り済みの設定シートの値（Noneならシートから取得）
 
-        return settings
+        Returns:
+            {"min_likes": int, "auto_approve": bool, ...}
+        """
+        if raw is None:
+            raw = self.sheets.get_settings()
+
+        # 生の値が前回と同じなら型変換を省略（値は文字列なのでそのままキーにできる）
+        key = tuple(sorted(raw.items()))
+        if self._settings_cache is None or self._settings_cache[0] != key:
+            self._settings_cache = (key, _parse_settings(raw))
+        return dict(self._settings_cache[1])
 
-    def sync_preferences(self) -> dict:
+    def invalidate_settings_cache(self):
+        """read_settings の変換結果キャッシュを破棄"""
+        self._settings_cache = None
+
+    def sync_preferences(self, sheet_prefs: dict | None = None) -> dict:
         """
         スプシ「選定プリファレンス」シート -> config/selection_preferences.json に同期
 
         Sheetsの設定をローカルJSONに反映する。
         JSONファイルの既存設定をベースに、Sheetsで指定された値で上書き。
 
+        Args:
+            sheet_prefs: 読み取り済みのプリファレンスシートの値（Noneならシートから取得）
+
         Returns:
             {"updated_keys": list[str], "unchanged": int}
         """
-        sheet_prefs = self.sheets.get_preferences()
+        if sheet_prefs is None:
+            sheet_prefs = self.sheets.get_preferences()
         if not sheet_prefs:
             return {"updated_keys": [], "unchanged": 0}
 
@@ -202,88 +378,43 @@ class QueueSync:
 
         # 既存プリファレンス読み込み
         try:
-            with open(prefs_path, "r", encoding="utf-8") as f:
-                local_prefs = json.load(f)
+            local_prefs = json_loads(prefs_path.read_bytes())
         except (FileNotFoundError, json.JSONDecodeError):
             local_prefs = {}
 
+        original = json_dumps(local_prefs)
         updated_keys = []
+        local_prefs.setdefault("threshold_overrides", {})
 
         # Sheets の値をローカルJSONにマッピング
-        def _parse_csv(val: str) -> list[str]:
-            return [v.strip() for v in val.split(",") if v.strip()] if val else []
-
-        # weekly_focus
-        if sheet_prefs.get("weekly_focus"):
-            wf = local_prefs.setdefault("weekly_focus", {})
-            wf["directive"] = sheet_prefs["weekly_focus"]
-            updated_keys.append("weekly_focus")
-        if sheet_prefs.get("focus_keywords"):
-            wf = local_prefs.setdefault("weekly_focus", {})
-            wf["focus_keywords"] = _parse_csv(sheet_prefs["focus_keywords"])
-            updated_keys.append("focus_keywords")
-        if sheet_prefs.get("focus_accounts"):
-            wf = local_prefs.setdefault("weekly_focus", {})
-            wf["focus_accounts"] = _parse_csv(sheet_prefs["focus_accounts"])
-            updated_keys.append("focus_accounts")
-
-        # topic_preferences
-        if sheet_prefs.get("preferred_topics"):
-            tp = local_prefs.setdefault("topic_preferences", {})
-            tp["preferred"] = _parse_csv(sheet_prefs["preferred_topics"])
-            updated_keys.append("preferred_topics")
-        if sheet_prefs.get("avoid_topics"):
-            tp = local_prefs.setdefault("topic_preferences", {})
-            tp["avoid"] = _parse_csv(sheet_prefs["avoid_topics"])
-            updated_keys.append("avoid_topics")
-
-        # account_overrides
-        if sheet_prefs.get("boosted_accounts"):
-            ao = local_prefs.setdefault("account_overrides", {})
-            ao["boosted"] = _parse_csv(sheet_prefs["boosted_accounts"])
-            updated_keys.append("boosted_accounts")
-        if sheet_prefs.get("blocked_accounts"):
-            ao = local_prefs.setdefault("account_overrides", {})
-            ao["blocked"] = _parse_csv(sheet_prefs["blocked_accounts"])
-            updated_keys.append("blocked_accounts")
-
-        # threshold_overrides
-        to = local_prefs.setdefault("threshold_overrides", {})
-        if sheet_prefs.get("min_likes_override"):
-            try:
-                to["min_likes"] = int(sheet_prefs["min_likes_override"])
-                updated_keys.append("min_likes_override")
-            except ValueError:
-                pass
-        if sheet_prefs.get("max_age_hours_override"):
-            try:
-                to["max_age_hours"] = int(sheet_prefs["max_age_hours_override"])
-                updated_keys.append("max_age_hours_override")
-            except ValueError:
-                pass
-        if sheet_prefs.get("max_tweets_override"):
-            try:
-                to["max_tweets"] = int(sheet_prefs["max_tweets_override"])
-                updated_keys.append("max_tweets_override")
-            except ValueError:
-                pass
+        for sheet_key, section, field, convert in _PREFERENCE_MAPPINGS:
+            value = sheet_prefs.get(sheet_key)
+            if not value:
+                continue
+            if convert is not None:
+                try:
+                    value = convert(value)
+                except ValueError:
+                    continue
+            local_prefs.setdefault(section, {})[field] = value
+            updated_keys.append(sheet_key)
 
-        # extra_keywords → keyword_weights に追加
+        # extra_keywords → keyword_weights に追加（新規キーワードはweight 2.0）
         if sheet_prefs.get("extra_keywords"):
             kw = local_prefs.setdefault("keyword_weights", {})
-            for keyword in _parse_csv(sheet_prefs["extra_keywords"]):
-                if keyword not in kw:
-                    kw[keyword] = 2.0  # 新規キーワードはweight 2.0
-                    updated_keys.append(f"keyword:{keyword}")
-
-        # 更新日時
-        if updated_keys:
-            local_prefs["updated_at"] = datetime.now(JST).isoformat()[:10]
+            new_keywords = [
+                k for k in dict.fromkeys(_parse_csv(sheet_prefs["extra_keywords"]))
+                if k not in kw
+            ]
+            kw.update(dict.fromkeys(new_keywords, 2.0))
+            updated_keys.extend(f"keyword:{k}" for k in new_keywords)
+
+        # 内容が変わった場合のみ更新日時を付けてアトミックに保存
+        # config/ はワークフローがディレクトリごとコミットするため .bak は作らない
+        if json_dumps(local_prefs) != original:
+            local_prefs["updated_at"] = _now_jst().isoformat()[:10]
             local_prefs["updated_by"] = "sheets_sync"
-
-        # 保存
-        with open(prefs_path, "w", encoding="utf-8") as f:
-            json.dump(local_prefs, f, ensure_ascii=False, indent=2)
+            atomic_json_save(prefs_path, local_prefs, durable=True, backup=False)
 
         return {
             "updated_keys": updated_keys,
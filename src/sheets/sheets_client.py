@@ -3,23 +3,55 @@ X Auto Post System — Google Sheets クライアント
 
 スプレッドシートからURL収集シートの読み書きを行う。
 パターンA（手動収集）とパターンB（自動収集キュー管理）の両方で使用。
+gspread / google-auth は起動時間短縮のため使用時に読み込む。
 """
+from __future__ import annotations
+
 import base64
+import hashlib
 import json
 import os
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
+from typing import TYPE_CHECKING
 from zoneinfo import ZoneInfo
 
-import gspread
-from google.oauth2.service_account import Credentials
+from src.config import Config, PROJECT_ROOT
+from src.utils import atomic_json_save, safe_json_load
 
-from src.config import Config
+if TYPE_CHECKING:
+    import gspread
 
 JST = ZoneInfo("Asia/Tokyo")
+_now_jst = partial(datetime.now, JST)
+
+
+def _fmt_jst(dt: datetime | None = None) -> str:
+    """シート表示用の日時文字列（YYYY/MM/DD HH:MM）。省略時は現在時刻"""
+    dt = dt or _now_jst()
+    return f"{dt.year}/{dt.month:02d}/{dt.day:02d} {dt.hour:02d}:{dt.minute:02d}"
+
+
+def _cell_data(value) -> dict:
+    """Python値を updateCells 用の CellData に変換（空値は空セル、dict はそのまま）"""
+    if isinstance(value, dict):
+        return value
+    if value is None or value == "":
+        return {}
+    if isinstance(value, bool):
+        return {"userEnteredValue": {"boolValue": value}}
+    if isinstance(value, (int, float)):
+        return {"userEnteredValue": {"numberValue": value}}
+    return {"userEnteredValue": {"stringValue": str(value)}}
 
 # スコープ
 SCOPES = [
     "https://www.googleapis.com/auth/spreadsheets",
+    # リビジョン確認（Drive API files.get）用
+    "https://www.googleapis.com/auth/drive.metadata.readonly",
 ]
 
 # シート名（パターンA）
@@ -34,6 +66,108 @@ SHEET_DASHBOARD = "ダッシュボード"
 SHEET_SETTINGS = "設定"
 SHEET_PREFERENCES = "選定プリファレンス"
 
+# キュー管理シートの列数（A〜L）
+QUEUE_COLUMNS = 12
+
+# キュー管理シートの変更マーカー（=NOW() を置くセル。データ列の右隣）
+QUEUE_MARKER_CELL = "M1"
+
+# setup_sheets でのシート並列作成数
+SETUP_WORKERS = 4
+
+# 追記バッファがこの行数に達したら即時書き出す
+APPEND_FLUSH_SIZE = 50
+
+# 同期状態（増分読み取りカーソル等）の保存先
+SYNC_STATE_FILE = PROJECT_ROOT / "data" / "queue" / "sheets_sync_state.json"
+
+# 読み取りキャッシュの保存先と、リビジョンが取れない場合の有効期限（秒）
+# シート内容の写しなので、ワークフローがコミットする data/queue/ ではなく git 管理外の .cache/ に置く
+READ_CACHE_FILE = PROJECT_ROOT / ".cache" / "sheets_read_cache.json"
+READ_CACHE_TTL = 60
+
+
+# 認証済みクライアント（認証情報の SHA-256 指紋 -> gspread.Client）
+# 鍵そのものはキーに残さない
+_clients: dict[str, gspread.Client] = {}
+
+
+def _authorize(creds_b64: str) -> gspread.Client:
+    """
+    サービスアカウント認証済みの gspread クライアントを取得（認証情報ごとにキャッシュ）
+
+    鍵のパースと HTTPS 接続の確立を SheetsClient 生成のたびに繰り返さない。
+    デコードした鍵JSONは Credentials 生成後すぐに破棄する。
+    """
+    fingerprint = hashlib.sha256(creds_b64.encode()).hexdigest()
+    gc = _clients.get(fingerprint)
+    if gc is not None:
+        return gc
+
+    import gspread
+    from google.oauth2.service_account import Credentials
+    from requests.adapters import HTTPAdapter
+
+    from src.sheets.http_client import BackoffHTTPClient
+
+    creds_json = json.loads(base64.b64decode(creds_b64))
+    del creds_b64
+    credentials = Credentials.from_service_account_info(creds_json, scopes=SCOPES)
+    creds_json.clear()
+    del creds_json
+    # 429/5xx は HTTP 層でまとめて再試行（全 gspread 呼び出しに適用）
+    gc = gspread.authorize(credentials, http_client=BackoffHTTPClient)
+    # 並列呼び出し（setup_sheets）でも接続を使い回せるようプールを拡張
+    gc.http_client.session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+    _clients[fingerprint] = gc
+    return gc
+
+
+def _status_row_groups(updates: list[dict], now: str) -> list[tuple[int, int, list[list]]]:
+    """
+    URL収集シートのステータス更新を連続行ごとにまとめる
+
+    同じ行の重複は後勝ち。
+
+    Returns:
+        [(先頭行, 末尾行, [[ステータス, 処理日時, ツイートID], ...])]
+    """
+    by_row = {u["row"]: [u["status"], now, u.get("tweet_id", "")] for u in updates}
+    groups = []
+    for row in sorted(by_row):
+        if groups and row == groups[-1][1] + 1:
+            first, _, values = groups[-1]
+            groups[-1] = (first, row, values)
+        else:
+            groups.append((row, row, []))
+        groups[-1][2].append(by_row[row])
+    return groups
+
+
+def _dashboard_values(stats: dict) -> list[list]:
+    """ダッシュボード B2:B8 の値（最終行は更新日時）"""
+    return [
+        [stats.get("last_collection", "—")],
+        [stats.get("collected_today", 0)],
+        [stats.get("pending", 0)],
+        [stats.get("approved", 0)],
+        [stats.get("posted_today", 0)],
+        [stats.get("api_status", "OK")],
+        [_fmt_jst()],
+    ]
+
+
+def _collection_log_row(log: dict) -> list:
+    """収集ログシートの1行"""
+    return [
+        _fmt_jst(),
+        log.get("fetched", 0),
+        log.get("filtered", 0),
+        log.get("added", 0),
+        log.get("skipped_dup", 0),
+        log.get("error", ""),
+    ]
+
 
 class SheetsClient:
     """Google Sheets 読み書きクライアント"""
@@ -55,15 +189,139 @@ class SheetsClient:
         if not creds_b64:
             raise ValueError("GOOGLE_CREDENTIALS_BASE64 が未設定です")
 
-        # サービスアカウント認証
-        creds_json = json.loads(base64.b64decode(creds_b64))
-        credentials = Credentials.from_service_account_info(creds_json, scopes=SCOPES)
-        self._gc = gspread.authorize(credentials)
+        # サービスアカウント認証（同一プロセス内では認証済みクライアントを再利用）
+        self._gc = _authorize(creds_b64)
+        del creds_b64
         self._spreadsheet = self._gc.open_by_key(self._spreadsheet_id)
+        self._state_file = SYNC_STATE_FILE
+        self._read_cache_file = READ_CACHE_FILE
+        self._ws_cache: dict[str, gspread.Worksheet] = {}
+        self._ws_primed = False
+        # 自分の batchUpdate で拡張したシートの行数（シート名 -> 行数）
+        # キャッシュした Worksheet の row_count は取得時点の値のまま更新されないため
+        self._grid_rows: dict[str, int] = {}
+        # 追記系シートの書き出し待ち行（シート名 -> 行リスト）
+        self._append_buffers: dict[str, list[list]] = defaultdict(list)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """バッファ済みの追記を書き出す"""
+        self.flush_appends()
+
+    # === ワークシート取得 ===
+
+    def _ws(self, name: str) -> gspread.Worksheet:
+        """
+        ワークシートを取得
+
+        初回のキャッシュミス時に worksheets() 1回で全シートのハンドルを取得する。
+        """
+        ws = self._ws_cache.get(name)
+        if ws is None:
+            if not self._ws_primed:
+                self._ws_primed = True
+                self._ws_cache.update({w.title: w for w in self._spreadsheet.worksheets()})
+                ws = self._ws_cache.get(name)
+            if ws is None:
+                ws = self._spreadsheet.worksheet(name)
+                self._ws_cache[name] = ws
+        return ws
+
+    def _add_worksheet(self, title: str, rows: int, cols: int) -> gspread.Worksheet:
+        """ワークシートを追加してキャッシュに登録"""
+        ws = self._spreadsheet.add_worksheet(title=title, rows=rows, cols=cols)
+        self._ws_cache[title] = ws
+        return ws
+
+    # === 同期状態 ===
+
+    def load_sync_state(self) -> dict:
+        """スプレッドシート単位の同期状態を読み込み"""
+        state = safe_json_load(self._state_file)
+        if not isinstance(state, dict):
+            return {}
+        return state.get(self._spreadsheet_id, {})
+
+    def save_sync_state(self, **values):
+        """同期状態を更新して保存"""
+        state = safe_json_load(self._state_file)
+        if not isinstance(state, dict):
+            state = {}
+        state.setdefault(self._spreadsheet_id, {}).update(values)
+        atomic_json_save(self._state_file, state)
+
+    def get_revision(self) -> str:
+        """
+        スプレッドシートのリビジョンを取得（Drive API のメタデータのみ）
+
+        値の読み取りより軽量なため、変更有無の判定に使う。
+
+        Returns:
+            Drive の version（取得できなければ modifiedTime）
+        """
+        from gspread.urls import DRIVE_FILES_API_V3_URL
+
+        resp = self._gc.http_client.request(
+            "get",
+            f"{DRIVE_FILES_API_V3_URL}/{self._spreadsheet_id}",
+            params={"fields": "version,modifiedTime", "supportsAllDrives": True},
+        )
+        meta = resp.json()
+        return str(meta.get("version") or meta.get("modifiedTime") or "")
+
+    # === 読み取りキャッシュ ===
+
+    def _cached_read(self, key: str, fetch, revision: str | None = None):
+        """
+        リビジョンをキーにした読み取りキャッシュ
+
+        スプレッドシートのリビジョンが前回取得時と同じなら保存済みの値を返す。
+        リビジョンが取得できない場合は READ_CACHE_TTL 秒以内の値のみ再利用する。
+
+        Args:
+            key: キャッシュキー
+            fetch: キャッシュミス時に呼ぶ関数（JSON化可能な値を返す）
+            revision: 呼び出し側で取得済みのリビジョン（省略時は Drive から取得）
+        """
+        if revision is None:
+            try:
+                revision = self.get_revision()
+            except Exception:
+                revision = ""
+
+        cache = safe_json_load(self._read_cache_file)
+        if not isinstance(cache, dict):
+            cache = {}
+        entries = cache.setdefault(self._spreadsheet_id, {})
+        entry = entries.get(key)
+        now = time.time()
+        if entry:
+            if revision:
+                fresh = entry.get("revision") == revision
+            else:
+                fresh = now - entry.get("fetched_at", 0) < READ_CACHE_TTL
+            if fresh:
+                return entry["value"]
+
+        value = fetch()
+        entries[key] = {"revision": revision, "fetched_at": now, "value": value}
+        atomic_json_save(self._read_cache_file, cache)
+        return value
+
+    def _invalidate_reads(self):
+        """自分の書き込み後に読み取りキャッシュを破棄（TTL運用時の古い値を防ぐ）"""
+        cache = safe_json_load(self._read_cache_file)
+        if isinstance(cache, dict) and cache.pop(self._spreadsheet_id, None) is not None:
+            atomic_json_save(self._read_cache_file, cache)
 
     # === URL収集シート ===
 
-    def get_pending_urls(self) -> list[dict]:
+    def get_pending_urls(self, full_scan: bool = False) -> list[dict]:
         """
         URL収集シートから未処理のURLを取得
 
@@ -73,39 +331,75 @@ class SheetsClient:
           C列: ステータス（空=未処理 / 済 / エラー）
           D列: 追加日時
 
+        前回スキャン時点で全行処理済みだった範囲は読み飛ばし、
+        最初の未処理行以降のみを取得する（カーソルは同期状態に保存）。
+        カーソル直前の行のURLを目印として保存し、読み取り時に一致しなければ
+        （行の削除・並べ替え等でシートが変わった）2行目から読み直す。
+
+        Args:
+            full_scan: Trueならカーソル・読み取りキャッシュを無視して2行目から全件取得
+                       （カーソルより上の行のステータスを手で消して再処理したい場合など）
+
         Returns:
             [{"row": int, "url": str, "memo": str}]
         """
+        from gspread.exceptions import WorksheetNotFound
+
         try:
-            ws = self._spreadsheet.worksheet(SHEET_COLLECT)
-        except gspread.exceptions.WorksheetNotFound:
+            ws = self._ws(SHEET_COLLECT)
+        except WorksheetNotFound:
             print(f"[Sheets] '{SHEET_COLLECT}' シートが見つかりません。作成します。")
             ws = self._create_collect_sheet()
             return []
 
-        all_rows = ws.get_all_values()
-        pending = []
-
-        for i, row in enumerate(all_rows):
-            if i == 0:  # ヘッダー行スキップ
-                continue
-            if len(row) < 1 or not row[0].strip():
-                continue
-
-            url = row[0].strip()
-            memo = row[1].strip() if len(row) > 1 else ""
-            status = row[2].strip() if len(row) > 2 else ""
-
-            if status == "":  # 未処理のみ
-                pending.append({
-                    "row": i + 1,  # 1-indexed（GAS/gspread互換）
-                    "url": url,
-                    "memo": memo,
-                })
+        def fetch(first_row: int):
+            return ws.get(f"A{first_row}:D", value_render_option="UNFORMATTED_VALUE")
+
+        state = self.load_sync_state()
+        start_row = 2 if full_scan else max(2, state.get("collect_cursor", 2))
+        rows = None
+        if start_row > 2:
+            # 目印の行（カーソル直前）から読み、保存時と同じURLかを確かめる
+            anchor_rows = self._cached_read(
+                f"{SHEET_COLLECT}!A{start_row - 1}:D", lambda: fetch(start_row - 1)
+            )
+            anchor_url = str(anchor_rows[0][0]).strip() if anchor_rows and anchor_rows[0] else ""
+            if anchor_rows and anchor_url == state.get("collect_anchor", ""):
+                rows = anchor_rows[1:]
+            else:
+                print("[Sheets] URL収集シートの行が変わったため、先頭から読み直します")
+                start_row = 2
+        if rows is None:
+            # full_scan は明示的な再取得なのでキャッシュを使わない
+            rows = fetch(2) if full_scan else self._cached_read(f"{SHEET_COLLECT}!A2:D", lambda: fetch(2))
+
+        # ステータス空（未処理）の行のみ。URL列が空なら以降の列は見ない
+        pending = [
+            {
+                "row": start_row + i,  # 1-indexed（GAS/gspread互換）
+                "url": url,
+                "memo": str(row[1]).strip() if len(row) > 1 else "",
+            }
+            for i, row in enumerate(rows)
+            if row and (url := str(row[0]).strip())
+            and (len(row) < 3 or not str(row[2]).strip())
+        ]
+
+        # 次回は最初の未処理行から（未処理がなければ最終行の次から）読む
+        cursor = pending[0]["row"] if pending else start_row + len(rows)
+        # 目印はカーソル直前の行のURL（cursor == start_row なら読み始めの目印をそのまま使う）
+        if cursor > start_row:
+            row = rows[cursor - 1 - start_row]
+            anchor = str(row[0]).strip() if row else ""
+        else:
+            anchor = state.get("collect_anchor", "") if cursor > 2 else ""
+        if (cursor, anchor) != (state.get("collect_cursor", 2), state.get("collect_anchor", "")):
+            self.save_sync_state(collect_cursor=cursor, collect_anchor=anchor)
 
         return pending
 
-    def mark_url_processed(self, row: int, status: str = "済", tweet_id: str = ""):
+    def mark_url_processed(self, row: int, status: str = "済", tweet_id: str = "",
+                           now: str | None = None):
         """
         URL収集シートのステータスを更新
 
@@ -113,12 +407,14 @@ class SheetsClient:
             row: 行番号（1-indexed）
             status: "済" / "エラー" / "重複"
             tweet_id: キューに追加されたツイートID
+            now: 処理日時（ループから呼ぶ場合は呼び出し側で1回だけ生成して渡す）
         """
-        ws = self._spreadsheet.worksheet(SHEET_COLLECT)
-        now = datetime.now(JST).strftime("%Y/%m/%d %H:%M")
+        ws = self._ws(SHEET_COLLECT)
+        now = now or _fmt_jst()
 
         # C列: ステータス, D列: 処理日時, E列: ツイートID
         ws.update(f"C{row}:E{row}", [[status, now, tweet_id]])
+        self._invalidate_reads()
 
     def mark_urls_batch(self, updates: list[dict]):
         """
@@ -130,23 +426,64 @@ class SheetsClient:
         if not updates:
             return
 
-        ws = self._spreadsheet.worksheet(SHEET_COLLECT)
-        now = datetime.now(JST).strftime("%Y/%m/%d %H:%M")
+        ws = self._ws(SHEET_COLLECT)
+        batch = [
+            {"range": f"C{first}:E{last}", "values": values}
+            for first, last, values in _status_row_groups(updates, _fmt_jst())
+        ]
+        ws.batch_update(batch, value_input_option="RAW")
+        self._invalidate_reads()
 
-        batch = []
-        for u in updates:
-            batch.append({
-                "range": f"C{u['row']}:E{u['row']}",
-                "values": [[u["status"], now, u.get("tweet_id", "")]],
-            })
+    def finalize_import(self, updates: list[dict], log: dict | None = None):
+        """
+        URLインポート結果の書き戻しを1回の batchUpdate で行う
 
-        ws.batch_update(batch)
+        URL収集シートのステータス更新（連続行ごとの updateCells）と、
+        収集ログへの追記（appendCells、バッファ済みの収集ログ行も同梱）をまとめて送る。
+
+        Args:
+            updates: [{"row": int, "status": str, "tweet_id": str}]
+            log: 収集ログに追記する集計（append_collection_log と同じ形式、省略可）
+        """
+        requests = []
+        if updates:
+            collect_id = self._ws(SHEET_COLLECT).id
+            for first, last, values in _status_row_groups(updates, _fmt_jst()):
+                requests.append({"updateCells": {
+                    "range": {
+                        "sheetId": collect_id,
+                        "startRowIndex": first - 1,
+                        "endRowIndex": last,
+                        "startColumnIndex": 2,  # C列
+                        "endColumnIndex": 5,    # E列まで
+                    },
+                    "rows": [{"values": [_cell_data(v) for v in row]} for row in values],
+                    "fields": "userEnteredValue",
+                }})
+
+        log_rows = self._append_buffers.pop(SHEET_COLLECTION_LOG, [])
+        if log is not None:
+            log_rows.append(_collection_log_row(log))
+        if log_rows:
+            log_ws = self._get_or_create_sheet(
+                SHEET_COLLECTION_LOG, self._create_collection_log_sheet
+            )
+            requests.append({"appendCells": {
+                "sheetId": log_ws.id,
+                "rows": [{"values": [_cell_data(v) for v in row]} for row in log_rows],
+                "fields": "userEnteredValue",
+            }})
+
+        if not requests:
+            return
+        self._spreadsheet.batch_update({"requests": requests})
+        self._invalidate_reads()
 
     # === 投稿履歴シート ===
 
     def append_posted(self, record: dict):
         """
-        投稿履歴シートにレコード追加
+        投稿履歴シートにレコード追加（バッファ経由 — flush_appends() で書き出し）
 
         Args:
             record: {
@@ -158,12 +495,7 @@ class SheetsClient:
                 "source_url": str,
             }
         """
-        try:
-            ws = self._spreadsheet.worksheet(SHEET_POSTED)
-        except gspread.exceptions.WorksheetNotFound:
-            ws = self._create_posted_sheet()
-
-        ws.append_row([
+        self._buffer_append(SHEET_POSTED, [
             record.get("posted_at", ""),
             record.get("type", ""),
             record.get("text", "")[:200],
@@ -176,7 +508,7 @@ class SheetsClient:
 
     def append_metrics(self, metrics: dict):
         """
-        メトリクスシートにレコード追加
+        メトリクスシートにレコード追加（バッファ経由 — flush_appends() で書き出し）
 
         Args:
             metrics: {
@@ -188,12 +520,7 @@ class SheetsClient:
                 "posted_count": int,
             }
         """
-        try:
-            ws = self._spreadsheet.worksheet(SHEET_METRICS)
-        except gspread.exceptions.WorksheetNotFound:
-            ws = self._create_metrics_sheet()
-
-        ws.append_row([
+        self._buffer_append(SHEET_METRICS, [
             metrics.get("date", ""),
             metrics.get("followers", 0),
             metrics.get("avg_likes", 0),
@@ -202,25 +529,58 @@ class SheetsClient:
             metrics.get("posted_count", 0),
         ])
 
+    # === 追記バッファ ===
+
+    def _buffer_append(self, name: str, row: list):
+        """追記する行をバッファに積む（一定行数で自動書き出し）"""
+        buffer = self._append_buffers[name]
+        buffer.append(row)
+        if len(buffer) >= APPEND_FLUSH_SIZE:
+            self._flush_append(name)
+
+    def flush_appends(self):
+        """全シートのバッファ済み行を書き出す（シートごとに1回のAPI呼び出し）"""
+        for name in list(self._append_buffers):
+            self._flush_append(name)
+
+    def _flush_append(self, name: str):
+        rows = self._append_buffers.pop(name, None)
+        if not rows:
+            return
+        ws = self._get_or_create_sheet(name, self._sheet_creators()[name])
+        ws.append_rows(rows, value_input_option="RAW", insert_data_option="INSERT_ROWS")
+
     # === キュー管理シート（パターンB） ===
 
     def _get_or_create_sheet(self, name: str, creator_fn):
         """シートを取得、なければ作成"""
+        from gspread.exceptions import WorksheetNotFound
+
         try:
-            return self._spreadsheet.worksheet(name)
-        except gspread.exceptions.WorksheetNotFound:
+            return self._ws(name)
+        except WorksheetNotFound:
             return creator_fn()
 
     def write_queue_items(self, items: list[dict]):
-        """キュー管理シートにアイテムを書き込み（全件上書き）"""
-        ws = self._get_or_create_sheet(SHEET_QUEUE, self._create_queue_sheet)
+        """
+        キュー管理シートにアイテムを書き込み（全件上書き）
 
-        # ヘッダー以外をクリア
-        if ws.row_count > 1:
-            ws.batch_clear([f"A2:L{ws.row_count}"])
+        クリアと書き込みを1回の batchUpdate (updateCells) で行う。
+        range が rows より広い部分は fields=userEnteredValue によりクリアされる。
+        """
+        requests, grid_rows = self._queue_requests(items)
+        self._spreadsheet.batch_update({"requests": requests})
+        self._grid_rows[SHEET_QUEUE] = grid_rows
+        self._invalidate_reads()
 
-        if not items:
-            return
+    def _queue_requests(self, items: list[dict]) -> tuple[list[dict], int]:
+        """
+        キュー管理シート全件上書きの batchUpdate リクエストを組み立て
+
+        Returns:
+            (リクエスト一覧, 実行後のシート行数)。行数は batchUpdate 成功後に _grid_rows へ記録する
+        """
+        ws = self._get_or_create_sheet(SHEET_QUEUE, self._create_queue_sheet)
 
         rows = []
         for item in items:
@@ -241,128 +601,236 @@ class SheetsClient:
                 item.get("preference_match_score", ""),
             ])
 
-        ws.update(f"A2:L{1 + len(rows)}", rows)
+        requests = []
+        needed = 1 + len(rows)
+        row_count = max(ws.row_count, self._grid_rows.get(SHEET_QUEUE, 0))
+        if needed > row_count:
+            # updateCells はグリッドを自動拡張しないため同じバッチで行を追加
+            requests.append({"appendDimension": {
+                "sheetId": ws.id, "dimension": "ROWS", "length": needed - row_count,
+            }})
+        requests.append({"updateCells": {
+            "range": {
+                "sheetId": ws.id,
+                "startRowIndex": 1,
+                "endRowIndex": max(needed, row_count),
+                "startColumnIndex": 0,
+                "endColumnIndex": QUEUE_COLUMNS,
+            },
+            "rows": [{"values": [_cell_data(v) for v in row]} for row in rows],
+            "fields": "userEnteredValue",
+        }})
+        return requests, max(needed, row_count)
+
+    def write_queue_and_dashboard(self, items: list[dict] | None, stats: dict | None):
+        """
+        キュー管理シートの全件上書きとダッシュボード更新を1回の batchUpdate で行う
+
+        Args:
+            items: キューの全アイテム（Noneならキューは書き出さない）
+            stats: update_dashboard() と同じ統計（Noneならダッシュボードは更新しない）
+        """
+        requests, grid_rows = self._queue_requests(items) if items is not None else ([], 0)
+        if stats is not None:
+            requests.append(self._dashboard_request(stats))
+        if not requests:
+            return
+        self._spreadsheet.batch_update({"requests": requests})
+        if items is not None:
+            self._grid_rows[SHEET_QUEUE] = grid_rows
+            self._invalidate_reads()
+
+    def _dashboard_request(self, stats: dict) -> dict:
+        """ダッシュボード B2:B8 を更新する updateCells リクエスト"""
+        ws = self._get_or_create_sheet(SHEET_DASHBOARD, self._create_dashboard_sheet)
+        return {"updateCells": {
+            "range": {
+                "sheetId": ws.id,
+                "startRowIndex": 1,
+                "endRowIndex": 8,
+                "startColumnIndex": 1,
+                "endColumnIndex": 2,
+            },
+            "rows": [{"values": [_cell_data(v) for v in row]} for row in _dashboard_values(stats)],
+            "fields": "userEnteredValue",
+        }}
 
     def read_queue_decisions(self) -> list[dict]:
-        """キュー管理シートからクライアントの承認/拒否を読み取り"""
+        """
+        キュー管理シートからクライアントの承認/拒否を読み取り
+
+        本文・生成テキスト列は不要なので、A〜B列（ステータス/ツイートID）と
+        K列（スキップ理由）だけを1回の batchGet で取得する。
+        変更マーカー（M1 の =NOW()）が前回と同じなら、前回の結果を再利用する。
+        """
         ws = self._get_or_create_sheet(SHEET_QUEUE, self._create_queue_sheet)
-        all_rows = ws.get_all_values()
+        marker = self._queue_marker(ws)
+        id_rows, reason_rows = self._cached_read(
+            f"{SHEET_QUEUE}!decisions",
+            lambda: [list(vr) for vr in ws.batch_get(["A2:B", "K2:K"])],
+            revision=f"marker:{marker}" if marker else None,
+        )
 
         decisions = []
-        for i, row in enumerate(all_rows):
-            if i == 0:
-                continue
-            if len(row) < 2 or not row[1].strip():
+        for i, row in enumerate(id_rows):
+            if len(row) < 2 or not str(row[1]).strip():
                 continue
+            reason = reason_rows[i] if i < len(reason_rows) else []
             decisions.append({
-                "row": i + 1,
-                "status": row[0].strip(),
-                "tweet_id": row[1].strip(),
-                "skip_reason": row[10].strip() if len(row) > 10 else "",
+                "row": i + 2,
+                "status": str(row[0]).strip(),
+                "tweet_id": str(row[1]).strip(),
+                "skip_reason": str(reason[0]).strip() if reason else "",
             })
         return decisions
 
+    def _queue_marker(self, ws) -> str:
+        """
+        キュー管理シートの変更マーカー（M1セル）を取得
+
+        M1 の =NOW() はシートが編集されるたびに再計算されるため、
+        1セルの読み取りで変更有無を判定できる。マーカーのない旧シートでは空文字。
+        """
+        try:
+            cell = ws.acell(QUEUE_MARKER_CELL, value_render_option="UNFORMATTED_VALUE")
+        except Exception:
+            return ""
+        return str(cell.value or "")
+
     # === 収集ログシート（パターンB） ===
 
     def append_collection_log(self, log: dict):
-        """収集ログを追記"""
-        ws = self._get_or_create_sheet(
-            SHEET_COLLECTION_LOG, self._create_collection_log_sheet
-        )
-        now = datetime.now(JST).strftime("%Y/%m/%d %H:%M")
-        ws.append_row([
-            now,
-            log.get("fetched", 0),
-            log.get("filtered", 0),
-            log.get("added", 0),
-            log.get("skipped_dup", 0),
-            log.get("error", ""),
-        ])
+        """収集ログを追記（バッファ経由 — flush_appends() で書き出し）"""
+        self._buffer_append(SHEET_COLLECTION_LOG, _collection_log_row(log))
 
     # === ダッシュボードシート（パターンB） ===
 
     def update_dashboard(self, stats: dict):
-        """ダッシュボード統計を更新"""
-        ws = self._get_or_create_sheet(
-            SHEET_DASHBOARD, self._create_dashboard_sheet
+        """ダッシュボード統計を更新（values.update 1回）"""
+        self._get_or_create_sheet(SHEET_DASHBOARD, self._create_dashboard_sheet)
+        self._spreadsheet.values_update(
+            f"'{SHEET_DASHBOARD}'!B2:B8",
+            params={"valueInputOption": "RAW"},
+            body={"values": _dashboard_values(stats)},
         )
-        now = datetime.now(JST).strftime("%Y/%m/%d %H:%M")
-        ws.update("B2:B8", [
-            [stats.get("last_collection", "—")],
-            [stats.get("collected_today", 0)],
-            [stats.get("pending", 0)],
-            [stats.get("approved", 0)],
-            [stats.get("posted_today", 0)],
-            [stats.get("api_status", "OK")],
-            [now],
-        ])
 
     # === 設定シート（パターンB） ===
 
     def get_settings(self) -> dict:
         """設定シートから全設定を読み取り"""
-        ws = self._get_or_create_sheet(SHEET_SETTINGS, self._create_settings_sheet)
-        all_rows = ws.get_all_values()
+        return self.get_key_value_sheets([SHEET_SETTINGS])[SHEET_SETTINGS]
 
-        settings = {}
-        for i, row in enumerate(all_rows):
-            if i == 0:
-                continue
-            if len(row) < 2:
-                continue
-            key = row[0].strip()
-            value = row[1].strip()
-            if key:
-                settings[key] = value
-        return settings
+    def get_key_value_sheets(self, names: list[str]) -> dict[str, dict]:
+        """
+        キー/値形式のシート（A列=キー, B列=値）を1回のbatchGetでまとめて読み取り
+
+        シートが未作成などで一括取得に失敗した場合は、シートごとに作成・読み取りする。
+
+        Args:
+            names: SHEET_SETTINGS / SHEET_PREFERENCES のリスト
+
+        Returns:
+            {シート名: {キー: 値}}
+        """
+        value_ranges = self._cached_read(
+            "kv:" + "|".join(names), lambda: self._fetch_key_value_ranges(names)
+        )
+
+        # キーのみ（値が空）の行は "" として扱う
+        return {
+            name: {
+                key: (row[1].strip() if len(row) > 1 else "")
+                for row in rows
+                if row and (key := row[0].strip())
+            }
+            for name, rows in zip(names, value_ranges)
+        }
+
+    def _fetch_key_value_ranges(self, names: list[str]) -> list[list]:
+        """キー/値シートの A2:B をシートごとに取得"""
+        from gspread.exceptions import APIError
+
+        try:
+            resp = self._spreadsheet.values_batch_get([f"'{name}'!A2:B" for name in names])
+            return [vr.get("values", []) for vr in resp.get("valueRanges", [])]
+        except APIError:
+            creators = self._sheet_creators()
+            return [
+                self._get_or_create_sheet(name, creators[name]).get("A2:B")
+                for name in names
+            ]
 
     # === シート初期化 ===
 
+    def _init_sheet(self, title: str, rows: int, cols: int, values: list[list],
+                    bold_cols: int | None = None):
+        """
+        シートを追加し、初期値の書き込みと見出し行の太字化を1回の batchUpdate で行う
+
+        Args:
+            title: シート名
+            rows, cols: グリッドサイズ
+            values: A1 から書き込む行（1行目が見出し）
+            bold_cols: 太字にする見出しの列数（省略時は1行目の全列）
+        """
+        ws = self._add_worksheet(title, rows=rows, cols=cols)
+        self._spreadsheet.batch_update({"requests": [
+            {"updateCells": {
+                "start": {"sheetId": ws.id, "rowIndex": 0, "columnIndex": 0},
+                "rows": [{"values": [_cell_data(v) for v in row]} for row in values],
+                "fields": "userEnteredValue",
+            }},
+            {"repeatCell": {
+                "range": {
+                    "sheetId": ws.id,
+                    "startRowIndex": 0,
+                    "endRowIndex": 1,
+                    "startColumnIndex": 0,
+                    "endColumnIndex": bold_cols or len(values[0]),
+                },
+                "cell": {"userEnteredFormat": {"textFormat": {"bold": True}}},
+                "fields": "userEnteredFormat.textFormat.bold",
+            }},
+        ]})
+        return ws
+
     def _create_collect_sheet(self):
         """URL収集シートを作成"""
-        ws = self._spreadsheet.add_worksheet(title=SHEET_COLLECT, rows=500, cols=5)
-        ws.update("A1:E1", [["URL", "メモ", "ステータス", "処理日時", "ツイートID"]])
-        ws.format("A1:E1", {"textFormat": {"bold": True}})
-        return ws
+        return self._init_sheet(SHEET_COLLECT, 500, 5, [
+            ["URL", "メモ", "ステータス", "処理日時", "ツイートID"],
+        ])
 
     def _create_posted_sheet(self):
         """投稿履歴シートを作成"""
-        ws = self._spreadsheet.add_worksheet(title=SHEET_POSTED, rows=1000, cols=6)
-        ws.update("A1:F1", [["投稿日時", "種別", "投稿文", "Tweet ID", "スコア", "元URL"]])
-        ws.format("A1:F1", {"textFormat": {"bold": True}})
-        return ws
+        return self._init_sheet(SHEET_POSTED, 1000, 6, [
+            ["投稿日時", "種別", "投稿文", "Tweet ID", "スコア", "元URL"],
+        ])
 
     def _create_metrics_sheet(self):
         """メトリクスシートを作成"""
-        ws = self._spreadsheet.add_worksheet(title=SHEET_METRICS, rows=500, cols=6)
-        ws.update("A1:F1", [["日付", "フォロワー", "平均いいね", "平均RT", "エンゲージメント率", "投稿数"]])
-        ws.format("A1:F1", {"textFormat": {"bold": True}})
-        return ws
+        return self._init_sheet(SHEET_METRICS, 500, 6, [
+            ["日付", "フォロワー", "平均いいね", "平均RT", "エンゲージメント率", "投稿数"],
+        ])
 
     def _create_queue_sheet(self):
         """キュー管理シートを作成"""
-        ws = self._spreadsheet.add_worksheet(title=SHEET_QUEUE, rows=200, cols=12)
-        ws.update("A1:L1", [[
+        # M1 の変更マーカー: 編集のたびに再計算され、read_queue_decisions の再読込判定に使う
+        return self._init_sheet(SHEET_QUEUE, 200, QUEUE_COLUMNS + 1, [[
             "ステータス", "ツイートID", "著者", "ツイート本文",
             "いいね数", "収集日時", "生成テキスト", "スコア", "ソース", "URL",
-            "スキップ理由", "マッチスコア"
-        ]])
-        ws.format("A1:L1", {"textFormat": {"bold": True}})
-        return ws
+            "スキップ理由", "マッチスコア",
+            {"userEnteredValue": {"formulaValue": "=NOW()"}},
+        ]], bold_cols=QUEUE_COLUMNS)
 
     def _create_collection_log_sheet(self):
         """収集ログシートを作成"""
-        ws = self._spreadsheet.add_worksheet(title=SHEET_COLLECTION_LOG, rows=500, cols=6)
-        ws.update("A1:F1", [[
+        return self._init_sheet(SHEET_COLLECTION_LOG, 500, 6, [[
             "日時", "API取得件数", "フィルタ後", "キュー追加", "重複スキップ", "エラー"
         ]])
-        ws.format("A1:F1", {"textFormat": {"bold": True}})
-        return ws
 
     def _create_dashboard_sheet(self):
         """ダッシュボードシートを作成"""
-        ws = self._spreadsheet.add_worksheet(title=SHEET_DASHBOARD, rows=20, cols=4)
-        ws.update("A1:B8", [
+        return self._init_sheet(SHEET_DASHBOARD, 20, 4, [
             ["項目", "値"],
             ["最終収集日時", "—"],
             ["今日の収集件数", "0"],
@@ -372,14 +840,11 @@ class SheetsClient:
             ["API状態", "—"],
             ["最終更新", "—"],
         ])
-        ws.format("A1:B1", {"textFormat": {"bold": True}})
-        return ws
 
     def _create_preferences_sheet(self):
         """選定プリファレンスシートを作成（クライアント編集可能）"""
-        ws = self._spreadsheet.add_worksheet(title=SHEET_PREFERENCES, rows=30, cols=3)
-        ws.update("A1:C1", [["設定キー", "値", "説明"]])
-        ws.update("A2:C11", [
+        return self._init_sheet(SHEET_PREFERENCES, 30, 3, [
+            ["設定キー", "値", "説明"],
             ["weekly_focus", "", "今週のフォーカステーマ（自由記述）"],
             ["focus_keywords", "", "フォーカスキーワード（カンマ区切り）"],
             ["focus_accounts", "", "フォーカスアカウント（カンマ区切り）"],
@@ -391,31 +856,15 @@ class SheetsClient:
             ["max_age_hours_override", "", "最大経過時間の上書き（空=デフォルト48）"],
             ["extra_keywords", "", "追加キーワード（weight:2.0、カンマ区切り）"],
         ])
-        ws.format("A1:C1", {"textFormat": {"bold": True}})
-        return ws
 
     def get_preferences(self) -> dict:
         """選定プリファレンスシートから設定を読み取り"""
-        ws = self._get_or_create_sheet(SHEET_PREFERENCES, self._create_preferences_sheet)
-        all_rows = ws.get_all_values()
-
-        preferences = {}
-        for i, row in enumerate(all_rows):
-            if i == 0:
-                continue
-            if len(row) < 2:
-                continue
-            key = row[0].strip()
-            value = row[1].strip()
-            if key:
-                preferences[key] = value
-        return preferences
+        return self.get_key_value_sheets([SHEET_PREFERENCES])[SHEET_PREFERENCES]
 
     def _create_settings_sheet(self):
         """設定シートを作成（クライアント編集可能）"""
-        ws = self._spreadsheet.add_worksheet(title=SHEET_SETTINGS, rows=30, cols=3)
-        ws.update("A1:C1", [["設定キー", "値", "説明"]])
-        ws.update("A2:C8", [
+        return self._init_sheet(SHEET_SETTINGS, 30, 3, [
+            ["設定キー", "値", "説明"],
             ["min_likes", "500", "バズツイート最低いいね数"],
             ["auto_approve", "false", "収集時の自動承認（true/false）"],
             ["max_tweets", "50", "1回の収集最大件数"],
@@ -424,14 +873,10 @@ class SheetsClient:
             ["mode", "manual_approval", "動作モード（manual_approval/semi_auto/auto）"],
             ["auto_post_min_score", "8", "自動投稿の最低スコア"],
         ])
-        ws.format("A1:C1", {"textFormat": {"bold": True}})
-        return ws
-
-    def setup_sheets(self):
-        """全シートを初期化（初回セットアップ用）"""
-        existing = [ws.title for ws in self._spreadsheet.worksheets()]
 
-        sheet_map = {
+    def _sheet_creators(self) -> dict:
+        """シート名 -> 作成関数"""
+        return {
             SHEET_COLLECT: self._create_collect_sheet,
             SHEET_POSTED: self._create_posted_sheet,
             SHEET_METRICS: self._create_metrics_sheet,
@@ -442,10 +887,24 @@ class SheetsClient:
             SHEET_PREFERENCES: self._create_preferences_sheet,
         }
 
-        created = []
-        for name, creator in sheet_map.items():
-            if name not in existing:
-                creator()
-                created.append(name)
+    def setup_sheets(self):
+        """全シートを初期化（初回セットアップ用）"""
+        worksheets = self._spreadsheet.worksheets()
+        self._ws_cache.update({ws.title: ws for ws in worksheets})
+        self._ws_primed = True
+        existing = [ws.title for ws in worksheets]
+
+        # シート作成は互いに独立なので並列実行（書き込みペースは HTTP 層のバケットで制御）
+        missing = {
+            name: creator
+            for name, creator in self._sheet_creators().items()
+            if name not in existing
+        }
+        if not missing:
+            return []
+        with ThreadPoolExecutor(max_workers=SETUP_WORKERS) as executor:
+            futures = [executor.submit(creator) for creator in missing.values()]
+            for future in futures:
+                future.result()
 
-        return created
+        return list(missing)
@@ -5,7 +5,7 @@ Google SheetsのURL収集シートから未処理URLを読み取り、
 キューに一括追加する。パターンAの手動収集フロー。
 """
 from src.collect.queue_manager import QueueManager
-from src.collect.tweet_parser import TweetParser, is_valid_tweet_url
+from src.collect.tweet_parser import TweetParser
 from src.sheets.sheets_client import SheetsClient
 
 
@@ -16,12 +16,13 @@ class URLImporter:
         self.sheets = sheets
         self.queue = queue or QueueManager()
 
-    def import_urls(self, auto_approve: bool = False) -> dict:
+    def import_urls(self, auto_approve: bool = False, full_scan: bool = False) -> dict:
         """
         スプシの未処理URLをキューに追加
 
         Args:
             auto_approve: Trueなら追加と同時に承認
+            full_scan: Trueなら読み取りカーソルを無視してシート全体から未処理URLを探す
 
         Returns:
             {
@@ -32,7 +33,7 @@ class URLImporter:
                 "errors": [str],   # エラーメッセージ
             }
         """
-        pending_urls = self.sheets.get_pending_urls()
+        pending_urls = self.sheets.get_pending_urls(full_scan=full_scan)
 
         result = {
             "total": len(pending_urls),
@@ -49,49 +50,64 @@ class URLImporter:
         print(f"📋 未処理URL: {len(pending_urls)}件")
 
         updates = []
-
-        for item in pending_urls:
-            url = item["url"]
-            memo = item["memo"]
-            row = item["row"]
-
-            # URL検証
-            if not is_valid_tweet_url(url):
-                print(f"  ⚠️ 無効なURL (行{row}): {url[:60]}")
-                result["invalid"] += 1
-                updates.append({"row": row, "status": "エラー", "tweet_id": ""})
-                continue
-
-            # ParsedTweet作成
-            try:
-                tweet = TweetParser.from_url(url, memo=memo)
-            except ValueError as e:
-                print(f"  ❌ URL解析エラー (行{row}): {e}")
-                result["errors"].append(str(e))
-                updates.append({"row": row, "status": "エラー", "tweet_id": ""})
-                continue
-
-            # キューに追加
-            added = self.queue.add(tweet)
-            if added:
-                result["added"] += 1
-                updates.append({"row": row, "status": "済", "tweet_id": tweet.tweet_id})
-                print(f"  ✅ 追加: @{tweet.author_username}/{tweet.tweet_id}")
-
-                if auto_approve:
-                    self.queue.approve(tweet.tweet_id)
-            else:
-                result["skipped_dup"] += 1
-                updates.append({"row": row, "status": "重複", "tweet_id": tweet.tweet_id})
-                print(f"  ⏭️ 重複スキップ: @{tweet.author_username}/{tweet.tweet_id}")
-
-        # スプシのステータス一括更新
-        if updates:
-            try:
-                self.sheets.mark_urls_batch(updates)
-                print(f"\n📝 スプレッドシートのステータスを{len(updates)}件更新しました")
-            except Exception as e:
-                print(f"\n⚠️ スプレッドシートのステータス更新エラー: {e}")
+        # URL検証はまとめて実行
+        parsed_urls = TweetParser.parse_urls_batch([item["url"] for item in pending_urls])
+
+        # 同じツイートが複数行にある場合は最初の行だけ解析・追加し、残りは重複扱い
+        seen_ids = set()
+
+        # キューへの追加・承認はまとめて1回で書き込む
+        with self.queue.batch():
+            for item, parsed in zip(pending_urls, parsed_urls):
+                url = item["url"]
+                memo = item["memo"]
+                row = item["row"]
+
+                # URL検証
+                if parsed is None:
+                    print(f"  ⚠️ 無効なURL (行{row}): {url[:60]}")
+                    result["invalid"] += 1
+                    updates.append({"row": row, "status": "エラー", "tweet_id": ""})
+                    continue
+
+                username, tweet_id = parsed
+                if tweet_id in seen_ids:
+                    result["skipped_dup"] += 1
+                    updates.append({"row": row, "status": "重複", "tweet_id": tweet_id})
+                    print(f"  ⏭️ 重複スキップ (行{row}): @{username}/{tweet_id}")
+                    continue
+                seen_ids.add(tweet_id)
+
+                # ParsedTweet作成（解析済みなのでURLは再解析しない）
+                tweet = TweetParser.from_parts(username, tweet_id, memo=memo)
+
+                # キューに追加
+                added = self.queue.add(tweet)
+                if added:
+                    result["added"] += 1
+                    updates.append({"row": row, "status": "済", "tweet_id": tweet.tweet_id})
+                    print(f"  ✅ 追加: @{tweet.author_username}/{tweet.tweet_id}")
+
+                    if auto_approve:
+                        self.queue.approve(tweet.tweet_id)
+                else:
+                    result["skipped_dup"] += 1
+                    updates.append({"row": row, "status": "重複", "tweet_id": tweet.tweet_id})
+                    print(f"  ⏭️ 重複スキップ: @{tweet.author_username}/{tweet.tweet_id}")
+
+        # スプシのステータス一括更新 + 収集ログ追記（1回のAPI呼び出し）
+        log = {
+            "fetched": result["total"],
+            "filtered": result["total"] - result["invalid"],
+            "added": result["added"],
+            "skipped_dup": result["skipped_dup"],
+            "error": "; ".join(result["errors"])[:200],
+        }
+        try:
+            self.sheets.finalize_import(updates, log)
+            print(f"\n📝 スプレッドシートのステータスを{len(updates)}件更新しました")
+        except Exception as e:
+            print(f"\n⚠️ スプレッドシートのステータス更新エラー: {e}")
 
         return result
 
@@ -1,45 +1,280 @@
 """
 X Auto Post System — 共通ユーティリティ
 
-リトライ機構、アトミックファイル操作など。
+リトライ機構（サーキットブレーカー付き）、アトミックファイル操作など。
 """
+import hashlib
 import json
+import mmap
+import os
+import random
 import shutil
+import threading
 import time
+from collections.abc import Mapping
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # orjson は任意依存（未インストール時は標準jsonで代替）
+    orjson = None
 
-def retry_with_backoff(fn, max_retries: int = 3, base_delay: float = 2.0, label: str = ""):
+
+def json_loads(data: bytes | str):
+    """JSONをパース（orjsonがあれば使用）"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(data, indent: bool = True) -> bytes:
+    """
+    JSONをUTF-8バイト列に出力（非ASCIIはそのまま）
+
+    Args:
+        data: 出力するデータ
+        indent: True なら indent=2 で整形、False なら1行（JSON Lines 用）
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(data, option=option)
+    if indent:
+        return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# リトライしても結果が変わらないHTTPステータス（即座に送出）
+NON_RETRYABLE_STATUS = {400, 401, 403, 404}
+
+# Retry-After / delay_for の待機秒数に加えるジッターの上限（待機秒数に対する割合）
+RETRY_JITTER = 0.2
+# 指数バックオフの待機秒数の上限（既定）
+RETRY_CAP = 60.0
+# 指数バックオフのジッター方式
+#   none: base_delay * 2**attempt（ジッターなし）
+#   full: 0〜min(cap, base_delay * 2**attempt) の一様乱数
+#   equal: 上限の半分 + 0〜半分の一様乱数
+#   decorrelated: min(cap, base_delay〜前回待機秒数*3 の一様乱数)
+JITTER_MODES = ("none", "full", "equal", "decorrelated")
+
+
+def _http_status(error: Exception) -> int | None:
+    """例外からHTTPステータスを取り出す（requests系は response、gspread/genai は code）"""
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    if not isinstance(status, int):
+        status = getattr(error, "code", None)
+    return status if isinstance(status, int) else None
+
+
+def _retry_after(error: Exception) -> float | None:
+    """例外のレスポンスに Retry-After（秒）があれば返す"""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not isinstance(headers, Mapping):
+        return None
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+@lru_cache(maxsize=32)
+def _backoff_ceilings(max_retries: int, base_delay: float, cap: float) -> tuple[float, ...]:
+    """
+    各リトライの指数バックオフ上限 min(cap, base_delay * 2**attempt) の列
+
+    呼び出し側の (max_retries, base_delay, cap) は数種類の定数なので組ごとにキャッシュする。
+    """
+    return tuple(min(cap, base_delay * (2 ** attempt)) for attempt in range(max_retries))
+
+
+def _backoff_delay(
+    jitter: str, ceiling: float, base_delay: float, cap: float, prev_delay: float, rng
+) -> float:
+    """ジッター方式に応じた指数バックオフの待機秒数（ceiling はその回の上限）"""
+    if jitter == "decorrelated":
+        return min(cap, rng.uniform(base_delay, prev_delay * 3))
+    if jitter == "full":
+        return rng.uniform(0, ceiling)
+    if jitter == "equal":
+        return ceiling / 2 + rng.uniform(0, ceiling / 2)
+    return ceiling
+
+
+class CircuitOpenError(RuntimeError):
+    """サーキットブレーカーが開いているため呼び出さずに失敗した"""
+
+
+class CircuitBreaker:
+    """
+    連続失敗で呼び出しを一時遮断するサーキットブレーカー（スレッドセーフ）
+
+    window 秒以内の間隔で続いた失敗が threshold 回に達すると開き、
+    cooldown 秒間は待機せず CircuitOpenError で即座に失敗させる。
+    cooldown 経過後は1回だけ試行を通し（half-open）、成功すれば閉じ、失敗すれば再び開く。
+    """
+
+    def __init__(self, threshold: int = 5, window: float = 30.0, cooldown: float = 60.0,
+                 clock=time.monotonic):
+        self.threshold = threshold
+        self.window = window
+        self.cooldown = cooldown
+        self._clock = clock
+        self._failures = 0
+        self._last_failure = 0.0
+        self._opened_at: float | None = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """現在の状態（closed / open / half_open）"""
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._trial or self._clock() - self._opened_at >= self.cooldown:
+                return "half_open"
+            return "open"
+
+    def before_call(self):
+        """呼び出し前の確認（開いている間は CircuitOpenError）"""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if self._trial or self._clock() - self._opened_at < self.cooldown:
+                raise CircuitOpenError("サーキットブレーカー作動中（呼び出しを遮断）")
+            self._trial = True
+
+    def record_success(self):
+        """相手が応答した（成功・リトライ対象外のエラー）"""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self):
+        """リトライ対象の失敗を記録"""
+        with self._lock:
+            now = self._clock()
+            if self._trial:
+                # half-open の試行が失敗したら再び開く
+                self._trial = False
+                self._opened_at = now
+                return
+            if now - self._last_failure > self.window:
+                self._failures = 0
+            self._failures += 1
+            self._last_failure = now
+            if self._failures >= self.threshold:
+                self._opened_at = now
+
+
+def retry_with_backoff(
+    fn,
+    max_retries: int = 3,
+    base_delay: float = 2.0,
+    label: str = "",
+    retry_if=None,
+    delay_for=None,
+    cap: float = RETRY_CAP,
+    rng: random.Random | None = None,
+    jitter: str = "full",
+    breaker: CircuitBreaker | None = None,
+):
     """
     指数バックオフ付きリトライ
 
+    待機秒数は delay_for → レスポンスの Retry-After → 指数バックオフ の順で決める。
+    指定された待機秒数（delay_for / Retry-After）には最大20%のジッターを加え、
+    指数バックオフは既定で 0〜min(cap, base_delay * 2**attempt) の一様乱数（full jitter）にして
+    並列に動くプロセスの再試行が同じ時刻に集中しないようにする（方式は jitter で変更可）。
+    400/401/403/404 はリトライせず即座に送出する。
+    breaker を渡すと各試行の前に確認し、開いていれば待機せず CircuitOpenError を送出する。
+
     Args:
         fn: 実行する関数（引数なし）
         max_retries: 最大リトライ回数
         base_delay: 初回待機秒数
         label: ログ用ラベル
+        retry_if: 例外を受け取りリトライ対象かを返す関数（指定時はステータス判定より優先）
+        delay_for: 例外を受け取り待機秒数を返す関数（None を返せば既定の決め方）
+        cap: 指数バックオフの待機秒数の上限
+        rng: 乱数生成器（テストでシード固定する場合に指定。省略時は random モジュール）
+        jitter: 指数バックオフのジッター方式（JITTER_MODES のいずれか）
+        breaker: 呼び出し先ごとに共有するサーキットブレーカー（省略時は使わない）
 
     Returns:
         fn() の戻り値
 
     Raises:
-        最後の試行で発生した例外
+        最後の試行で発生した例外、またはリトライ対象外の例外
+        ValueError: jitter が未知の方式の場合
+        CircuitOpenError: breaker が開いている場合
     """
+    if jitter not in JITTER_MODES:
+        raise ValueError(f"未知のジッター方式: {jitter}")
+    rng = rng or random
+    prev_delay = base_delay
     last_error = None
     for attempt in range(max_retries + 1):
+        if breaker is not None:
+            try:
+                breaker.before_call()
+            except CircuitOpenError as e:
+                print(f"  ⛔ {label}サーキットブレーカー作動中のため中止")
+                raise e from last_error
         try:
-            return fn()
+            result = fn()
         except Exception as e:
+            if retry_if is not None:
+                retryable = retry_if(e)
+            else:
+                retryable = _http_status(e) not in NON_RETRYABLE_STATUS
+            if breaker is not None:
+                if retryable:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+            if not retryable:
+                raise
             last_error = e
             if attempt < max_retries:
-                delay = base_delay * (2 ** attempt)
+                delay = delay_for(e) if delay_for is not None else None
+                if delay is None:
+                    delay = _retry_after(e)
+                if delay is None:
+                    ceiling = _backoff_ceilings(max_retries, base_delay, cap)[attempt]
+                    delay = _backoff_delay(jitter, ceiling, base_delay, cap, prev_delay, rng)
+                    prev_delay = delay
+                else:
+                    delay += rng.uniform(0, RETRY_JITTER * delay)
                 print(f"  ⚠️ {label}リトライ {attempt + 1}/{max_retries} ({delay:.0f}秒後): {e}")
                 time.sleep(delay)
             else:
                 print(f"  ❌ {label}全{max_retries}回リトライ失敗: {e}")
+        else:
+            if breaker is not None:
+                breaker.record_success()
+            return result
     raise last_error
 
 
+# これ以上のサイズのJSONは mmap したページを orjson に直接渡す（読み込みバッファへのコピーを省く）
+MMAP_LOAD_THRESHOLD = 64 * 1024
+
+
+def _read_json(path: Path) -> list | dict:
+    """JSONファイルを読み込んでパース（orjson があれば大きなファイルは mmap から直接パース）"""
+    if orjson is None:
+        return json.loads(path.read_bytes())
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0 or size < MMAP_LOAD_THRESHOLD:
+            return orjson.loads(f.read())
+        with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return orjson.loads(view)
+
+
 def safe_json_load(path: Path) -> list | dict:
     """
     安全なJSON読み込み（破損時はバックアップから復元）
@@ -53,16 +288,14 @@ def safe_json_load(path: Path) -> list | dict:
     backup_path = path.with_suffix(".json.bak")
 
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return _read_json(path)
     except (json.JSONDecodeError, UnicodeDecodeError) as e:
         print(f"  ⚠️ JSON破損検出: {path.name} — {e}")
         # バックアップから復元を試みる
         if backup_path.exists():
             print(f"  🔄 バックアップから復元: {backup_path.name}")
             try:
-                with open(backup_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+                data = _read_json(backup_path)
                 # 復元成功 → 本ファイルを上書き
                 atomic_json_save(path, data)
                 return data
@@ -76,29 +309,148 @@ def safe_json_load(path: Path) -> list | dict:
         return []
 
 
-def atomic_json_save(path: Path, data: list | dict):
+def _write_all(fd: int, payload: bytes):
+    """payload を全て書き込む（os.write は一部だけ書いて戻ることがある）"""
+    view = memoryview(payload)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+# 読み戻し検証の読み込み単位
+_VERIFY_CHUNK = 64 * 1024
+
+
+class WriteCorruption(OSError):
+    """書き込んだファイルの内容が書き込んだデータと一致しない"""
+
+
+def _sha256_file(path: Path) -> bytes:
+    """ファイルの SHA-256（_VERIFY_CHUNK 単位で読み込み）"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_VERIFY_CHUNK):
+            digest.update(chunk)
+    return digest.digest()
+
+
+# O_TMPFILE のファイルを /proc/self/fd 経由でリンクできるか（失敗した環境では以後使わない）
+_tmpfile_link_supported = hasattr(os, "O_TMPFILE") and os.path.isdir("/proc/self/fd")
+
+
+def _write_tmp(tmp_path: Path, payload: bytes, durable: bool):
+    """
+    一時ファイルに payload を書き込む
+
+    Linux では名前のない O_TMPFILE に書き込んでから tmp_path にリンクするため、
+    書き込み途中で中断しても書きかけの一時ファイルがディレクトリに残らない。
+    （linkat は既存ファイルを置き換えられないため、本ファイルへの反映は従来どおりリネーム）
+    O_TMPFILE 非対応の環境・ファイルシステムでは tmp_path に直接書き込む。
+    """
+    global _tmpfile_link_supported
+    if _tmpfile_link_supported:
+        try:
+            fd = os.open(tmp_path.parent, os.O_TMPFILE | os.O_WRONLY, 0o644)
+        except OSError:  # ファイルシステムが O_TMPFILE 非対応
+            fd = None
+        if fd is not None:
+            try:
+                _write_all(fd, payload)
+                if durable:
+                    os.fsync(fd)
+                tmp_path.unlink(missing_ok=True)  # 前回中断時の残骸
+                try:
+                    os.link(f"/proc/self/fd/{fd}", tmp_path, follow_symlinks=True)
+                    return
+                except OSError:  # /proc 経由のリンク不可（コンテナ等）→ 名前付き一時ファイルへ
+                    _tmpfile_link_supported = False
+            finally:
+                os.close(fd)
+
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        _write_all(fd, payload)
+        if durable:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_json_save(path: Path, data: list | dict, *, durable: bool = False, backup: bool = True):
     """
     アトミックなJSON書き込み（中断時の破損防止）
 
-    1. 一時ファイルに書き込み
-    2. 既存ファイルをバックアップ
+    1. 一時ファイルに書き込み（durable なら fsync 後に読み戻して SHA-256 を照合）
+    2. 既存ファイルをバックアップ（ハードリンクなのでファイルサイズに依存しない）
     3. 一時ファイルをリネーム
 
     Args:
         path: 保存先パス
         data: 保存するデータ
+        durable: True なら fsync で電源断後も残ることを保証（投稿履歴など失えないデータ用）
+        backup: False なら .json.bak を作らない（ディレクトリごとコミットされる設定ファイル用）
+
+    Raises:
+        WriteCorruption: durable 時、一時ファイルの内容が書き込んだデータと一致しない
+                         （本ファイル・バックアップは変更しないため、呼び出し側で再試行できる）
     """
     path.parent.mkdir(parents=True, exist_ok=True)
     tmp_path = path.with_suffix(".json.tmp")
     backup_path = path.with_suffix(".json.bak")
 
     # 1. 一時ファイルに書き込み
-    with open(tmp_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    payload = json_dumps(data)
+    _write_tmp(tmp_path, payload, durable)
+    if durable and _sha256_file(tmp_path) != hashlib.sha256(payload).digest():
+        tmp_path.unlink(missing_ok=True)
+        raise WriteCorruption(f"書き込み内容の検証に失敗: {path}")
 
-    # 2. 既存ファイルをバックアップ
-    if path.exists():
-        shutil.copy2(path, backup_path)
+    # 2. 既存ファイルをバックアップ（本ファイルは常に存在させたまま）
+    if backup and path.exists():
+        backup_path.unlink(missing_ok=True)
+        try:
+            os.link(path, backup_path)
+        except OSError:  # ハードリンク非対応のファイルシステム
+            shutil.copy2(path, backup_path)
 
     # 3. 一時ファイルを本ファイルにリネーム（アトミック）
     tmp_path.replace(path)
+
+    # リネーム自体を永続化するためディレクトリも fsync（POSIXのみ）
+    if durable and os.name == "posix":
+        dir_fd = os.open(path.parent, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def append_jsonl(path: Path, entries: list[dict]):
+    """
+    JSON Lines ファイルに追記（既存分は読み書きしない）
+
+    Args:
+        path: 追記先パス
+        entries: 1行1件で書き込むデータ
+    """
+    if not entries:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "ab") as f:
+        f.write(b"".join(json_dumps(entry, indent=False) + b"\n" for entry in entries))
+
+
+def load_jsonl(path: Path) -> list[dict]:
+    """JSON Lines ファイルを読み込み（未作成なら空、途中で切れた最終行は無視）"""
+    try:
+        lines = path.read_bytes().splitlines()
+    except FileNotFoundError:
+        return []
+    entries = []
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            entries.append(json_loads(line))
+        except (json.JSONDecodeError, ValueError):
+            continue
+    return entries
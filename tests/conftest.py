@@ -0,0 +1,16 @@
+"""
+テスト共通設定
+
+並列実行（pytest -n auto）でワーカー同士が衝突しないよう、
+リポジトリ内の実データファイルには書き込まない。
+"""
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_feedback_file(tmp_path, monkeypatch):
+    """選定フィードバックの書き込み先をテストごとの一時ファイルに差し替え"""
+    monkeypatch.setattr(
+        "src.collect.queue_manager.FEEDBACK_FILE",
+        tmp_path / "selection_feedback.json",
+    )
@@ -3,13 +3,81 @@
 XAPIClient, AutoCollector, TweetParser, QueueManager
 """
 import json
+import time
 import pytest
+from dataclasses import fields
+from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
 
-from src.collect.tweet_parser import TweetParser, ParsedTweet, is_valid_tweet_url
+from src.collect import socialdata_client as sd
+from src.collect.tweet_parser import TweetParser, ParsedTweet, is_valid_tweet_url, _parse_url_cached
 from src.collect.queue_manager import QueueManager
 from src.collect.x_api_client import XAPIClient, XAPIError
+from src.collect.socialdata_client import SocialDataClient
+from src.collect.auto_collector import AutoCollector, _parse_timestamp
+from src.collect.preference_scorer import PreferenceScorer
+
+
+_WD = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+_MO = (None, "Jan", "Feb", "Mar", "Apr", "May", "Jun",
+       "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+def _tw_fmt(dt: datetime) -> str:
+    """UTC日時を X API 形式（英語固定・ロケール非依存）で整形"""
+    return (
+        f"{_WD[dt.weekday()]} {_MO[dt.month]} {dt.day:02d} "
+        f"{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d} +0000 {dt.year}"
+    )
+
+
+@lru_cache(maxsize=8)
+def _recent_created_at(minute_bucket: int) -> str:
+    """現在時刻を X API 形式で返す（同じ分の呼び出しはキャッシュを共有）"""
+    return _tw_fmt(datetime.now(timezone.utc))
+
+
+# リプライ / RT のペイロード（フィルタで落ちるため日時は固定でよい）
+REPLY = {
+    "id": 11111,
+    "full_text": "This is a reply",
+    "user": {"screen_name": "test"},
+    "favorite_count": 50000,
+    "lang": "en",
+    "in_reply_to_status_id": "99999",
+    "created_at": "Thu Feb 18 02:14:30 +0000 2026",
+}
+RT = {
+    "id": 22222,
+    "full_text": "RT @someone: Original tweet",
+    "user": {"screen_name": "test"},
+    "favorite_count": 50000,
+    "lang": "en",
+    "created_at": "Thu Feb 18 02:14:30 +0000 2026",
+}
+
+
+def _make_collector(mock_client, queue, accounts: list[dict]) -> AutoCollector:
+    """__init__ を通さずに AutoCollector を組み立てる"""
+    collector = AutoCollector.__new__(AutoCollector)
+    # X API v2 フォールバック経路（SocialData 未設定）で収集する
+    collector._use_socialdata = False
+    collector._sd_client = None
+    collector._x_client = mock_client
+    collector.queue = queue
+    collector.target_accounts = accounts
+    # キーワードが空だと検索自体を行わないため1件入れておく
+    collector.keywords = ["AI"]
+    collector.require_verified = False
+    collector.min_followers = 0
+    collector.excluded_terms = []
+    collector.buzz_thresholds = {"likes_min": 500, "lang": ["en"], "age_max_hours": 48}
+    collector.threshold_overrides = {}
+    collector.preference_scorer = PreferenceScorer()
+    return collector
 
 
 # ========================================
@@ -32,6 +100,16 @@ class TestTweetParser:
         result = TweetParser.parse_url("https://mobile.twitter.com/AndrewYNg/status/1111111111")
         assert result == ("AndrewYNg", "1111111111")
 
+    def test_parse_mobile_x_url(self):
+        """mobile.x.com のURLをパース"""
+        result = TweetParser.parse_url("https://mobile.x.com/a/status/1")
+        assert result == ("a", "1")
+
+    @pytest.mark.parametrize("tweet_id", ["12²", "١٢٣", "１２３"])
+    def test_parse_rejects_non_ascii_digits(self, tweet_id):
+        """ASCII以外の数字を含むツイートIDは無効"""
+        assert TweetParser.parse_url(f"https://x.com/sama/status/{tweet_id}") is None
+
     def test_parse_vx_url(self):
         """vxtwitter URLをパース"""
         result = TweetParser.parse_url("https://vxtwitter.com/sama/status/5555555555")
@@ -42,12 +120,68 @@ class TestTweetParser:
         result = TweetParser.parse_url("https://x.com/sama/status/1234567890?s=20&t=abc")
         assert result == ("sama", "1234567890")
 
+    def test_parse_fx_url(self):
+        """fxtwitter URLをパース"""
+        result = TweetParser.parse_url("https://fxtwitter.com/sama/status/7777")
+        assert result == ("sama", "7777")
+
+    def test_parse_url_cached(self):
+        """同じURLの再解析はキャッシュから返す"""
+        url = "https://x.com/cache_test/status/4242"
+        TweetParser.parse_url(url)
+        hits = _parse_url_cached.cache_info().hits
+        assert TweetParser.parse_url(f"  {url} ") == ("cache_test", "4242")
+        assert _parse_url_cached.cache_info().hits == hits + 1
+
+    def test_from_url_reuses_parse_cache(self):
+        """from_url の再インポートはURL解析をキャッシュから引き、ParsedTweet は毎回新規に作る"""
+        url = "https://x.com/reimport/status/5151?s=20"
+        first = TweetParser.from_url(url, memo="a")
+        hits = _parse_url_cached.cache_info().hits
+        second = TweetParser.from_url(url, memo="b")
+        assert _parse_url_cached.cache_info().hits == hits + 1
+        assert second is not first
+        assert (second.tweet_id, second.url, second.memo) == ("5151", first.url, "b")
+
+    def test_parse_non_url_skips_parse(self):
+        """URLでない入力はキャッシュ・URL解析を通らない"""
+        before = _parse_url_cached.cache_info()
+        assert TweetParser.parse_url("ftp://x.com/a/status/1") is None
+        assert TweetParser.parse_url("https://x.com/sama") is None
+        after = _parse_url_cached.cache_info()
+        assert (after.hits, after.misses) == (before.hits, before.misses)
+
+    def test_parse_url_host_table(self):
+        """ホスト表で判定（www・大文字・ポート・後続パスも可、類似ドメインは不可）"""
+        assert TweetParser.parse_url("https://www.x.com/a_b/status/9") == ("a_b", "9")
+        assert TweetParser.parse_url("https://X.com:443/sama/status/1/photo/1") == ("sama", "1")
+        assert TweetParser.parse_url("https://x.com.evil.example/sama/status/1") is None
+        assert TweetParser.parse_url("https://evil.example/x.com/sama/status/1") is None
+        assert TweetParser.parse_url("https://x.com/sama/status/abc") is None
+
     def test_parse_invalid_url(self):
         """無効なURLはNone"""
         assert TweetParser.parse_url("https://google.com") is None
         assert TweetParser.parse_url("not a url") is None
         assert TweetParser.parse_url("") is None
 
+    def test_parse_url_interns_username(self):
+        """同じアカウントのユーザー名は同一オブジェクトを共有"""
+        a = TweetParser.parse_url("https://x.com/interned_user/status/101")
+        b = TweetParser.parse_url("https://twitter.com/interned_user/status/102")
+        assert a[0] is b[0]
+
+    def test_parse_urls_batch(self):
+        """一括解析は parse_url と同じ結果を同じ順序で返す"""
+        urls = [
+            " https://x.com/sama/status/1 ",
+            "https://google.com",
+            "not a url",
+            "https://fxtwitter.com/karpathy/status/2?s=20",
+        ]
+        assert TweetParser.parse_urls_batch(urls) == [TweetParser.parse_url(u) for u in urls]
+        assert TweetParser.parse_urls_batch(urls)[0] == ("sama", "1")
+
     def test_extract_tweet_id(self):
         """ツイートIDのみ抽出"""
         assert TweetParser.extract_tweet_id("https://x.com/sama/status/12345") == "12345"
@@ -58,6 +192,12 @@ class TestTweetParser:
         url = TweetParser.build_url("sama", "12345")
         assert url == "https://x.com/sama/status/12345"
 
+    def test_build_url_cached(self):
+        """同じ組み合わせのURLはキャッシュから同一オブジェクトを返す"""
+        first = TweetParser.build_url("cache_user", "777")
+        assert TweetParser.build_url("cache_user", "777") is first
+        assert TweetParser.build_url.cache_info().hits >= 1
+
     def test_from_url(self):
         """URLからParsedTweet生成"""
         tweet = TweetParser.from_url("https://x.com/sama/status/12345", text="hello")
@@ -67,6 +207,13 @@ class TestTweetParser:
         assert tweet.source == "manual"
         assert tweet.collected_at
 
+    def test_from_parts_matches_from_url(self):
+        """from_parts は URL解析なしで from_url と同じ ParsedTweet を作る"""
+        via_url = TweetParser.from_url("https://x.com/sama/status/12345", text="hello", memo="m")
+        direct = TweetParser.from_parts("sama", "12345", text="hello", memo="m")
+        direct.collected_at = via_url.collected_at
+        assert direct == via_url
+
     def test_from_url_invalid(self):
         """無効URLでValueError"""
         with pytest.raises(ValueError):
@@ -108,6 +255,20 @@ class TestTweetParser:
         tweet = TweetParser.from_api_data(data)
         assert tweet.text == "Hello world"
 
+    def test_from_api_data_counts(self):
+        """件数フィールドの欠損・None は0、v2 の like_count も対応"""
+        data = {
+            "id_str": "1",
+            "author": {"username": "v2user"},
+            "like_count": 42,
+            "retweet_count": None,
+            "quote_count": "3",
+        }
+        tweet = TweetParser.from_api_data(data)
+        assert tweet.likes == 42
+        assert (tweet.retweets, tweet.replies, tweet.quotes, tweet.bookmarks) == (0, 0, 3, 0)
+        assert tweet.url == "https://x.com/v2user/status/1"
+
     def test_is_valid_tweet_url(self):
         """URL妥当性チェック"""
         assert is_valid_tweet_url("https://x.com/sama/status/12345")
@@ -147,6 +308,23 @@ class TestParsedTweet:
         assert restored.text == original.text
         assert restored.source == original.source
 
+    def test_to_dict_field_order(self):
+        """to_dict はフィールド定義順で全フィールドを出力"""
+        d = ParsedTweet(tweet_id="1").to_dict()
+        assert list(d) == [f.name for f in fields(ParsedTweet)]
+
+    def test_from_dict_ignores_unknown_keys(self):
+        """未知のキーは無視して復元"""
+        tweet = ParsedTweet.from_dict({"tweet_id": "1", "likes": 5, "legacy_key": "x"})
+        assert tweet.likes == 5
+
+    def test_slots(self):
+        """__slots__ 化されておりインスタンス辞書を持たない"""
+        tweet = ParsedTweet(tweet_id="1")
+        assert not hasattr(tweet, "__dict__")
+        with pytest.raises(AttributeError):
+            tweet.unknown_field = 1
+
 
 # ========================================
 # QueueManager Tests
@@ -190,6 +368,42 @@ class TestQueueManager:
         added = queue.add_batch(tweets)
         assert added == 2
 
+    def test_add_batch_schedules_hourly(self, queue, queue_dir):
+        """一括追加は1時間おきにスケジュールし、ジャーナル書き込みは1回"""
+        with patch.object(QueueManager, "_journal", wraps=queue._journal) as journal:
+            queue.add_batch([ParsedTweet(tweet_id=f"00{i}", author_username="t") for i in range(3)])
+        journal.assert_called_once()
+
+        times = [datetime.fromisoformat(i["scheduled_at"]) for i in queue.get_all_pending()]
+        assert [(b - a).total_seconds() for a, b in zip(times, times[1:])] == [3600, 3600]
+
+    def test_index_mutations_keep_order(self, queue):
+        """ID索引での更新・削除は追加順を保ち、未知IDはFalse"""
+        queue.add_batch([ParsedTweet(tweet_id=t, author_username="t") for t in ("c", "a", "b")])
+        assert queue._update_status("a", "approved") is True
+        assert queue.remove("c") is True
+        assert queue.remove("zzz") is False
+        assert queue._update_status("zzz", "approved") is False
+        assert [i["tweet_id"] for i in queue.get_all_pending()] == ["a", "b"]
+
+    def test_add_batch_approve(self, queue, tmp_path, monkeypatch):
+        """approve=True は追加分のみ承認済みで登録し、フィードバックを1回で記録"""
+        feedback_file = tmp_path / "feedback.json"
+        monkeypatch.setattr("src.collect.queue_manager.FEEDBACK_FILE", feedback_file)
+        queue.add(ParsedTweet(tweet_id="001", author_username="a"))
+
+        added = queue.add_batch(
+            [ParsedTweet(tweet_id="001", author_username="a"),
+             ParsedTweet(tweet_id="002", author_username="b")],
+            approve=True,
+        )
+
+        assert added == 1
+        statuses = {i["tweet_id"]: i["status"] for i in queue.get_all_pending()}
+        assert statuses == {"001": "pending", "002": "approved"}
+        stats = json.loads(feedback_file.read_text(encoding="utf-8"))["stats"]
+        assert stats["approved"] == 1
+
     def test_approve(self, queue):
         """承認"""
         tweet = ParsedTweet(tweet_id="001", author_username="sama")
@@ -251,35 +465,243 @@ class TestQueueManager:
         assert stats["approved"] == 1
         assert stats["skipped"] == 1
 
+    def test_apply_decisions(self, queue, tmp_path, monkeypatch):
+        """承認・スキップの一括反映（存在しないIDは無視）"""
+        feedback_file = tmp_path / "feedback.json"
+        monkeypatch.setattr("src.collect.queue_manager.FEEDBACK_FILE", feedback_file)
+        for i in range(3):
+            queue.add(ParsedTweet(tweet_id=f"00{i}", author_username="test"))
+
+        applied = queue.apply_decisions(
+            approvals=["000", "999"],
+            skips=[("001", "too_old")],
+        )
+        assert applied == {"approved": ["000"], "skipped": ["001"]}
+
+        items = {i["tweet_id"]: i for i in queue.get_all_pending()}
+        assert items["000"]["status"] == "approved"
+        assert items["001"]["status"] == "skipped"
+        assert items["001"]["skip_reason"] == "too_old"
+        assert items["002"]["status"] == "pending"
+
+        stats = json.loads(feedback_file.read_text(encoding="utf-8"))["stats"]
+        assert stats["total"] == 2
+        assert stats["by_reason"] == {"too_old": 1}
+
+    def test_stats_cached_until_files_change(self, queue):
+        """ファイルが変わらなければ stats() は再集計せず、変更後は最新の件数を返す"""
+        queue.add(ParsedTweet(tweet_id="001", author_username="a"))
+        assert queue.stats()["pending"] == 1
+
+        with patch.object(queue, "_status_counts", side_effect=AssertionError("再集計")):
+            assert queue.stats()["pending"] == 1
+
+        queue.approve("001")
+        queue.mark_posted("001", "999")
+        stats = queue.stats()
+        assert (stats["pending"], stats["approved"], stats["posted_total"]) == (0, 0, 1)
+
+    def test_change_token(self, queue):
+        """変更操作でトークンが変わり、読み取りだけでは変わらない"""
+        queue.add(ParsedTweet(tweet_id="001", author_username="a"))
+        token = queue.change_token()
+        queue.get_all_pending()
+        assert queue.change_token() == token
+        queue.approve("001")
+        assert queue.change_token() != token
+
+    def test_feedback_entries_appended(self, queue, tmp_path, monkeypatch):
+        """判断記録は JSONL に追記し、統計ファイルにはエントリを持たない（旧形式は移行）"""
+        feedback_file = tmp_path / "feedback.json"
+        monkeypatch.setattr("src.collect.queue_manager.FEEDBACK_FILE", feedback_file)
+        feedback_file.write_text(json.dumps({
+            "entries": [{"tweet_id": "old", "decision": "skipped"}],
+            "stats": {"total": 1, "approved": 0, "skipped": 1},
+        }), encoding="utf-8")
+        for i in range(2):
+            queue.add(ParsedTweet(tweet_id=f"00{i}", author_username="test"))
+
+        queue.approve("000")
+        queue.approve("001")
+
+        data = json.loads(feedback_file.read_text(encoding="utf-8"))
+        assert "entries" not in data
+        assert data["stats"]["total"] == 3
+        entries = queue.get_feedback_entries()
+        assert [e["tweet_id"] for e in entries] == ["old", "000", "001"]
+        assert len(feedback_file.with_suffix(".jsonl").read_text(encoding="utf-8").splitlines()) == 3
+
+    def test_mutations_append_to_journal(self, queue, queue_dir):
+        """変更はジャーナルに追記され、スナップショットは書き直さない"""
+        queue.add(ParsedTweet(tweet_id="001", author_username="a"))
+        queue.add(ParsedTweet(tweet_id="002", author_username="b"))
+        queue.approve("001")
+        queue.remove("002")
+
+        assert json.loads((queue_dir / "pending_tweets.json").read_text()) == []
+        journal = (queue_dir / "pending_tweets.journal.jsonl").read_text().splitlines()
+        assert len(journal) == 4
+
+        reopened = QueueManager(queue_dir=queue_dir)
+        items = reopened.get_all_pending()
+        assert [i["tweet_id"] for i in items] == ["001"]
+        assert items[0]["status"] == "approved"
+
+    def test_journal_truncated_line_ignored(self, queue, queue_dir):
+        """書き込み途中で途切れた末尾行は無視"""
+        queue.add(ParsedTweet(tweet_id="001", author_username="a"))
+        with open(queue_dir / "pending_tweets.journal.jsonl", "ab") as f:
+            f.write(b'{"op": "upsert", "item": {"tweet_')
+        assert [i["tweet_id"] for i in queue.get_all_pending()] == ["001"]
+
+    def test_append_after_truncated_line(self, queue, queue_dir):
+        """途切れた末尾行の後の追記は別の行になり、再読み込みで失われない"""
+        queue.add(ParsedTweet(tweet_id="001", author_username="a"))
+        with open(queue_dir / "pending_tweets.journal.jsonl", "ab") as f:
+            f.write(b'{"op": "upsert", "item": {"tweet_')
+        queue.approve("001")
+
+        reopened = QueueManager(queue_dir=queue_dir)
+        items = reopened.get_all_pending()
+        assert [i["tweet_id"] for i in items] == ["001"]
+        assert items[0]["status"] == "approved"
+
+    def test_compact(self, queue, queue_dir, monkeypatch):
+        """ジャーナルが閾値を超えるとスナップショットへ統合"""
+        monkeypatch.setattr("src.collect.queue_manager.COMPACT_RATIO", 0)
+        monkeypatch.setattr("src.collect.queue_manager.COMPACT_MIN_ENTRIES", 3)
+        for i in range(4):
+            queue.add(ParsedTweet(tweet_id=f"00{i}", author_username="t"))
+
+        assert not (queue_dir / "pending_tweets.journal.jsonl").exists()
+        snapshot = json.loads((queue_dir / "pending_tweets.json").read_text())
+        assert len(snapshot) == 4
+        assert len(queue.get_all_pending()) == 4
+
+    def test_index_cached_between_calls(self, queue):
+        """ファイルが変わっていなければ pending を再読込しない"""
+        queue.add(ParsedTweet(tweet_id="001", author_username="a"))
+        with patch.object(QueueManager, "_load", wraps=QueueManager._load) as load:
+            queue.get_pending()
+            queue.approve("001")
+            assert queue.get_approved()[0]["tweet_id"] == "001"
+        load.assert_not_called()
+
+    def test_index_cache_reloads_external_writes(self, queue, queue_dir):
+        """別インスタンスの書き込みは検知して読み直す"""
+        queue.add(ParsedTweet(tweet_id="001", author_username="a"))
+        queue.get_pending()
+        QueueManager(queue_dir=queue_dir).approve("001")
+        assert [i["tweet_id"] for i in queue.get_approved()] == ["001"]
+
+    def test_index_cache_isolated_from_callers(self, queue):
+        """取得したアイテムを書き換えてもキャッシュに影響しない"""
+        queue.add(ParsedTweet(tweet_id="001", author_username="a"))
+        queue.get_pending()[0]["status"] = "approved"
+        assert queue.get_pending()[0]["status"] == "pending"
+
+    def test_batch_defers_writes(self, queue, queue_dir):
+        """batch() 内の変更は終了時にまとめて書き込み、ブロック内の取得には反映済み"""
+        with patch.object(queue, "_journal", wraps=queue._journal) as journal, \
+                patch.object(queue, "_record_feedback_batch", wraps=queue._record_feedback_batch) as feedback:
+            with queue.batch():
+                queue.add(ParsedTweet(tweet_id="001", author_username="a"))
+                queue.add(ParsedTweet(tweet_id="002", author_username="b"))
+                queue.approve("001")
+                assert [i["tweet_id"] for i in queue.get_approved()] == ["001"]
+                journal.assert_not_called()
+        journal.assert_called_once()
+        assert feedback.call_count == 2  # approve 時の保留 + 終了時の書き込み
+        assert feedback.call_args[0][0][0][1] == "approved"
+
+        reloaded = QueueManager(queue_dir=queue_dir)
+        assert [i["tweet_id"] for i in reloaded.get_approved()] == ["001"]
+        assert [i["tweet_id"] for i in reloaded.get_pending()] == ["002"]
+
+    def test_batch_flushes_on_error(self, queue, queue_dir):
+        """例外で抜けてもそれまでの変更は書き込む"""
+        with pytest.raises(RuntimeError):
+            with queue.batch():
+                queue.add(ParsedTweet(tweet_id="001", author_username="a"))
+                raise RuntimeError
+        assert len(QueueManager(queue_dir=queue_dir).get_pending()) == 1
+
+    def test_mmap_backend_roundtrip(self, queue_dir):
+        """mmapバックエンド: 事前確保ファイルに書き込み、再オープン時に再適用"""
+        queue = QueueManager(queue_dir=queue_dir, backend="mmap")
+        queue.add(ParsedTweet(tweet_id="001", author_username="a"))
+        queue.add(ParsedTweet(tweet_id="002", author_username="b"))
+        queue.remove("002")
+
+        journal = queue_dir / "pending_tweets.journal.mmap"
+        assert journal.stat().st_size == 1 << 20
+        assert not (queue_dir / "pending_tweets.journal.jsonl").exists()
+
+        reopened = QueueManager(queue_dir=queue_dir, backend="mmap")
+        assert [i["tweet_id"] for i in reopened.get_all_pending()] == ["001"]
+
+    def test_mmap_backend_grows_by_chunk(self, queue_dir, monkeypatch):
+        """mmapジャーナルは容量不足時にチャンク単位で拡張"""
+        monkeypatch.setattr("src.collect.queue_manager.MMAP_CHUNK_SIZE", 256)
+        queue = QueueManager(queue_dir=queue_dir, backend="mmap")
+        for i in range(5):
+            queue.add(ParsedTweet(tweet_id=f"00{i}", author_username="t", text="x" * 100))
+
+        size = (queue_dir / "pending_tweets.journal.mmap").stat().st_size
+        assert size > 256 and size % 256 == 0
+        assert len(QueueManager(queue_dir=queue_dir, backend="mmap").get_all_pending()) == 5
+
+    def test_invalid_backend(self, queue_dir):
+        """未知のバックエンドはエラー"""
+        with pytest.raises(ValueError):
+            QueueManager(queue_dir=queue_dir, backend="sqlite")
+
 
 # ========================================
 # XAPIClient Tests
 # ========================================
 
+def _api_response(status_code: int = 200, payload: dict | None = None) -> SimpleNamespace:
+    """X API v2 の requests レスポンス（呼び出し検証は不要なので軽量オブジェクト）"""
+    return SimpleNamespace(status_code=status_code, text="", json=lambda: payload or {})
+
+
 class TestXAPIClient:
-    def test_init_no_token(self):
+    @pytest.fixture(autouse=True)
+    def mock_get(self):
+        """HTTP呼び出しはクラス全体で1つのモックに差し替え"""
+        with patch("src.collect.x_api_client.requests.get") as mock:
+            yield mock
+
+    @pytest.fixture(scope="class")
+    def client(self):
+        """クラス内で共有するクライアント"""
+        return XAPIClient(bearer_token="test")
+
+    @pytest.fixture(autouse=True)
+    def reset_client(self, client):
+        """テスト間でユーザーキャッシュを持ち越さない"""
+        client._user_cache.clear()
+
+    def test_init_no_token(self, monkeypatch):
         """Bearer Tokenなしで ValueError"""
-        with patch.dict("os.environ", {}, clear=True):
-            with pytest.raises(ValueError, match="TWITTER_BEARER_TOKEN"):
-                XAPIClient(bearer_token="")
+        monkeypatch.delenv("TWITTER_BEARER_TOKEN", raising=False)
+        with pytest.raises(ValueError, match="TWITTER_BEARER_TOKEN"):
+            XAPIClient(bearer_token="")
 
-    @patch("src.collect.x_api_client.tweepy.Client")
-    def test_init_with_token(self, mock_tweepy_cls):
+    def test_init_with_token(self):
         """Bearer Token指定で初期化"""
         client = XAPIClient(bearer_token="test_token_123")
         assert client.bearer_token == "test_token_123"
 
-    @patch("src.collect.x_api_client.tweepy.Client")
-    def test_init_from_env(self, mock_tweepy_cls):
+    def test_init_from_env(self):
         """環境変数からBearer Token取得"""
         with patch.dict("os.environ", {"TWITTER_BEARER_TOKEN": "env_token_456"}):
             client = XAPIClient()
             assert client.bearer_token == "env_token_456"
 
-    @patch("src.collect.x_api_client.tweepy.Client")
-    def test_build_search_query_accounts(self, mock_tweepy_cls):
-        """アカウント検索クエリ生成"""
-        client = XAPIClient(bearer_token="test")
+    def test_build_search_query_accounts(self, client):
+        """アカウント検索クエリ生成（min_faves は従量プランで使えないため含めない）"""
         query = client.build_search_query(
             accounts=["sama", "karpathy"],
             min_likes=1000,
@@ -287,27 +709,22 @@ class TestXAPIClient:
         )
         assert "from:sama" in query
         assert "from:karpathy" in query
-        assert "min_faves:1000" in query
+        assert "min_faves" not in query
         assert "lang:en" in query
         assert "-is:reply" in query
         assert "-is:retweet" in query
 
-    @patch("src.collect.x_api_client.tweepy.Client")
-    def test_build_search_query_keywords(self, mock_tweepy_cls):
+    def test_build_search_query_keywords(self, client):
         """キーワード検索クエリ生成"""
-        client = XAPIClient(bearer_token="test")
         query = client.build_search_query(
             keywords=["AI agent", "LLM"],
             min_likes=500,
         )
         assert '"AI agent"' in query
         assert "LLM" in query
-        assert "min_faves:500" in query
 
-    @patch("src.collect.x_api_client.tweepy.Client")
-    def test_build_search_query_keywords_ignored_when_accounts(self, mock_tweepy_cls):
+    def test_build_search_query_keywords_ignored_when_accounts(self, client):
         """アカウント指定時はキーワード無視"""
-        client = XAPIClient(bearer_token="test")
         query = client.build_search_query(
             accounts=["sama"],
             keywords=["AI"],
@@ -316,96 +733,106 @@ class TestXAPIClient:
         assert "from:sama" in query
         assert "AI" not in query  # keywords should be ignored
 
-    @patch("src.collect.x_api_client.tweepy.Client")
-    def test_search_tweets_success(self, mock_tweepy_cls):
-        """検索成功"""
-        mock_tweepy = MagicMock()
-        mock_tweepy_cls.return_value = mock_tweepy
-
-        # tweepy.Tweet モックを作成
-        mock_tweet1 = MagicMock()
-        mock_tweet1.id = 1
-        mock_tweet1.text = "tweet 1"
-        mock_tweet1.public_metrics = {"like_count": 100, "retweet_count": 10, "reply_count": 5, "quote_count": 2}
-        mock_tweet1.author_id = "111"
-        mock_tweet1.lang = "en"
-        mock_tweet1.created_at = None
-
-        mock_tweet2 = MagicMock()
-        mock_tweet2.id = 2
-        mock_tweet2.text = "tweet 2"
-        mock_tweet2.public_metrics = {"like_count": 200, "retweet_count": 20, "reply_count": 10, "quote_count": 5}
-        mock_tweet2.author_id = "222"
-        mock_tweet2.lang = "en"
-        mock_tweet2.created_at = None
-
-        mock_user1 = MagicMock()
-        mock_user1.id = 111
-        mock_user1.username = "user_a"
-        mock_user1.name = "User A"
-
-        mock_user2 = MagicMock()
-        mock_user2.id = 222
-        mock_user2.username = "user_b"
-        mock_user2.name = "User B"
-
-        mock_response = MagicMock()
-        mock_response.data = [mock_tweet1, mock_tweet2]
-        mock_response.includes = {"users": [mock_user1, mock_user2]}
-        mock_tweepy.search_recent_tweets.return_value = mock_response
-
-        client = XAPIClient(bearer_token="test")
+    def test_search_tweets_success(self, mock_get, client):
+        """検索成功（includes のユーザー情報で著者を補完）"""
+        mock_get.return_value = _api_response(200, {
+            "data": [
+                {"id": "1", "text": "tweet 1", "author_id": "111", "lang": "en",
+                 "public_metrics": {"like_count": 100, "retweet_count": 10}},
+                {"id": "2", "text": "tweet 2", "author_id": "222", "lang": "en",
+                 "public_metrics": {"like_count": 200, "retweet_count": 20}},
+            ],
+            "includes": {"users": [
+                {"id": "111", "username": "user_a", "name": "User A"},
+                {"id": "222", "username": "user_b", "name": "User B"},
+            ]},
+        })
+
         tweets = client.search_tweets("from:sama", max_results=10)
         assert len(tweets) == 2
         assert tweets[0]["text"] == "tweet 1"
         assert tweets[1]["text"] == "tweet 2"
+        assert tweets[1]["user"]["screen_name"] == "user_b"
+        assert tweets[1]["favorite_count"] == 200
 
-    @patch("src.collect.x_api_client.tweepy.Client")
-    def test_search_tweets_rate_limit(self, mock_tweepy_cls):
+    def test_search_tweets_rate_limit(self, mock_get, client):
         """レート制限エラー"""
-        import tweepy
-        mock_tweepy = MagicMock()
-        mock_tweepy_cls.return_value = mock_tweepy
-        mock_tweepy.search_recent_tweets.side_effect = tweepy.errors.TooManyRequests(
-            MagicMock(status_code=429)
-        )
+        mock_get.return_value = _api_response(429)
 
-        client = XAPIClient(bearer_token="test")
         with pytest.raises(XAPIError) as exc_info:
             client.search_tweets("from:sama")
         assert exc_info.value.status_code == 429
 
-    @patch("src.collect.x_api_client.tweepy.Client")
-    def test_search_tweets_auth_error(self, mock_tweepy_cls):
+    def test_search_tweets_auth_error(self, mock_get, client):
         """認証エラー"""
-        import tweepy
-        mock_tweepy = MagicMock()
-        mock_tweepy_cls.return_value = mock_tweepy
-        mock_tweepy.search_recent_tweets.side_effect = tweepy.errors.Unauthorized(
-            MagicMock(status_code=401)
-        )
+        mock_get.return_value = _api_response(401)
 
-        client = XAPIClient(bearer_token="test")
         with pytest.raises(XAPIError) as exc_info:
             client.search_tweets("from:sama")
         assert exc_info.value.status_code == 401
 
 
+# ========================================
+# SocialDataClient Tests
+# ========================================
+
+class TestSocialDataClient:
+    def test_build_search_query_full(self):
+        """全フィルタ指定時のクエリ"""
+        client = SocialDataClient(api_key="test")
+        query = client.build_search_query(
+            keywords=["AI agent", "LLM"], min_faves=500, min_retweets=10, lang="ja",
+        )
+        assert query == (
+            '("AI agent" OR LLM) min_faves:500 min_retweets:10 lang:ja '
+            "-filter:replies -filter:retweets"
+        )
+
+    def test_build_search_query_single_exclude(self):
+        """除外フィルタを片方だけ指定"""
+        client = SocialDataClient(api_key="test")
+        assert client.build_search_query(lang="", exclude_replies=False) == "-filter:retweets"
+        assert client.build_search_query(lang="", exclude_retweets=False) == "-filter:replies"
+        assert client.build_search_query(
+            lang="", exclude_replies=False, exclude_retweets=False,
+        ) == ""
+
+    def test_session_shared_across_instances(self):
+        """接続プール付きSessionを全インスタンスで共有"""
+        with patch.object(sd, "_session", None):
+            a = SocialDataClient(api_key="a")
+            b = SocialDataClient(api_key="b")
+            assert a.session is b.session
+            adapter = a.session.get_adapter("https://api.socialdata.tools")
+            assert adapter.max_retries.total == 3
+            assert 429 in adapter.max_retries.status_forcelist
+
+    def test_fetch_page_uses_session(self):
+        """_fetch_pageは共有Sessionで認証ヘッダー付きリクエスト"""
+        client = SocialDataClient(api_key="key123")
+        client.session = MagicMock()
+        resp = client.session.get.return_value
+        resp.status_code = 200
+        resp.json.return_value = {"tweets": [{"id_str": "1"}], "next_cursor": None}
+
+        tweets, cursor = client._fetch_page("AI", "Top", None)
+
+        assert tweets == [{"id_str": "1"}]
+        assert cursor is None
+        headers = client.session.get.call_args.kwargs["headers"]
+        assert headers["Authorization"] == "Bearer key123"
+
+
 # ========================================
 # AutoCollector Tests
 # ========================================
 
 class TestAutoCollector:
-    @patch("src.collect.auto_collector.XAPIClient")
-    def test_collect_dry_run(self, mock_client_cls, queue):
+    def test_collect_dry_run(self, queue):
         """ドライラン収集"""
-        from datetime import datetime, timezone
         mock_client = MagicMock()
-        mock_client_cls.return_value = mock_client
 
-        # 動的に「1時間前」の日時を生成
-        recent = datetime.now(timezone.utc)
-        created_at_str = recent.strftime("%a %b %d %H:%M:%S %z %Y")
+        created_at_str = _recent_created_at(int(time.time() // 60))
 
         mock_client.build_search_query.return_value = "from:sama min_faves:500"
         mock_client.search_tweets.return_value = [
@@ -420,15 +847,7 @@ class TestAutoCollector:
             },
         ]
 
-        from src.collect.auto_collector import AutoCollector
-        from src.collect.preference_scorer import PreferenceScorer
-        collector = AutoCollector.__new__(AutoCollector)
-        collector.client = mock_client
-        collector.queue = queue
-        collector.target_accounts = [{"username": "sama", "priority": "high"}]
-        collector.keywords = []
-        collector.buzz_thresholds = {"likes_min": 500, "lang": ["en"], "age_max_hours": 48}
-        collector.preference_scorer = PreferenceScorer()
+        collector = _make_collector(mock_client, queue, [{"username": "sama", "priority": "high"}])
 
         result = collector.collect(dry_run=True)
 
@@ -438,16 +857,11 @@ class TestAutoCollector:
         # dry_runなのでキューには追加されない
         assert len(queue.get_pending()) == 0
 
-    @patch("src.collect.auto_collector.XAPIClient")
-    def test_collect_with_auto_approve(self, mock_client_cls, queue):
+    def test_collect_with_auto_approve(self, queue):
         """自動承認付き収集"""
-        from datetime import datetime, timezone
         mock_client = MagicMock()
-        mock_client_cls.return_value = mock_client
 
-        # 動的に「1時間前」の日時を生成
-        recent = datetime.now(timezone.utc)
-        created_at_str = recent.strftime("%a %b %d %H:%M:%S %z %Y")
+        created_at_str = _recent_created_at(int(time.time() // 60))
 
         mock_client.build_search_query.return_value = "from:sama min_faves:500"
         mock_client.search_tweets.return_value = [
@@ -462,83 +876,27 @@ class TestAutoCollector:
             },
         ]
 
-        from src.collect.auto_collector import AutoCollector
-        from src.collect.preference_scorer import PreferenceScorer
-        collector = AutoCollector.__new__(AutoCollector)
-        collector.client = mock_client
-        collector.queue = queue
-        collector.target_accounts = [{"username": "karpathy", "priority": "high"}]
-        collector.keywords = []
-        collector.buzz_thresholds = {"likes_min": 500, "lang": ["en"], "age_max_hours": 48}
-        collector.preference_scorer = PreferenceScorer()
+        collector = _make_collector(mock_client, queue, [{"username": "karpathy", "priority": "high"}])
 
         result = collector.collect(auto_approve=True)
 
         assert result["added"] == 1
         assert len(queue.get_approved()) == 1
 
-    @patch("src.collect.auto_collector.XAPIClient")
-    def test_collect_filters_replies(self, mock_client_cls, queue):
-        """リプライはフィルタされる"""
-        mock_client = MagicMock()
-        mock_client_cls.return_value = mock_client
-
-        mock_client.build_search_query.return_value = "from:sama"
-        mock_client.search_tweets.return_value = [
-            {
-                "id": 11111,
-                "full_text": "This is a reply",
-                "user": {"screen_name": "test"},
-                "favorite_count": 50000,
-                "lang": "en",
-                "in_reply_to_status_id": "99999",
-                "created_at": "Thu Feb 18 02:14:30 +0000 2026",
-            },
-        ]
-
-        from src.collect.auto_collector import AutoCollector
-        collector = AutoCollector.__new__(AutoCollector)
-        collector.client = mock_client
-        collector.queue = queue
-        collector.target_accounts = [{"username": "test", "priority": "medium"}]
-        collector.keywords = []
-        collector.buzz_thresholds = {"likes_min": 500, "lang": ["en"], "age_max_hours": 48}
-
-        result = collector.collect()
-        assert result["filtered"] == 0
-
-    @patch("src.collect.auto_collector.XAPIClient")
-    def test_collect_filters_retweets(self, mock_client_cls, queue):
-        """RTはフィルタされる"""
+    @pytest.mark.parametrize("tweet_payload", [REPLY, RT], ids=["reply", "retweet"])
+    def test_collect_filters_replies_and_retweets(self, queue, tweet_payload):
+        """リプライ・RTはフィルタされる"""
         mock_client = MagicMock()
-        mock_client_cls.return_value = mock_client
-
         mock_client.build_search_query.return_value = "from:test"
-        mock_client.search_tweets.return_value = [
-            {
-                "id": 22222,
-                "full_text": "RT @someone: Original tweet",
-                "user": {"screen_name": "test"},
-                "favorite_count": 50000,
-                "lang": "en",
-                "created_at": "Thu Feb 18 02:14:30 +0000 2026",
-            },
-        ]
-
-        from src.collect.auto_collector import AutoCollector
-        collector = AutoCollector.__new__(AutoCollector)
-        collector.client = mock_client
-        collector.queue = queue
-        collector.target_accounts = [{"username": "test", "priority": "medium"}]
-        collector.keywords = []
-        collector.buzz_thresholds = {"likes_min": 500, "lang": ["en"], "age_max_hours": 48}
+        mock_client.search_tweets.return_value = [tweet_payload]
 
+        collector = _make_collector(mock_client, queue, [{"username": "test", "priority": "medium"}])
         result = collector.collect()
+        assert result["fetched"] == 1
         assert result["filtered"] == 0
 
     def test_format_result(self, queue):
         """結果フォーマット"""
-        from src.collect.auto_collector import AutoCollector
         collector = AutoCollector.__new__(AutoCollector)
         collector.queue = queue
 
@@ -556,3 +914,50 @@ class TestAutoCollector:
         assert "10" in formatted
         assert "8" in formatted
         assert "sama" in formatted
+
+    def test_parse_created_at_formats(self):
+        """SocialData / X API 両形式の日時をUTCでパース"""
+
+        expected = datetime(2026, 3, 5, 12, 34, 56, tzinfo=timezone.utc)
+        assert AutoCollector._parse_created_at("Thu Mar 05 12:34:56 +0000 2026") == expected
+        assert AutoCollector._parse_created_at(" 2026-03-05T12:34:56Z ") == expected
+        assert AutoCollector._parse_created_at("2026-03-05T12:34:56.000000Z") == expected
+        assert AutoCollector._parse_created_at("not a date") is None
+        assert AutoCollector._parse_created_at("") is None
+
+    def test_tw_fmt_matches_x_api_format(self):
+        """テスト用整形ヘルパーはパーサーと往復できる"""
+        dt = datetime(2026, 3, 5, 12, 34, 56, tzinfo=timezone.utc)
+        assert _tw_fmt(dt) == "Thu Mar 05 12:34:56 +0000 2026"
+        assert AutoCollector._parse_created_at(_tw_fmt(dt)) == dt
+
+    def test_parse_created_at_cached(self):
+        """同じ日時文字列の再パースはキャッシュから返す"""
+
+        value = "Fri Mar 06 01:02:03 +0000 2026"
+        first = AutoCollector._parse_created_at(value)
+        hits = _parse_timestamp.cache_info().hits
+        assert AutoCollector._parse_created_at(value) is first
+        assert _parse_timestamp.cache_info().hits == hits + 1
+
+    def test_parse_and_score_skips_blocked(self):
+        """ブロック対象はスコアリング前に除外し、件数を返す"""
+        collector = AutoCollector.__new__(AutoCollector)
+        collector.preference_scorer = MagicMock()
+        collector.preference_scorer.is_account_blocked.side_effect = lambda u: u == "spam"
+        collector.preference_scorer.score.return_value = {
+            "preference_score": 2.0, "matched_topics": ["ai"], "matched_keywords": [],
+        }
+
+        tweets, blocked = collector._parse_and_score(
+            [
+                {"id_str": "1", "user": {"screen_name": "good"}, "full_text": "a"},
+                {"id_str": "2", "user": {"screen_name": "spam"}, "full_text": "b"},
+            ],
+            "socialdata",
+        )
+
+        assert [t.tweet_id for t in tweets] == ["1"]
+        assert blocked == 1
+        assert tweets[0].matched_topics == ["ai"]
+        collector.preference_scorer.score.assert_called_once()
@@ -2,13 +2,15 @@
 テスト — Discord通知（全メソッド）
 """
 import pytest
-from unittest.mock import patch, MagicMock
+import responses
 from dataclasses import dataclass
 
 from src.notify.discord_notifier import DiscordNotifier
 
+WEBHOOK_URL = "https://discord.com/api/webhooks/fake/token"
 
-@dataclass
+
+@dataclass(slots=True)
 class MockScoreResult:
     total: int = 7
     rank: str = "A"
@@ -20,42 +22,43 @@ class MockScoreResult:
     penalty: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class MockSafetyResult:
     is_safe: bool = True
-    violations: list = None
-    warnings: list = None
-
-    def __post_init__(self):
-        self.violations = self.violations or []
-        self.warnings = self.warnings or []
+    # 既定は共有の空タプル（構築ごとにリストを作らない）
+    violations: tuple = ()
+    warnings: tuple = ()
 
 
 class TestDiscordNotifier:
     """Discord通知のテスト"""
 
-    @pytest.fixture
+    @pytest.fixture(autouse=True)
+    def webhook(self):
+        """Webhook URL を responses に登録（既定は 204 成功。requests の送信経路はそのまま通す）"""
+        with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+            rsps.add(responses.POST, WEBHOOK_URL, status=204)
+            yield rsps
+
+    @pytest.fixture(scope="class")
     def notifier(self):
-        return DiscordNotifier("https://discord.com/api/webhooks/fake/token")
+        """URLのみを保持するステートレスな通知クライアント（クラス内で共有）"""
+        return DiscordNotifier(WEBHOOK_URL)
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def notifier_no_url(self):
         return DiscordNotifier("")
 
     # === 基本送信 ===
 
-    @patch("src.notify.discord_notifier.requests.post")
-    def test_send_success(self, mock_post, notifier):
+    def test_send_success(self, webhook, notifier):
         """正常送信"""
-        mock_post.return_value = MagicMock(status_code=204)
         result = notifier.send(content="test message")
         assert result is True
-        mock_post.assert_called_once()
+        assert len(webhook.calls) == 1
 
-    @patch("src.notify.discord_notifier.requests.post")
-    def test_send_with_embeds(self, mock_post, notifier):
+    def test_send_with_embeds(self, notifier):
         """Embed付き送信"""
-        mock_post.return_value = MagicMock(status_code=204)
         embeds = [{"title": "Test", "color": 0x00FF00}]
         result = notifier.send(embeds=embeds)
         assert result is True
@@ -65,19 +68,22 @@ class TestDiscordNotifier:
         result = notifier_no_url.send(content="test")
         assert result is False
 
-    @patch("src.notify.discord_notifier.requests.post")
-    def test_send_error(self, mock_post, notifier):
+    def test_send_error(self, webhook, notifier):
         """送信エラー"""
-        mock_post.side_effect = Exception("Network error")
+        webhook.replace(responses.POST, WEBHOOK_URL, body=ConnectionError("Network error"))
+        result = notifier.send(content="test")
+        assert result is False
+
+    def test_send_http_error(self, webhook, notifier):
+        """HTTPエラーステータスは失敗扱い"""
+        webhook.replace(responses.POST, WEBHOOK_URL, status=500)
         result = notifier.send(content="test")
         assert result is False
 
     # === notify_daily_posts ===
 
-    @patch("src.notify.discord_notifier.requests.post")
-    def test_notify_daily_posts(self, mock_post, notifier):
+    def test_notify_daily_posts(self, notifier):
         """日次投稿案通知"""
-        mock_post.return_value = MagicMock(status_code=204)
         posts = [
             {
                 "text": "テスト投稿1",
@@ -97,57 +103,28 @@ class TestDiscordNotifier:
         result = notifier.notify_daily_posts("テストアカウント", "@test_handle", posts)
         assert result is True
 
-    # === notify_post_completed ===
-
-    @patch("src.notify.discord_notifier.requests.post")
-    def test_notify_post_completed(self, mock_post, notifier):
-        mock_post.return_value = MagicMock(status_code=204)
-        result = notifier.notify_post_completed("テスト", "テスト投稿です", "1234567890")
-        assert result is True
-
-    # === notify_safety_alert ===
-
-    @patch("src.notify.discord_notifier.requests.post")
-    def test_notify_safety_alert(self, mock_post, notifier):
-        mock_post.return_value = MagicMock(status_code=204)
-        result = notifier.notify_safety_alert("テスト", "NGワード含む投稿", ["NGワード検出: 不労所得"])
-        assert result is True
-
-    # === notify_metrics ===
+    # === 単発通知（post_completed / safety_alert / metrics / error / weekly_report） ===
 
-    @patch("src.notify.discord_notifier.requests.post")
-    def test_notify_metrics(self, mock_post, notifier):
-        mock_post.return_value = MagicMock(status_code=204)
-        metrics = {
+    @pytest.mark.parametrize("method,args", [
+        ("notify_post_completed", ("テスト", "テスト投稿です", "1234567890")),
+        ("notify_safety_alert", ("テスト", "NGワード含む投稿", ["NGワード検出: 不労所得"])),
+        ("notify_metrics", ("テスト", {
             "followers": 1200,
             "avg_likes": 45,
             "avg_retweets": 12,
             "engagement_rate": 3.5,
-        }
-        result = notifier.notify_metrics("テスト", metrics)
-        assert result is True
-
-    # === notify_error ===
-
-    @patch("src.notify.discord_notifier.requests.post")
-    def test_notify_error(self, mock_post, notifier):
-        mock_post.return_value = MagicMock(status_code=204)
-        result = notifier.notify_error("API Error", "Connection timeout")
-        assert result is True
-
-    # === notify_weekly_report ===
-
-    @patch("src.notify.discord_notifier.requests.post")
-    def test_notify_weekly_report(self, mock_post, notifier):
-        mock_post.return_value = MagicMock(status_code=204)
-        result = notifier.notify_weekly_report("テスト", "週次レポート内容: フォロワー+50, エンゲージメント率3.2%")
-        assert result is True
+        })),
+        ("notify_error", ("API Error", "Connection timeout")),
+        ("notify_weekly_report", ("テスト", "週次レポート内容: フォロワー+50, エンゲージメント率3.2%")),
+    ])
+    def test_notify_oneshot(self, webhook, notifier, method, args):
+        """単発通知は1回送信してTrueを返す"""
+        assert getattr(notifier, method)(*args) is True
+        assert len(webhook.calls) == 1
 
     # === notify_curate_results ===
 
-    @patch("src.notify.discord_notifier.requests.post")
-    def test_notify_curate_results(self, mock_post, notifier):
-        mock_post.return_value = MagicMock(status_code=204)
+    def test_notify_curate_results(self, notifier):
         results = [
             {
                 "text": "引用RTコメント",
@@ -164,19 +141,15 @@ class TestDiscordNotifier:
         result = notifier.notify_curate_results("テスト", results, plan)
         assert result is True
 
-    @patch("src.notify.discord_notifier.requests.post")
-    def test_notify_curate_results_no_plan(self, mock_post, notifier):
+    def test_notify_curate_results_no_plan(self, notifier):
         """プランなしでも動作"""
-        mock_post.return_value = MagicMock(status_code=204)
         results = [{"text": "コメント", "template_id": "t1", "author_username": "u1", "original_text": "orig"}]
         result = notifier.notify_curate_results("テスト", results)
         assert result is True
 
     # === notify_collect_results ===
 
-    @patch("src.notify.discord_notifier.requests.post")
-    def test_notify_collect_results(self, mock_post, notifier):
-        mock_post.return_value = MagicMock(status_code=204)
+    def test_notify_collect_results(self, notifier):
         collect_result = {
             "fetched": 50,
             "filtered": 20,
@@ -186,10 +159,8 @@ class TestDiscordNotifier:
         result = notifier.notify_collect_results(collect_result)
         assert result is True
 
-    @patch("src.notify.discord_notifier.requests.post")
-    def test_notify_collect_results_with_tweets(self, mock_post, notifier):
+    def test_notify_collect_results_with_tweets(self, notifier):
         """ツイートリスト付き"""
-        mock_post.return_value = MagicMock(status_code=204)
 
         class FakeTweet:
             def __init__(self):
@@ -203,14 +174,12 @@ class TestDiscordNotifier:
 
     # === notify_queue_warning ===
 
-    @patch("src.notify.discord_notifier.requests.post")
-    def test_queue_warning_empty_queue(self, mock_post, notifier):
+    def test_queue_warning_empty_queue(self, webhook, notifier):
         """キュー空 → 警告送信"""
-        mock_post.return_value = MagicMock(status_code=204)
         stats = {"pending": 0, "approved": 0, "posted_today": 3}
         result = notifier.notify_queue_warning(stats)
         assert result is True
-        mock_post.assert_called_once()
+        assert len(webhook.calls) == 1
 
     def test_queue_warning_has_items(self, notifier):
         """キューに残量あり → 何もしない"""
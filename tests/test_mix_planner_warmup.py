@@ -1,6 +1,7 @@
 """
 テスト — MixPlanner ウォームアップスケジュール & get_slot_for_now
 """
+import random
 import pytest
 from datetime import datetime, timedelta
 from unittest.mock import patch
@@ -14,67 +15,43 @@ JST = ZoneInfo("Asia/Tokyo")
 class TestWarmupLimits:
     """ウォームアップスケジュールのテスト"""
 
-    def setup_method(self):
-        self.planner = MixPlanner()
+    @pytest.fixture(scope="class")
+    def planner(self):
+        return MixPlanner()
 
-    def test_no_start_date(self):
-        """開始日なし → 制限なし"""
-        limits = self.planner.get_warmup_limits("")
-        assert limits["daily_quotes"] == 99
-        assert limits["phase"] == "フル稼働"
+    @pytest.fixture(scope="class")
+    def today_jst(self):
+        return datetime.now(JST).date()
 
-    def test_week_0(self):
-        """開始1-3日目: 引用RTなし"""
-        today = datetime.now(JST).date()
-        start = (today - timedelta(days=1)).isoformat()
-        limits = self.planner.get_warmup_limits(start)
-        assert limits["phase"] == "week_0"
-        assert limits["daily_quotes"] == 0
-
-    def test_week_1(self):
-        """開始4-7日目: 引用RT1件/日"""
-        today = datetime.now(JST).date()
-        start = (today - timedelta(days=5)).isoformat()
-        limits = self.planner.get_warmup_limits(start)
-        assert limits["phase"] == "week_1"
-        assert limits["daily_quotes"] >= 1
-
-    def test_week_2(self):
-        """開始8-14日目: 引用RT2件/日"""
-        today = datetime.now(JST).date()
-        start = (today - timedelta(days=10)).isoformat()
-        limits = self.planner.get_warmup_limits(start)
-        assert limits["phase"] == "week_2"
-        assert limits["daily_quotes"] >= 2
-
-    def test_week_3(self):
-        """開始15-21日目"""
-        today = datetime.now(JST).date()
-        start = (today - timedelta(days=18)).isoformat()
-        limits = self.planner.get_warmup_limits(start)
-        assert limits["phase"] == "week_3"
-        assert limits["daily_quotes"] >= 3
-
-    def test_week_4_plus(self):
-        """開始22日以降: フル稼働"""
-        today = datetime.now(JST).date()
-        start = (today - timedelta(days=30)).isoformat()
-        limits = self.planner.get_warmup_limits(start)
-        assert limits["phase"] == "week_4+"
-        assert limits["daily_quotes"] >= 5
-
-    def test_invalid_date(self):
-        """無効な日付形式 → 制限なし"""
-        limits = self.planner.get_warmup_limits("invalid-date")
+    @pytest.mark.parametrize("bad", ["", "invalid-date"], ids=["no_start_date", "invalid_date"])
+    def test_unrestricted(self, planner, bad):
+        """開始日なし・無効な日付形式 → 制限なし"""
+        limits = planner.get_warmup_limits(bad)
         assert limits["daily_quotes"] == 99
         assert limits["phase"] == "フル稼働"
 
-    def test_warmup_limits_daily_plan(self):
+    @pytest.mark.parametrize("days,phase,min_quotes", [
+        (1, "week_0", 0),    # 開始1-3日目: 引用RTなし
+        (5, "week_1", 1),    # 開始4-7日目: 引用RT1件/日
+        (10, "week_2", 2),   # 開始8-14日目: 引用RT2件/日
+        (18, "week_3", 3),   # 開始15-21日目
+        (30, "week_4+", 5),  # 開始22日以降: フル稼働
+    ])
+    def test_week_phases(self, planner, today_jst, days, phase, min_quotes):
+        """経過日数に応じたフェーズと引用RT上限"""
+        start = (today_jst - timedelta(days=days)).isoformat()
+        limits = planner.get_warmup_limits(start)
+        assert limits["phase"] == phase
+        if phase == "week_0":
+            assert limits["daily_quotes"] == 0
+        else:
+            assert limits["daily_quotes"] >= min_quotes
+
+    def test_warmup_limits_daily_plan(self, planner, today_jst):
         """ウォームアップ中はplan_dailyの投稿数が制限される"""
-        today = datetime.now(JST).date()
-        start = (today - timedelta(days=1)).isoformat()  # week_0
+        start = (today_jst - timedelta(days=1)).isoformat()  # week_0
 
-        plan = self.planner.plan_daily(
+        plan = planner.plan_daily(
             available_quotes=10,
             account_start_date=start,
         )
@@ -138,11 +115,9 @@ class TestSelectSlots:
         slots = self.planner._select_slots(7)
         assert len(slots) == 7
 
-    def test_slots_sorted_by_time(self):
-        """スロットが時間順"""
-        for _ in range(10):
-            slots = self.planner._select_slots(8)
-            for i in range(1, len(slots)):
-                prev = slots[i-1]["base_hour"] * 60 + slots[i-1]["base_minute"]
-                curr = slots[i]["base_hour"] * 60 + slots[i]["base_minute"]
-                assert curr >= prev
+    @pytest.mark.parametrize("seed", range(10))
+    def test_slots_sorted_by_time(self, seed):
+        """スロットが時間順（シードごとに異なる選択を検証）"""
+        slots = MixPlanner(rng=random.Random(seed))._select_slots(8)
+        times = [s["base_hour"] * 60 + s["base_minute"] for s in slots]
+        assert times == sorted(times)
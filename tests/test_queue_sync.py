@@ -1,40 +1,122 @@
 """
 テスト — QueueSync (キュー <-> スプレッドシート同期)
 
-SheetsClientはモック化してテスト。
+SheetsClientは FakeSheets スタブに差し替えてテスト。
 """
+import dataclasses
+import json
 import pytest
-from unittest.mock import MagicMock
 
 from src.collect.queue_manager import QueueManager
 from src.collect.tweet_parser import ParsedTweet
+from src.sheets import queue_sync
 from src.sheets.queue_sync import QueueSync
 
 
+_TEMPLATE = ParsedTweet(tweet_id="0", author_username="test_user", likes=1000, source="x_api_v2")
+
+
 def _make_tweet(tweet_id: str, username: str = "test_user") -> ParsedTweet:
-    return ParsedTweet(
-        tweet_id=tweet_id,
-        author_username=username,
-        text=f"Test tweet {tweet_id}",
-        likes=1000,
-        source="x_api_v2",
+    return dataclasses.replace(
+        _TEMPLATE, tweet_id=tweet_id, author_username=username, text=f"Test tweet {tweet_id}"
     )
 
 
+class _MemQueue(QueueManager):
+    """ディスクに触れない QueueManager（空状態の読み取りだけを行うテスト用）"""
+
+    def __init__(self):
+        self._pending = {}
+        self._version = 0
+
+    def change_token(self) -> str:
+        return str(self._version)
+
+    def _load_pending_index(self) -> dict[str, dict]:
+        return dict(self._pending)
+
+    def _journal(self, pending: dict[str, dict], entries: list[dict]):
+        self._pending = dict(pending)
+        self._version += 1
+
+    def _save_pending(self, pending: list[dict]):
+        self._pending = {item["tweet_id"]: item for item in pending}
+        self._version += 1
+
+
 @pytest.fixture
 def tmp_queue(tmp_path):
     return QueueManager(queue_dir=tmp_path)
 
 
+@pytest.fixture
+def mem_sync(mock_sheets):
+    """空キューの QueueSync（tmp_path を作らない）"""
+    return QueueSync(sheets=mock_sheets, queue=_MemQueue())
+
+
+class FakeSheets:
+    """SheetsClient の代替（返り値は属性で指定し、書き込みはリストに記録）"""
+
+    def __init__(self):
+        self.decisions = []
+        self.settings = {}
+        self.preferences = {}
+        self.key_value_sheets = {}
+        self.revision = ""  # Exception を入れると get_revision で送出
+        self.sync_state = {}
+        self.written = []
+        self.logs = []
+        self.dashboards = []
+        self.decision_reads = 0
+        self.settings_reads = 0
+        self.batch_writes = 0
+
+    def write_queue_items(self, items):
+        self.written.append(items)
+
+    def read_queue_decisions(self):
+        self.decision_reads += 1
+        return self.decisions
+
+    def append_collection_log(self, entry):
+        self.logs.append(entry)
+
+    def update_dashboard(self, dashboard):
+        self.dashboards.append(dashboard)
+
+    def write_queue_and_dashboard(self, items, dashboard):
+        self.batch_writes += 1
+        if items is not None:
+            self.written.append(items)
+        if dashboard is not None:
+            self.dashboards.append(dashboard)
+
+    def get_settings(self):
+        self.settings_reads += 1
+        return self.settings
+
+    def get_preferences(self):
+        return self.preferences
+
+    def get_key_value_sheets(self, names):
+        return self.key_value_sheets
+
+    def get_revision(self):
+        if isinstance(self.revision, Exception):
+            raise self.revision
+        return self.revision
+
+    def load_sync_state(self):
+        return dict(self.sync_state)
+
+    def save_sync_state(self, **values):
+        self.sync_state.update(values)
+
+
 @pytest.fixture
 def mock_sheets():
-    mock = MagicMock()
-    mock.write_queue_items = MagicMock()
-    mock.read_queue_decisions = MagicMock(return_value=[])
-    mock.append_collection_log = MagicMock()
-    mock.update_dashboard = MagicMock()
-    mock.get_settings = MagicMock(return_value={})
-    return mock
+    return FakeSheets()
 
 
 @pytest.fixture
@@ -46,28 +128,26 @@ def sync(mock_sheets, tmp_queue):
 # sync_to_sheet
 # ============================================================
 class TestSyncToSheet:
-    def test_empty_queue(self, sync, mock_sheets):
+    def test_empty_queue(self, mem_sync, mock_sheets):
         """空のキューで同期"""
-        result = sync.sync_to_sheet()
+        result = mem_sync.sync_to_sheet()
         assert result["synced"] == 0
-        mock_sheets.write_queue_items.assert_called_once_with([])
+        assert mock_sheets.written == [[]]
 
     def test_with_items(self, sync, mock_sheets, tmp_queue):
         """アイテムのあるキューを同期"""
-        tmp_queue.add(_make_tweet("111"))
-        tmp_queue.add(_make_tweet("222"))
+        tmp_queue.add_batch([_make_tweet("111"), _make_tweet("222")])
 
         result = sync.sync_to_sheet()
         assert result["synced"] == 2
         assert result["statuses"]["pending"] == 2
 
-        call_args = mock_sheets.write_queue_items.call_args[0][0]
-        assert len(call_args) == 2
+        written = mock_sheets.written[-1]
+        assert len(written) == 2
 
     def test_mixed_statuses(self, sync, mock_sheets, tmp_queue):
         """様々なステータスのアイテムを同期"""
-        tmp_queue.add(_make_tweet("111"))
-        tmp_queue.add(_make_tweet("222"))
+        tmp_queue.add_batch([_make_tweet("111"), _make_tweet("222")])
         tmp_queue.approve("222")
 
         result = sync.sync_to_sheet()
@@ -76,20 +156,58 @@ class TestSyncToSheet:
         assert result["statuses"]["approved"] == 1
 
 
+    def test_unchanged_queue_and_sheet_skips_write(self, sync, mock_sheets, tmp_queue):
+        """前回書き出し以降キューもシートも変わっていなければ書き出さない"""
+        tmp_queue.add(_make_tweet("111"))
+        mock_sheets.revision = "7"
+        sync.sync_to_sheet()
+        assert mock_sheets.sync_state["written_revision"] == "7"
+
+        result = sync.sync_to_sheet()
+        assert result["synced"] == 0
+        assert len(mock_sheets.written) == 1
+
+        # シート側が編集されていれば書き戻す
+        mock_sheets.revision = "8"
+        assert sync.sync_to_sheet()["synced"] == 1
+
+    def test_unchanged_queue_files_skip_loading(self, sync, mock_sheets, tmp_queue):
+        """キューのファイルが前回書き出し時のままなら、キューを読み込まずに判定する"""
+        tmp_queue.add_batch([_make_tweet("111"), _make_tweet("222")])
+        tmp_queue.approve("222")
+        mock_sheets.revision = "7"
+        sync.sync_to_sheet()
+        assert mock_sheets.sync_state["queue_token"] == tmp_queue.change_token()
+
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(tmp_queue, "get_all_pending", lambda: pytest.fail("キューを読み込んだ"))
+            result = sync.sync_to_sheet()
+        assert result == {"synced": 0, "statuses": {"pending": 1, "approved": 1}}
+
+    def test_changed_queue_rewrites(self, sync, mock_sheets, tmp_queue):
+        """キューが変わっていれば書き出す"""
+        tmp_queue.add(_make_tweet("111"))
+        mock_sheets.revision = "7"
+        sync.sync_to_sheet()
+
+        tmp_queue.add(_make_tweet("222"))
+        assert sync.sync_to_sheet()["synced"] == 2
+
+
 # ============================================================
 # sync_from_sheet
 # ============================================================
 class TestSyncFromSheet:
-    def test_no_decisions(self, sync, mock_sheets):
+    def test_no_decisions(self, mem_sync, mock_sheets):
         """変更なしの場合"""
-        result = sync.sync_from_sheet()
+        result = mem_sync.sync_from_sheet()
         assert result["approved"] == 0
         assert result["skipped"] == 0
 
     def test_approve_pending(self, sync, mock_sheets, tmp_queue):
         """pending -> approved"""
         tmp_queue.add(_make_tweet("111"))
-        mock_sheets.read_queue_decisions.return_value = [
+        mock_sheets.decisions = [
             {"row": 2, "status": "approved", "tweet_id": "111"}
         ]
 
@@ -103,7 +221,7 @@ class TestSyncFromSheet:
     def test_skip_pending(self, sync, mock_sheets, tmp_queue):
         """pending -> skipped"""
         tmp_queue.add(_make_tweet("111"))
-        mock_sheets.read_queue_decisions.return_value = [
+        mock_sheets.decisions = [
             {"row": 2, "status": "skipped", "tweet_id": "111"}
         ]
 
@@ -113,29 +231,27 @@ class TestSyncFromSheet:
     def test_unchanged(self, sync, mock_sheets, tmp_queue):
         """ステータスが変わっていない場合"""
         tmp_queue.add(_make_tweet("111"))
-        mock_sheets.read_queue_decisions.return_value = [
+        mock_sheets.decisions = [
             {"row": 2, "status": "pending", "tweet_id": "111"}
         ]
 
         result = sync.sync_from_sheet()
         assert result["unchanged"] == 1
 
-    def test_unknown_tweet_ignored(self, sync, mock_sheets):
+    def test_unknown_tweet_ignored(self, mem_sync, mock_sheets):
         """キューに存在しないtweet_idは無視"""
-        mock_sheets.read_queue_decisions.return_value = [
+        mock_sheets.decisions = [
             {"row": 2, "status": "approved", "tweet_id": "nonexistent"}
         ]
 
-        result = sync.sync_from_sheet()
+        result = mem_sync.sync_from_sheet()
         assert result["approved"] == 0
         assert result["unchanged"] == 0
 
     def test_mixed_decisions(self, sync, mock_sheets, tmp_queue):
         """承認・スキップ・変更なしが混在"""
-        tmp_queue.add(_make_tweet("111"))
-        tmp_queue.add(_make_tweet("222"))
-        tmp_queue.add(_make_tweet("333"))
-        mock_sheets.read_queue_decisions.return_value = [
+        tmp_queue.add_batch([_make_tweet("111"), _make_tweet("222"), _make_tweet("333")])
+        mock_sheets.decisions = [
             {"row": 2, "status": "approved", "tweet_id": "111"},
             {"row": 3, "status": "skipped", "tweet_id": "222"},
             {"row": 4, "status": "pending", "tweet_id": "333"},
@@ -150,7 +266,7 @@ class TestSyncFromSheet:
         """approved -> pending への逆方向変更は無視"""
         tmp_queue.add(_make_tweet("111"))
         tmp_queue.approve("111")
-        mock_sheets.read_queue_decisions.return_value = [
+        mock_sheets.decisions = [
             {"row": 2, "status": "pending", "tweet_id": "111"}
         ]
 
@@ -161,6 +277,43 @@ class TestSyncFromSheet:
         assert len(approved) == 1
 
 
+    def test_empty_queue_skips_sheet_read(self, mem_sync, mock_sheets):
+        """キューが空ならシートを読まない"""
+        mem_sync.sync_from_sheet()
+        assert mock_sheets.decision_reads == 0
+
+    def test_unchanged_revision_skips_sheet_read(self, sync, mock_sheets, tmp_queue):
+        """前回同期からリビジョンが変わっていなければシートを読まない"""
+        tmp_queue.add(_make_tweet("111"))
+        mock_sheets.revision = "42"
+        mock_sheets.sync_state = {"queue_revision": "42"}
+
+        result = sync.sync_from_sheet()
+        assert result["approved"] == 0
+        assert mock_sheets.decision_reads == 0
+
+        sync.sync_from_sheet(force=True)
+        assert mock_sheets.decision_reads == 1
+
+    def test_new_revision_recorded(self, sync, mock_sheets, tmp_queue):
+        """読み取り後に新しいリビジョンを保存"""
+        tmp_queue.add(_make_tweet("111"))
+        mock_sheets.revision = "43"
+        mock_sheets.sync_state = {"queue_revision": "42"}
+
+        sync.sync_from_sheet()
+        assert mock_sheets.decision_reads == 1
+        assert mock_sheets.sync_state["queue_revision"] == "43"
+
+    def test_revision_error_falls_back_to_read(self, sync, mock_sheets, tmp_queue):
+        """リビジョン取得に失敗しても通常通り読み取る"""
+        tmp_queue.add(_make_tweet("111"))
+        mock_sheets.revision = Exception("403")
+
+        sync.sync_from_sheet()
+        assert mock_sheets.decision_reads == 1
+
+
 # ============================================================
 # full_sync
 # ============================================================
@@ -168,18 +321,65 @@ class TestFullSync:
     def test_full_sync_flow(self, sync, mock_sheets, tmp_queue):
         """完全同期のフロー確認"""
         tmp_queue.add(_make_tweet("111"))
-        mock_sheets.read_queue_decisions.return_value = []
+        mock_sheets.decisions = []
 
         result = sync.full_sync()
         assert "from_sheet" in result
         assert "to_sheet" in result
         assert "dashboard" in result
-        mock_sheets.update_dashboard.assert_called_once()
+        # キュー書き出しとダッシュボード更新は1回の書き込みにまとめる
+        assert mock_sheets.batch_writes == 1
+        assert len(mock_sheets.written) == 1
+        assert len(mock_sheets.dashboards) == 1
+
+    def test_full_sync_unchanged_skips_write(self, sync, mock_sheets, tmp_queue):
+        """キューもダッシュボードも前回から変化がなければ書き込まない"""
+        tmp_queue.add(_make_tweet("111"))
+        mock_sheets.revision = "7"
+        sync.full_sync()
+        assert mock_sheets.sync_state["written_revision"] == "7"
+
+        result = sync.full_sync()
+        assert result["to_sheet"]["synced"] == 0
+        assert mock_sheets.batch_writes == 1
+
+    def test_edit_during_write_read_next_time(self, sync, mock_sheets, tmp_queue):
+        """書き込み直後（リビジョン取得前）のシート編集は次回の sync_from_sheet で読み取る"""
+        tmp_queue.add(_make_tweet("111"))
+        mock_sheets.revision = "7"
+        write = mock_sheets.write_queue_and_dashboard
+
+        def write_then_client_edits(items, dashboard):
+            write(items, dashboard)
+            # 書き込みとリビジョン取得の間にクライアントが承認した
+            mock_sheets.decisions = [{"tweet_id": "111", "status": "approved"}]
+            mock_sheets.revision = "9"
+
+        mock_sheets.write_queue_and_dashboard = write_then_client_edits
+        sync.full_sync()
+        assert mock_sheets.sync_state["written_revision"] == "9"
+        assert mock_sheets.sync_state["queue_revision"] == "7"
+
+        result = sync.sync_from_sheet()
+        assert result["approved"] == 1
+        assert [i["tweet_id"] for i in tmp_queue.get_approved()] == ["111"]
+
+    def test_full_sync_dashboard_only(self, sync, mock_sheets, tmp_queue):
+        """キューが変わらず統計だけ変わればダッシュボードのみ書き込む"""
+        tmp_queue.add(_make_tweet("111"))
+        mock_sheets.revision = "7"
+        sync.full_sync()
+
+        mock_sheets.sync_state["dashboard_hash"] = "stale"
+        sync.full_sync()
+        assert mock_sheets.batch_writes == 2
+        assert len(mock_sheets.written) == 1
+        assert len(mock_sheets.dashboards) == 2
 
     def test_full_sync_applies_decisions_first(self, sync, mock_sheets, tmp_queue):
         """full_syncはfrom_sheetを先に実行する"""
         tmp_queue.add(_make_tweet("111"))
-        mock_sheets.read_queue_decisions.return_value = [
+        mock_sheets.decisions = [
             {"row": 2, "status": "approved", "tweet_id": "111"}
         ]
 
@@ -200,7 +400,18 @@ class TestSyncDashboard:
         dashboard = sync.sync_dashboard()
         assert dashboard["pending"] == 1
         assert dashboard["last_collection"] == "—"
-        mock_sheets.update_dashboard.assert_called_once()
+        assert len(mock_sheets.dashboards) == 1
+
+    def test_unchanged_dashboard_skips_write(self, sync, mock_sheets, tmp_queue):
+        """統計が前回と同じならダッシュボードを書き込まない"""
+        tmp_queue.add(_make_tweet("111"))
+        sync.sync_dashboard()
+        sync.sync_dashboard()
+        assert len(mock_sheets.dashboards) == 1
+
+        tmp_queue.add(_make_tweet("222"))
+        assert sync.sync_dashboard()["pending"] == 2
+        assert len(mock_sheets.dashboards) == 2
 
     def test_dashboard_with_collection(self, sync, mock_sheets, tmp_queue):
         """収集結果ありのダッシュボード更新"""
@@ -213,12 +424,16 @@ class TestSyncDashboard:
 # sync_collection_log
 # ============================================================
 class TestSyncCollectionLog:
+    @pytest.fixture
+    def tmp_queue(self):
+        return _MemQueue()
+
     def test_log_appended(self, sync, mock_sheets):
         """収集ログが追記される"""
         result = {"fetched": 30, "filtered": 10, "added": 5, "skipped_dup": 2}
         sync.sync_collection_log(result)
-        mock_sheets.append_collection_log.assert_called_once()
-        call_arg = mock_sheets.append_collection_log.call_args[0][0]
+        assert len(mock_sheets.logs) == 1
+        call_arg = mock_sheets.logs[0]
         assert call_arg["fetched"] == 30
         assert call_arg["added"] == 5
 
@@ -227,6 +442,10 @@ class TestSyncCollectionLog:
 # read_settings
 # ============================================================
 class TestReadSettings:
+    @pytest.fixture
+    def tmp_queue(self):
+        return _MemQueue()
+
     def test_empty_settings(self, sync, mock_sheets):
         """空の設定"""
         settings = sync.read_settings()
@@ -234,7 +453,7 @@ class TestReadSettings:
 
     def test_int_conversion(self, sync, mock_sheets):
         """int型の変換"""
-        mock_sheets.get_settings.return_value = {
+        mock_sheets.settings = {
             "min_likes": "500", "max_tweets": "30"
         }
         settings = sync.read_settings()
@@ -243,22 +462,93 @@ class TestReadSettings:
 
     def test_bool_conversion(self, sync, mock_sheets):
         """bool型の変換"""
-        mock_sheets.get_settings.return_value = {"auto_approve": "true"}
+        mock_sheets.settings = {"auto_approve": "true"}
         settings = sync.read_settings()
         assert settings["auto_approve"] is True
 
-        mock_sheets.get_settings.return_value = {"auto_approve": "false"}
+        mock_sheets.settings = {"auto_approve": "false"}
         settings = sync.read_settings()
         assert settings["auto_approve"] is False
 
     def test_invalid_int_ignored(self, sync, mock_sheets):
         """不正なint値は無視"""
-        mock_sheets.get_settings.return_value = {"min_likes": "abc"}
+        mock_sheets.settings = {"min_likes": "abc"}
         settings = sync.read_settings()
         assert "min_likes" not in settings
 
+    def test_read_with_preferences(self, sync, mock_sheets):
+        """設定とプリファレンスを一括読み取り"""
+        mock_sheets.key_value_sheets = {
+            "設定": {"max_tweets": "30"},
+            "選定プリファレンス": {"weekly_focus": "agents"},
+        }
+        settings, prefs = sync.read_settings_and_preferences()
+        assert settings == {"max_tweets": 30}
+        assert prefs == {"weekly_focus": "agents"}
+        assert mock_sheets.settings_reads == 0
+
+    def test_parsed_settings_cached(self, sync, mock_sheets, monkeypatch):
+        """生の値が変わらなければ型変換を再実行しない"""
+        calls = []
+        parse = queue_sync._parse_settings
+        monkeypatch.setattr(queue_sync, "_parse_settings", lambda raw: calls.append(raw) or parse(raw))
+        mock_sheets.settings = {"min_likes": "500"}
+
+        first = sync.read_settings()
+        first["min_likes"] = 0  # 返り値の変更はキャッシュに影響しない
+        assert sync.read_settings() == {"min_likes": 500}
+        assert len(calls) == 1
+
+        sync.invalidate_settings_cache()
+        sync.read_settings()
+        assert len(calls) == 2
+
     def test_string_settings(self, sync, mock_sheets):
         """文字列設定の読み取り"""
-        mock_sheets.get_settings.return_value = {"mode": "semi_auto"}
+        mock_sheets.settings = {"mode": "semi_auto"}
         settings = sync.read_settings()
         assert settings["mode"] == "semi_auto"
+
+
+# ============================================================
+# sync_preferences
+# ============================================================
+class TestSyncPreferences:
+    @pytest.fixture
+    def prefs_path(self, tmp_path, monkeypatch):
+        (tmp_path / "config").mkdir()
+        monkeypatch.setattr("src.sheets.queue_sync.PROJECT_ROOT", tmp_path)
+        return tmp_path / "config" / "selection_preferences.json"
+
+    def test_maps_sheet_values(self, sync, mock_sheets, prefs_path):
+        """Sheetsの値がローカルJSONの構造にマッピングされる"""
+        mock_sheets.preferences = {
+            "focus_keywords": "agents, coding",
+            "min_likes_override": "abc",
+            "extra_keywords": "mcp",
+        }
+        result = sync.sync_preferences()
+        assert result["updated_keys"] == ["focus_keywords", "keyword:mcp"]
+
+        prefs = json.loads(prefs_path.read_text(encoding="utf-8"))
+        assert prefs["weekly_focus"]["focus_keywords"] == ["agents", "coding"]
+        assert prefs["keyword_weights"] == {"mcp": 2.0}
+        assert prefs["updated_by"] == "sheets_sync"
+
+    def test_update_leaves_no_backup(self, sync, mock_sheets, prefs_path):
+        """更新時も config/ に .bak を残さない（ディレクトリごとコミットされるため）"""
+        mock_sheets.preferences = {"weekly_focus": "AI agents"}
+        sync.sync_preferences()
+        mock_sheets.preferences = {"weekly_focus": "coding"}
+        sync.sync_preferences()
+        assert sorted(p.name for p in prefs_path.parent.iterdir()) == ["selection_preferences.json"]
+
+    def test_no_rewrite_when_unchanged(self, sync, mock_sheets, prefs_path):
+        """内容が変わらなければファイルを書き換えない"""
+        mock_sheets.preferences = {"weekly_focus": "AI agents"}
+        sync.sync_preferences()
+        mtime = prefs_path.stat().st_mtime_ns
+
+        sync.sync_preferences()
+        assert prefs_path.stat().st_mtime_ns == mtime
+        assert not prefs_path.with_suffix(".json.tmp").exists()
@@ -8,14 +8,9 @@
   - safety_checker: 引用RT固有の安全チェック
   - quote_generator: 引用RT投稿文生成（デモモード）
 """
-import json
 import pytest
-from pathlib import Path
 from unittest.mock import patch
 
-# プロジェクトルート
-PROJECT_ROOT = Path(__file__).parent.parent
-
 
 # ============================================================
 # tweet_parser テスト
@@ -104,10 +99,7 @@ class TestQueueManager:
 
     def _make_tweet(self, tweet_id="123", username="testuser", text="Test tweet"):
         from src.collect.tweet_parser import TweetParser
-        return TweetParser.from_url(
-            f"https://x.com/{username}/status/{tweet_id}",
-            text=text,
-        )
+        return TweetParser.from_parts(username, tweet_id, text=text)
 
     def test_add_tweet(self):
         tweet = self._make_tweet("111")
@@ -276,10 +268,8 @@ class TestSafetyCheckerQuoteRT:
     @pytest.fixture(autouse=True)
     def setup_checker(self):
         from src.post.safety_checker import SafetyChecker
-        rules_path = PROJECT_ROOT / "config" / "safety_rules.json"
-        with open(rules_path, "r") as f:
-            rules = json.load(f)
-        self.checker = SafetyChecker(rules)
+        from src.post.safety_rules import load_rules
+        self.checker = SafetyChecker(load_rules())
 
     def test_valid_quote_rt(self):
         result = self.checker.check(
@@ -381,6 +371,28 @@ class TestQuoteGenerator:
         # 少なくとも2種類以上使用
         assert len(templates_used) >= 2
 
+    def test_template_default_is_random(self):
+        """既定はランダム選択（実行ごとに同じ先頭テンプレートへ固定されない）"""
+        from unittest.mock import patch
+        with patch("src.generate.quote_generator.random.choice", side_effect=lambda seq: seq[-1]) as choice:
+            self.generator._get_template_id()
+        assert choice.called
+
+    def test_template_no_recent_repeat(self):
+        """直近2件と同じテンプレートは連続しない"""
+        chosen = [self.generator._get_template_id() for _ in range(6)]
+        for i in range(2, len(chosen)):
+            assert chosen[i] not in chosen[i - 2:i]
+
+    def test_template_rng_override(self):
+        """rng を渡すとランダム選択になる（シード固定で再現可能）"""
+        import random
+        from src.config import Config
+        from src.generate.quote_generator import QuoteGenerator
+        a = QuoteGenerator(Config(), rng=random.Random(7))
+        b = QuoteGenerator(Config(), rng=random.Random(7))
+        assert [a._get_template_id() for _ in range(5)] == [b._get_template_id() for _ in range(5)]
+
     def test_generate_batch(self):
         tweets = [
             {"text": "Tweet 1 about AI agents", "author_username": "user1"},
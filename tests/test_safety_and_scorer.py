@@ -2,7 +2,11 @@
 テスト — 安全チェッカー & スコアラー
 """
 import pytest
+from unittest.mock import patch
+from src.post import safety_checker
 from src.post.safety_checker import SafetyChecker
+from src.post.safety_rules import load_rules
+from src.post.simhash import simhash
 from src.analyze.scorer import PostScorer
 
 
@@ -41,6 +45,11 @@ def checker(safety_rules):
 
 
 class TestSafetyChecker:
+    def test_rules_loaded_once(self):
+        """安全ルールJSONは同じパスなら1回だけ読み込む"""
+        assert load_rules() is load_rules()
+        assert "ng_words" in load_rules()
+
     def test_safe_post(self, checker):
         """正常な投稿は通過する"""
         text = "ぶっちゃけ、AIで副業を自動化したら\n1日3時間の作業が30分になった。\n\nマジでやばい。みんなどうしてる？"
@@ -66,6 +75,20 @@ class TestSafetyChecker:
         result = checker.check(text)
         assert not result.is_safe
 
+    @pytest.mark.parametrize("use_automaton", [True, False])
+    def test_ng_words_in_definition_order(self, safety_rules, monkeypatch, use_automaton):
+        """NGワードは定義順に全件返す（オートマトン有無で同じ結果）"""
+        if not use_automaton:
+            monkeypatch.setattr(safety_checker, "ahocorasick", None)
+        elif safety_checker.ahocorasick is None:
+            pytest.skip("pyahocorasick 未インストール")
+        checker = SafetyChecker(safety_rules)
+        assert (checker._ng_automaton is not None) is use_automaton
+        assert checker._check_ng_words("KITADA が ISAI と cyan の話を。素晴らしい") == [
+            "cyan", "ISAI", "kitada", "素晴らしい",
+        ]
+        assert checker._check_ng_words("AIエージェントの話") == []
+
     def test_too_short(self, checker):
         """文字数不足を検出"""
         text = "マジでやばい。"
@@ -94,6 +117,28 @@ class TestSafetyChecker:
         assert not result.is_safe
         assert any("類似度" in v for v in result.violations)
 
+    def test_duplicate_detection_simhash(self, checker):
+        """過去投稿の SimHash を渡した場合はハミング距離で重複検出"""
+        past = "ぶっちゃけ、AIで副業を自動化したら1日3時間の作業が30分になった。マジでやばい。"
+        other = "今日はClaudeの新機能を試してみた。コード生成の精度が上がっていて驚いた。マジで。"
+        result = checker.check(past, past_post_hashes=[simhash(other), simhash(past)])
+        assert any("類似度100%" in v for v in result.violations)
+
+        result = checker.check(other, past_post_hashes=[simhash(past)])
+        assert not any("類似度" in v for v in result.violations)
+
+    def test_duplicate_check_short_circuit(self, checker):
+        """他の違反があれば重複チェックを省略し、short_circuit=False なら全項目を判定"""
+        text = "ぶっちゃけ短い"
+        with patch.object(checker, "_check_duplicate", return_value="dup") as dup:
+            result = checker.check(text, past_posts=[text])
+            dup.assert_not_called()
+            assert not result.is_safe
+
+            result = checker.check(text, past_posts=[text], short_circuit=False)
+            dup.assert_called_once()
+            assert "dup" in result.violations
+
     def test_posting_interval(self, checker):
         """投稿間隔不足を検出"""
         text = "ぶっちゃけ、AIで副業を自動化したら1日3時間の作業が30分になった。マジでやばい。"
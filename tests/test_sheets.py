@@ -4,6 +4,8 @@
 gspread APIはモック化してテスト。
 """
 import pytest
+from collections import defaultdict
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock, PropertyMock
 
 from src.sheets.url_importer import URLImporter
@@ -48,7 +50,27 @@ class TestURLImporter:
         assert result["total"] == 2
         assert result["added"] == 2
         assert result["invalid"] == 0
-        mock_sheets.mark_urls_batch.assert_called_once()
+        mock_sheets.finalize_import.assert_called_once()
+        updates, log = mock_sheets.finalize_import.call_args[0]
+        assert [u["row"] for u in updates] == [2, 3]
+        assert log["added"] == 2
+
+    def test_import_writes_queue_once(self, importer, mock_sheets, queue):
+        """自動承認付きでもキューのジャーナル書き込みは1回"""
+        mock_sheets.get_pending_urls.return_value = [
+            {"row": 2, "url": "https://x.com/sama/status/111", "memo": ""},
+            {"row": 3, "url": "https://x.com/ylecun/status/222", "memo": ""},
+        ]
+        with patch.object(queue, "_journal", wraps=queue._journal) as journal:
+            importer.import_urls(auto_approve=True)
+        journal.assert_called_once()
+        assert [i["tweet_id"] for i in queue.get_approved()] == ["111", "222"]
+
+    def test_full_scan_passed_to_sheets(self, importer, mock_sheets):
+        """full_scan 指定はシート読み取りまで渡る"""
+        mock_sheets.get_pending_urls.return_value = []
+        importer.import_urls(full_scan=True)
+        mock_sheets.get_pending_urls.assert_called_once_with(full_scan=True)
 
     def test_invalid_url(self, importer, mock_sheets):
         """無効なURLをスキップ"""
@@ -93,6 +115,20 @@ class TestURLImporter:
         assert result["added"] == 2
         assert result["invalid"] == 1
 
+    def test_duplicate_rows_in_sheet(self, importer, mock_sheets, queue):
+        """同じツイートの行が複数あれば最初の行だけ追加し、残りは重複として更新"""
+        mock_sheets.get_pending_urls.return_value = [
+            {"row": 2, "url": "https://x.com/user1/status/100", "memo": ""},
+            {"row": 3, "url": "https://twitter.com/user1/status/100", "memo": ""},
+            {"row": 4, "url": "https://x.com/user1/status/100", "memo": ""},
+        ]
+        with patch.object(queue, "add", wraps=queue.add) as add:
+            result = importer.import_urls()
+        add.assert_called_once()
+        assert (result["added"], result["skipped_dup"]) == (1, 2)
+        updates = mock_sheets.finalize_import.call_args.args[0]
+        assert [u["status"] for u in updates] == ["済", "重複", "重複"]
+
     def test_format_result(self, importer):
         """結果フォーマット"""
         result = {
@@ -112,7 +148,7 @@ class TestURLImporter:
         mock_sheets.get_pending_urls.return_value = [
             {"row": 2, "url": "https://x.com/test/status/555", "memo": ""},
         ]
-        mock_sheets.mark_urls_batch.side_effect = Exception("API error")
+        mock_sheets.finalize_import.side_effect = Exception("API error")
         result = importer.import_urls()
         assert result["added"] == 1  # キュー追加は成功
 
@@ -133,6 +169,526 @@ class TestURLImporter:
         assert result["added"] == 1
 
 
+# ============================================================
+# SheetsClient テスト（gspreadはモック）
+# ============================================================
+class TestSheetsClient:
+    """認証を経由せずにSheetsClientを組み立ててテスト"""
+
+    @pytest.fixture
+    def client(self, tmp_path):
+        from src.sheets.sheets_client import SheetsClient
+        client = SheetsClient.__new__(SheetsClient)
+        client._spreadsheet_id = "test_sheet"
+        client._spreadsheet = MagicMock()
+        client._state_file = tmp_path / "sheets_sync_state.json"
+        client._read_cache_file = tmp_path / "sheets_read_cache.json"
+        client._ws_cache = {}
+        client._ws_primed = False
+        client._grid_rows = {}
+        client._append_buffers = defaultdict(list)
+        return client
+
+    def test_get_pending_urls(self, client):
+        """ステータス空の行のみ返す"""
+        ws = client._spreadsheet.worksheet.return_value
+        ws.get.return_value = [
+            ["https://x.com/a/status/1", "memo", "済"],
+            ["https://x.com/b/status/2", "memo2"],
+            [],
+            ["https://x.com/c/status/3", "", ""],
+        ]
+        pending = client.get_pending_urls()
+        assert [p["row"] for p in pending] == [3, 5]
+        assert pending[0]["memo"] == "memo2"
+        ws.get.assert_called_once_with("A2:D", value_render_option="UNFORMATTED_VALUE")
+
+    def test_get_pending_urls_resumes_from_cursor(self, client):
+        """処理済みの先頭行は次回以降読み飛ばす"""
+        ws = client._spreadsheet.worksheet.return_value
+        ws.get.return_value = [
+            ["https://x.com/a/status/1", "", "済"],
+            ["https://x.com/b/status/2", "", "済"],
+            ["https://x.com/c/status/3", "", ""],
+        ]
+        client.get_pending_urls()
+
+        # カーソル直前の行（目印）から読む
+        ws.get.return_value = [
+            ["https://x.com/b/status/2", "", "済"],
+            ["https://x.com/c/status/3", "", ""],
+        ]
+        pending = client.get_pending_urls()
+        ws.get.assert_called_with("A3:D", value_render_option="UNFORMATTED_VALUE")
+        assert [p["row"] for p in pending] == [4]
+
+        client.get_pending_urls(full_scan=True)
+        ws.get.assert_called_with("A2:D", value_render_option="UNFORMATTED_VALUE")
+
+    def test_get_pending_urls_rescans_after_rows_deleted(self, client):
+        """処理済み行が削除されてカーソルがずれたら先頭から読み直す"""
+        ws = client._spreadsheet.worksheet.return_value
+        ws.get.return_value = [
+            ["https://x.com/a/status/1", "", "済"],
+            ["https://x.com/b/status/2", "", "済"],
+            ["https://x.com/c/status/3", "", "済"],
+        ]
+        with patch.object(type(client), "get_revision", return_value="1"):
+            client.get_pending_urls()
+        assert client.load_sync_state()["collect_cursor"] == 5
+
+        # 処理済み3行を削除し、新しいURLを2行追加（カーソル5より上に未処理行がある）
+        sheet = [
+            ["https://x.com/d/status/4", "", ""],
+            ["https://x.com/e/status/5", "", ""],
+        ]
+        ws.get.side_effect = lambda rng, **kw: sheet[int(rng[1:-2]) - 2:]
+        with patch.object(type(client), "get_revision", return_value="2"):
+            pending = client.get_pending_urls()
+        assert [p["url"] for p in pending] == [
+            "https://x.com/d/status/4",
+            "https://x.com/e/status/5",
+        ]
+        assert [p["row"] for p in pending] == [2, 3]
+        assert client.load_sync_state()["collect_cursor"] == 2
+
+    def test_get_pending_urls_rescans_when_anchor_changes(self, client):
+        """目印の行のURLが変わっていたら（並べ替え等）先頭から読み直す"""
+        ws = client._spreadsheet.worksheet.return_value
+        sheet = [
+            ["https://x.com/a/status/1", "", "済"],
+            ["https://x.com/b/status/2", "", ""],
+        ]
+        ws.get.side_effect = lambda rng, **kw: sheet[int(rng[1:-2]) - 2:]
+        with patch.object(type(client), "get_revision", return_value="1"):
+            client.get_pending_urls()
+        assert client.load_sync_state()["collect_cursor"] == 3
+
+        sheet[:] = [
+            ["https://x.com/b/status/2", "", ""],
+            ["https://x.com/a/status/1", "", "済"],
+        ]
+        with patch.object(type(client), "get_revision", return_value="2"):
+            pending = client.get_pending_urls()
+        assert [p["row"] for p in pending] == [2]
+
+    def test_reads_cached_by_revision(self, client):
+        """リビジョンが変わらなければ再読み取りしない"""
+        ws = client._spreadsheet.worksheet.return_value
+        ws.get.return_value = [["https://x.com/a/status/1", "", ""]]
+        with patch.object(type(client), "get_revision", return_value="10"):
+            client.get_pending_urls()
+            assert client.get_pending_urls()[0]["url"] == "https://x.com/a/status/1"
+            assert ws.get.call_count == 1
+
+        with patch.object(type(client), "get_revision", return_value="11"):
+            client.get_pending_urls()
+            assert ws.get.call_count == 2
+
+    def test_write_invalidates_read_cache(self, client):
+        """自分の書き込み後はキャッシュを使わない"""
+        ws = client._spreadsheet.worksheet.return_value
+        ws.get.return_value = [["https://x.com/a/status/1", "", ""]]
+        client.get_pending_urls()
+        client.mark_url_processed(2)
+        client.get_pending_urls()
+        assert ws.get.call_count == 2
+
+    def test_fmt_jst(self):
+        """シート表示用の日時はゼロ埋め YYYY/MM/DD HH:MM"""
+        from datetime import datetime
+        from src.sheets.sheets_client import _fmt_jst
+        assert _fmt_jst(datetime(2025, 3, 4, 5, 6, 7)) == "2025/03/04 05:06"
+
+    def test_mark_url_processed_uses_given_time(self, client):
+        """呼び出し側の処理日時をそのまま使う"""
+        client.mark_url_processed(5, now="2025/01/01 00:00")
+        ws = client._spreadsheet.worksheet.return_value
+        ws.update.assert_called_once_with("C5:E5", [["済", "2025/01/01 00:00", ""]])
+
+    def test_worksheet_lookup_cached(self, client):
+        """同じシートのメタデータ取得は1回だけ"""
+        client.mark_url_processed(2)
+        client.mark_urls_batch([{"row": 3, "status": "済"}])
+        client._spreadsheet.worksheet.assert_called_once()
+
+    def test_mark_urls_batch_coalesces_consecutive_rows(self, client):
+        """連続行は1範囲、飛び石の行は別範囲"""
+        client.mark_urls_batch([
+            {"row": 3, "status": "済", "tweet_id": "3"},
+            {"row": 2, "status": "済", "tweet_id": "2"},
+            {"row": 6, "status": "エラー"},
+        ])
+        ws = client._spreadsheet.worksheet.return_value
+        batch = ws.batch_update.call_args[0][0]
+        assert [b["range"] for b in batch] == ["C2:E3", "C6:E6"]
+        assert [r[2] for r in batch[0]["values"]] == ["2", "3"]
+        assert batch[1]["values"][0][0] == "エラー"
+        assert ws.batch_update.call_args[1]["value_input_option"] == "RAW"
+
+    def test_finalize_import_single_batch_update(self, client):
+        """ステータス更新と収集ログ追記を1回のbatchUpdateで送る"""
+        ws = client._spreadsheet.worksheet.return_value
+        ws.id = 5
+        client.append_collection_log({"fetched": 1})
+        client.finalize_import(
+            [{"row": 2, "status": "済", "tweet_id": "1"}, {"row": 3, "status": "重複"},
+             {"row": 7, "status": "エラー"}],
+            {"fetched": 3, "added": 1},
+        )
+        ws.batch_update.assert_not_called()
+        ws.append_rows.assert_not_called()
+        client._spreadsheet.batch_update.assert_called_once()
+        requests = client._spreadsheet.batch_update.call_args[0][0]["requests"]
+        first, second, append = requests
+        assert first["updateCells"]["range"]["startRowIndex"] == 1
+        assert first["updateCells"]["range"]["endRowIndex"] == 3
+        assert second["updateCells"]["range"]["startRowIndex"] == 6
+        assert len(append["appendCells"]["rows"]) == 2  # バッファ済み + 今回
+        assert not client._append_buffers
+
+    def test_mark_urls_batch_duplicate_rows(self, client):
+        """同じ行の重複更新は後勝ちで1行にまとめる"""
+        client.mark_urls_batch([
+            {"row": 2, "status": "エラー"},
+            {"row": 3, "status": "済"},
+            {"row": 2, "status": "済", "tweet_id": "9"},
+        ])
+        ws = client._spreadsheet.worksheet.return_value
+        (entry,) = ws.batch_update.call_args[0][0]
+        assert entry["range"] == "C2:E3"
+        assert entry["values"][0][0] == "済" and entry["values"][0][2] == "9"
+
+    def test_write_queue_items_single_batch_update(self, client):
+        """キュー書き込みはクリア込みで1回のbatchUpdate"""
+        ws = client._spreadsheet.worksheet.return_value
+        ws.id = 7
+        ws.row_count = 200
+        client.write_queue_items([
+            {"status": "pending", "tweet_id": "1", "author_username": "a", "likes": 5},
+        ])
+        ws.batch_clear.assert_not_called()
+        ws.update.assert_not_called()
+        body = client._spreadsheet.batch_update.call_args[0][0]
+        (req,) = body["requests"]
+        cells = req["updateCells"]
+        assert cells["range"]["endRowIndex"] == 200  # 残りの行はクリアされる
+        assert cells["fields"] == "userEnteredValue"
+        values = cells["rows"][0]["values"]
+        assert values[1] == {"userEnteredValue": {"stringValue": "1"}}
+        assert values[4] == {"userEnteredValue": {"numberValue": 5}}
+        assert values[6] == {}
+
+    def test_write_queue_items_expands_grid(self, client):
+        """行数が足りなければ同じバッチで行を追加"""
+        ws = client._spreadsheet.worksheet.return_value
+        ws.id = 7
+        ws.row_count = 2
+        client.write_queue_items([{"tweet_id": str(i)} for i in range(3)])
+        requests = client._spreadsheet.batch_update.call_args[0][0]["requests"]
+        assert requests[0]["appendDimension"]["length"] == 2
+        assert requests[1]["updateCells"]["range"]["endRowIndex"] == 4
+
+    def test_write_queue_items_remembers_grown_grid(self, client):
+        """拡張後の行数を覚え、2回目の書き込みで行を追加し直さず全行をクリアする"""
+        ws = client._spreadsheet.worksheet.return_value
+        ws.id = 7
+        ws.row_count = 2  # キャッシュした Worksheet の値は更新されない
+        client.write_queue_items([{"tweet_id": str(i)} for i in range(5)])
+        client.write_queue_items([{"tweet_id": "1"}])
+        (req,) = client._spreadsheet.batch_update.call_args[0][0]["requests"]
+        assert req["updateCells"]["range"]["endRowIndex"] == 6  # 1回目に書いた行まで消す
+
+        client.write_queue_and_dashboard([{"tweet_id": str(i)} for i in range(7)], None)
+        requests = client._spreadsheet.batch_update.call_args[0][0]["requests"]
+        assert requests[0]["appendDimension"]["length"] == 2
+        assert requests[1]["updateCells"]["range"]["endRowIndex"] == 8
+
+    def test_read_queue_decisions_targeted_ranges(self, client):
+        """判定読み取りは必要な列だけを1回で取得"""
+        ws = client._spreadsheet.worksheet.return_value
+        ws.batch_get.return_value = [
+            [["approved", "111"], ["skip"], ["skip", "222"]],
+            [[], [], ["重複"]],
+        ]
+        decisions = client.read_queue_decisions()
+        ws.batch_get.assert_called_once_with(["A2:B", "K2:K"])
+        ws.get_all_values.assert_not_called()
+        assert decisions == [
+            {"row": 2, "status": "approved", "tweet_id": "111", "skip_reason": ""},
+            {"row": 4, "status": "skip", "tweet_id": "222", "skip_reason": "重複"},
+        ]
+
+    def test_read_queue_decisions_marker_short_circuit(self, client):
+        """変更マーカーが同じなら判定の再読み取りをしない"""
+        ws = client._spreadsheet.worksheet.return_value
+        ws.batch_get.return_value = [[["approved", "111"]], []]
+        ws.acell.return_value.value = 45000.5
+
+        first = client.read_queue_decisions()
+        assert client.read_queue_decisions() == first
+        assert ws.batch_get.call_count == 1
+
+        ws.acell.return_value.value = 45000.6
+        client.read_queue_decisions()
+        assert ws.batch_get.call_count == 2
+
+    def test_key_value_sheets_single_batch_get(self, client):
+        """設定系シートは1回のbatchGetで読み取る"""
+        client._spreadsheet.values_batch_get.return_value = {"valueRanges": [
+            {"values": [["min_likes", "500"], ["mode"], ["", "orphan"]]},
+            {},
+        ]}
+        result = client.get_key_value_sheets(["設定", "選定プリファレンス"])
+        assert result == {"設定": {"min_likes": "500", "mode": ""}, "選定プリファレンス": {}}
+        client._spreadsheet.values_batch_get.assert_called_once_with(
+            ["'設定'!A2:B", "'選定プリファレンス'!A2:B"]
+        )
+        client._spreadsheet.worksheet.assert_not_called()
+
+    def test_key_value_sheets_fallback_creates_missing(self, client):
+        """一括取得に失敗したらシートごとに作成・読み取り"""
+        import gspread
+        client._spreadsheet.values_batch_get.side_effect = gspread.exceptions.APIError(
+            MagicMock(json=MagicMock(return_value={"error": {"code": 400, "message": "x"}}))
+        )
+        client._spreadsheet.worksheet.side_effect = gspread.exceptions.WorksheetNotFound
+        client._spreadsheet.add_worksheet.return_value.get.return_value = [["max_tweets", "50"]]
+
+        assert client.get_settings() == {"max_tweets": "50"}
+        client._spreadsheet.add_worksheet.assert_called_once()
+
+    def test_worksheet_cache_primed_once(self, client):
+        """初回ミスで全シートのハンドルをまとめて取得"""
+        collect, queue = MagicMock(), MagicMock()
+        collect.title, queue.title = "URL収集", "キュー管理"
+        client._spreadsheet.worksheets.return_value = [collect, queue]
+        queue.batch_get.return_value = [[], []]
+
+        client.mark_url_processed(2)
+        client.read_queue_decisions()
+        client._spreadsheet.worksheets.assert_called_once()
+        client._spreadsheet.worksheet.assert_not_called()
+        collect.update.assert_called_once()
+
+    def test_created_sheet_cached(self, client):
+        """作成したシートはキャッシュから返る"""
+        import gspread
+        client._spreadsheet.worksheet.side_effect = gspread.exceptions.WorksheetNotFound
+        client.append_posted({"text": "a"})
+        client.flush_appends()
+        client.append_posted({"text": "b"})
+        client.flush_appends()
+        client._spreadsheet.add_worksheet.assert_called_once()
+        assert client._spreadsheet.worksheet.call_count == 1
+
+    def test_setup_sheets_creates_missing(self, client):
+        """未作成のシートだけを作成し、定義順で返す"""
+        client._spreadsheet.worksheets.return_value = [SimpleNamespace(title="URL収集")]
+        client._spreadsheet.add_worksheet.side_effect = lambda title, rows, cols: MagicMock(title=title)
+
+        created = client.setup_sheets()
+        assert "URL収集" not in created
+        assert created == [n for n in client._sheet_creators() if n != "URL収集"]
+        assert client._spreadsheet.add_worksheet.call_count == len(created)
+
+        client._spreadsheet.worksheets.return_value = list(client._ws_cache.values())
+        assert client.setup_sheets() == []
+
+    def test_create_sheet_single_batch_update(self, client):
+        """見出し書き込みと太字化は1回のbatchUpdate"""
+        ws = client._spreadsheet.add_worksheet.return_value
+        ws.id = 3
+        client._create_settings_sheet()
+        ws.update.assert_not_called()
+        ws.format.assert_not_called()
+        (body,), _ = client._spreadsheet.batch_update.call_args
+        cells, bold = body["requests"]
+        rows = cells["updateCells"]["rows"]
+        assert rows[0]["values"][0] == {"userEnteredValue": {"stringValue": "設定キー"}}
+        assert len(rows) == 8
+        assert bold["repeatCell"]["range"]["endColumnIndex"] == 3
+
+    def test_update_dashboard_single_values_update(self, client):
+        """ダッシュボードは B2:B8 を1回で更新"""
+        client.update_dashboard({"pending": 3})
+        client._spreadsheet.worksheet.return_value.update.assert_not_called()
+        (rng,), kwargs = client._spreadsheet.values_update.call_args
+        assert rng == "'ダッシュボード'!B2:B8"
+        assert kwargs["params"] == {"valueInputOption": "RAW"}
+        assert kwargs["body"]["values"][2] == [3]
+
+    def test_write_queue_and_dashboard_single_batch_update(self, client):
+        """キューとダッシュボードを1回のbatchUpdateで書き込み"""
+        ws = client._spreadsheet.worksheet.return_value
+        ws.id = 7
+        ws.row_count = 200
+        client.write_queue_and_dashboard([{"tweet_id": "1"}], {"pending": 3})
+        client._spreadsheet.values_update.assert_not_called()
+        client._spreadsheet.batch_update.assert_called_once()
+        queue_req, dash_req = client._spreadsheet.batch_update.call_args[0][0]["requests"]
+        assert queue_req["updateCells"]["range"]["startColumnIndex"] == 0
+        cells = dash_req["updateCells"]
+        assert (cells["range"]["startRowIndex"], cells["range"]["endRowIndex"]) == (1, 8)
+        assert cells["range"]["startColumnIndex"] == 1
+        assert cells["rows"][2]["values"][0] == {"userEnteredValue": {"numberValue": 3}}
+
+    def test_write_nothing_skips_request(self, client):
+        """書き込むものがなければリクエストしない"""
+        client.write_queue_and_dashboard(None, None)
+        client._spreadsheet.batch_update.assert_not_called()
+
+    def test_write_dashboard_only(self, client):
+        """items=None ならダッシュボードのみ"""
+        client._spreadsheet.worksheet.return_value.id = 9
+        client.write_queue_and_dashboard(None, {})
+        (req,) = client._spreadsheet.batch_update.call_args[0][0]["requests"]
+        assert req["updateCells"]["range"]["sheetId"] == 9
+
+    def test_appends_buffered_until_flush(self, client):
+        """追記はバッファされ、シートごとに1回で書き出す"""
+        ws = client._spreadsheet.worksheet.return_value
+        client.append_collection_log({"fetched": 10})
+        client.append_collection_log({"fetched": 20})
+        ws.append_rows.assert_not_called()
+
+        with client:
+            pass
+        ws.append_rows.assert_called_once()
+        rows = ws.append_rows.call_args[0][0]
+        assert [r[1] for r in rows] == [10, 20]
+
+        client.flush_appends()
+        ws.append_rows.assert_called_once()
+
+    def test_appends_auto_flush(self, client):
+        """一定行数に達したら自動で書き出す"""
+        from src.sheets.sheets_client import APPEND_FLUSH_SIZE
+        ws = client._spreadsheet.worksheet.return_value
+        for i in range(APPEND_FLUSH_SIZE):
+            client.append_metrics({"date": str(i)})
+        ws.append_rows.assert_called_once()
+        assert len(ws.append_rows.call_args[0][0]) == APPEND_FLUSH_SIZE
+
+
+class TestSheetsAuthorize:
+    def test_authorized_client_reused(self, monkeypatch):
+        """同じ認証情報なら認証済みクライアントを再利用"""
+        import base64
+        import json
+        from src.sheets import sheets_client
+
+        sheets_client._clients.clear()
+        monkeypatch.setenv("SPREADSHEET_ID", "sheet")
+        monkeypatch.setenv("GOOGLE_CREDENTIALS_BASE64",
+                           base64.b64encode(json.dumps({"type": "service_account"}).encode()).decode())
+        with patch("google.oauth2.service_account.Credentials.from_service_account_info") as creds, \
+                patch("gspread.authorize") as authorize:
+            a = sheets_client.SheetsClient()
+            b = sheets_client.SheetsClient()
+        sheets_client._clients.clear()
+
+        creds.assert_called_once()
+        authorize.assert_called_once()
+        assert a._gc is b._gc
+        creds_arg = creds.call_args[0][0]
+        assert creds_arg == {}  # 鍵JSONは生成後に破棄
+
+
+# ============================================================
+# BackoffHTTPClient テスト
+# ============================================================
+def _api_error(code: int, headers: dict | None = None):
+    from gspread.exceptions import APIError
+    response = SimpleNamespace(
+        json=lambda: {"error": {"code": code, "message": "err", "status": "X"}},
+        headers=headers or {},
+    )
+    return APIError(response)
+
+
+class TestBackoffHTTPClient:
+    @pytest.fixture
+    def http(self):
+        from src.sheets.http_client import BackoffHTTPClient
+        return BackoffHTTPClient.__new__(BackoffHTTPClient)
+
+    @patch("src.utils.time.sleep")
+    def test_retry_after_honored(self, mock_sleep, http):
+        """429 は Retry-After の秒数待って再試行"""
+        from gspread.http_client import HTTPClient
+        ok = object()
+        with patch.object(HTTPClient, "request",
+                          side_effect=[_api_error(429, {"Retry-After": "7"}), ok]):
+            assert http.request("get", "https://example.com") is ok
+        (delay,) = mock_sleep.call_args[0]
+        assert 7 <= delay <= 7 * 1.2
+
+    @patch("src.utils.random.uniform", side_effect=lambda low, high: high)
+    @patch("src.utils.time.sleep")
+    def test_server_error_exponential(self, mock_sleep, _uniform, http):
+        """Retry-After が無い 5xx は指数バックオフ"""
+        from gspread.http_client import HTTPClient
+        ok = object()
+        with patch.object(HTTPClient, "request",
+                          side_effect=[_api_error(503), _api_error(500), ok]):
+            assert http.request("get", "https://example.com") is ok
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [2.0, 4.0]
+
+    @patch("src.utils.time.sleep")
+    def test_client_error_not_retried(self, mock_sleep, http):
+        """4xx（429以外）は即座に送出"""
+        from gspread.exceptions import APIError
+        from gspread.http_client import HTTPClient
+        with patch.object(HTTPClient, "request", side_effect=_api_error(400)) as req:
+            with pytest.raises(APIError):
+                http.request("get", "https://example.com")
+        assert req.call_count == 1
+        mock_sleep.assert_not_called()
+
+    @patch("src.utils.time.sleep")
+    def test_circuit_opens_after_exhausted_retries(self, mock_sleep, http):
+        """全試行が失敗したら以降の呼び出しは送信せずに失敗"""
+        from gspread.exceptions import APIError
+        from gspread.http_client import HTTPClient
+        from src.sheets import http_client
+        from src.utils import CircuitBreaker, CircuitOpenError
+
+        breaker = CircuitBreaker(threshold=http_client.MAX_RETRIES + 1, window=120.0)
+        with patch.object(http_client, "_breaker", breaker), \
+             patch.object(HTTPClient, "request", side_effect=_api_error(503)) as req:
+            with pytest.raises(APIError):
+                http.request("get", "https://example.com")
+            assert req.call_count == http_client.MAX_RETRIES + 1
+
+            with pytest.raises(CircuitOpenError):
+                http.request("get", "https://example.com")
+            assert req.call_count == http_client.MAX_RETRIES + 1
+
+
+class TestTokenBucket:
+    @patch("src.sheets.http_client.time.sleep")
+    @patch("src.sheets.http_client.time.monotonic", return_value=100.0)
+    def test_waits_when_empty(self, mock_now, mock_sleep):
+        """容量を使い切ると補充分だけ待機"""
+        from src.sheets.http_client import TokenBucket
+        bucket = TokenBucket(2, 1.0)
+        bucket.acquire()
+        bucket.acquire()
+        mock_sleep.assert_not_called()
+
+        mock_sleep.side_effect = lambda d: setattr(mock_now, "return_value", 100.0 + d)
+        bucket.acquire()
+        assert mock_sleep.call_args[0][0] == pytest.approx(1.0)
+
+    def test_method_classification(self):
+        """GET は読み取り、それ以外は書き込みバケット"""
+        from src.sheets import http_client
+        assert http_client._bucket_for("get") is http_client._read_bucket
+        assert http_client._bucket_for("post") is http_client._write_bucket
+        assert http_client._bucket_for("put") is http_client._write_bucket
+
+
 # ============================================================
 # CLIコマンド登録テスト
 # ============================================================
@@ -1,12 +1,16 @@
 """
-テスト — 共通ユーティリティ（retry_with_backoff, safe_json_load, atomic_json_save）
+テスト — 共通ユーティリティ（retry_with_backoff, CircuitBreaker, safe_json_load, atomic_json_save, json_dumps）
 """
 import json
+import os
 import pytest
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
-from src.utils import retry_with_backoff, safe_json_load, atomic_json_save
+from src.utils import (
+    retry_with_backoff, safe_json_load, atomic_json_save, json_dumps, json_loads,
+    WriteCorruption, CircuitBreaker, CircuitOpenError,
+)
 
 
 # ============================================================
@@ -48,9 +52,10 @@ class TestRetryWithBackoff:
         # 初回 + 2リトライ = sleep 2回
         assert mock_sleep.call_count == 2
 
+    @patch("src.utils.random.uniform", side_effect=lambda low, high: high)
     @patch("src.utils.time.sleep")
-    def test_exponential_delay(self, mock_sleep):
-        """指数バックオフの待機時間が正しい"""
+    def test_exponential_delay(self, mock_sleep, _uniform):
+        """指数バックオフの待機時間の上限が 2**n * base_delay"""
         def always_fail():
             raise RuntimeError("err")
 
@@ -60,6 +65,138 @@ class TestRetryWithBackoff:
         delays = [call.args[0] for call in mock_sleep.call_args_list]
         assert delays == [2.0, 4.0, 8.0]
 
+    @patch("src.utils.random.uniform", side_effect=lambda low, high: high)
+    @patch("src.utils.time.sleep")
+    def test_exponential_delay_capped(self, mock_sleep, _uniform):
+        """指数バックオフの待機時間は cap を超えない"""
+        def always_fail():
+            raise RuntimeError("err")
+
+        with pytest.raises(RuntimeError):
+            retry_with_backoff(always_fail, max_retries=4, base_delay=2.0, cap=10.0)
+
+        delays = [call.args[0] for call in mock_sleep.call_args_list]
+        assert delays == [2.0, 4.0, 8.0, 10.0]
+
+    @patch("src.utils.time.sleep")
+    def test_retry_if_filters(self, mock_sleep):
+        """retry_if が False の例外は即座に送出"""
+        calls = {"n": 0}
+
+        def fail():
+            calls["n"] += 1
+            raise KeyError("no retry")
+
+        with pytest.raises(KeyError):
+            retry_with_backoff(fail, max_retries=3, retry_if=lambda e: isinstance(e, ConnectionError))
+        assert calls["n"] == 1
+        mock_sleep.assert_not_called()
+
+    @patch("src.utils.random.uniform", side_effect=lambda low, high: high)
+    @patch("src.utils.time.sleep")
+    def test_delay_for_overrides(self, mock_sleep, _uniform):
+        """delay_for の値を優先し、None なら指数バックオフ"""
+        def always_fail():
+            raise RuntimeError("err")
+
+        delays = iter([5.0, None])
+        with pytest.raises(RuntimeError):
+            retry_with_backoff(always_fail, max_retries=2, base_delay=1.0,
+                               delay_for=lambda e: next(delays))
+        # delay_for の値には最大20%を加算、None なら指数バックオフ（上限 2**1 * 1.0）
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [6.0, 2.0]
+
+    @patch("src.utils.time.sleep")
+    def test_jitter_bounds(self, mock_sleep):
+        """指数バックオフの待機秒数は 0〜2**n * base_delay の範囲（full jitter）"""
+        def always_fail():
+            raise RuntimeError("err")
+
+        with pytest.raises(RuntimeError):
+            retry_with_backoff(always_fail, max_retries=3, base_delay=2.0)
+        delays = [call.args[0] for call in mock_sleep.call_args_list]
+        for delay, upper in zip(delays, [2.0, 4.0, 8.0]):
+            assert 0 <= delay <= upper
+
+    @patch("src.utils.time.sleep")
+    def test_seeded_rng(self, mock_sleep):
+        """同じシードの rng なら同じ待機秒数になる"""
+        import random
+
+        def always_fail():
+            raise RuntimeError("err")
+
+        runs = []
+        for _ in range(2):
+            mock_sleep.reset_mock()
+            with pytest.raises(RuntimeError):
+                retry_with_backoff(always_fail, max_retries=3, rng=random.Random(42))
+            runs.append([c.args[0] for c in mock_sleep.call_args_list])
+        assert runs[0] == runs[1]
+
+    @pytest.mark.parametrize("jitter, bounds", [
+        ("none", [(2.0, 2.0), (4.0, 4.0), (8.0, 8.0), (10.0, 10.0)]),
+        ("full", [(0.0, 2.0), (0.0, 4.0), (0.0, 8.0), (0.0, 10.0)]),
+        ("equal", [(1.0, 2.0), (2.0, 4.0), (4.0, 8.0), (5.0, 10.0)]),
+        ("decorrelated", [(2.0, 6.0), (2.0, 10.0), (2.0, 10.0), (2.0, 10.0)]),
+    ])
+    @patch("src.utils.time.sleep")
+    def test_jitter_modes(self, mock_sleep, jitter, bounds):
+        """ジッター方式ごとの待機秒数の範囲と、シード固定時の再現性"""
+        import random
+
+        def always_fail():
+            raise RuntimeError("err")
+
+        runs = []
+        for _ in range(2):
+            mock_sleep.reset_mock()
+            with pytest.raises(RuntimeError):
+                retry_with_backoff(always_fail, max_retries=4, base_delay=2.0, cap=10.0,
+                                   rng=random.Random(42), jitter=jitter)
+            runs.append([c.args[0] for c in mock_sleep.call_args_list])
+        assert runs[0] == runs[1]
+        for delay, (low, high) in zip(runs[0], bounds):
+            assert low <= delay <= high
+
+    def test_unknown_jitter_mode(self):
+        """未知のジッター方式は ValueError"""
+        with pytest.raises(ValueError):
+            retry_with_backoff(lambda: "ok", jitter="bogus")
+
+    @patch("src.utils.random.uniform", return_value=0.0)
+    @patch("src.utils.time.sleep")
+    def test_retry_after_header(self, mock_sleep, _uniform):
+        """レスポンスの Retry-After を優先"""
+        error = ConnectionError("429")
+        error.response = MagicMock(status_code=429, headers={"Retry-After": "47"})
+        calls = iter([error])
+
+        def flaky():
+            err = next(calls, None)
+            if err:
+                raise err
+            return "ok"
+
+        assert retry_with_backoff(flaky, max_retries=3, base_delay=1.0) == "ok"
+        mock_sleep.assert_called_once_with(47.0)
+
+    @patch("src.utils.time.sleep")
+    def test_non_retryable_status(self, mock_sleep):
+        """400/401/403/404 はリトライしない"""
+        calls = {"n": 0}
+
+        def forbidden():
+            calls["n"] += 1
+            error = RuntimeError("forbidden")
+            error.code = 403
+            raise error
+
+        with pytest.raises(RuntimeError):
+            retry_with_backoff(forbidden, max_retries=3)
+        assert calls["n"] == 1
+        mock_sleep.assert_not_called()
+
     @patch("src.utils.time.sleep")
     def test_zero_retries(self, mock_sleep):
         """max_retries=0 でリトライなし"""
@@ -71,6 +208,95 @@ class TestRetryWithBackoff:
         mock_sleep.assert_not_called()
 
 
+# ============================================================
+# CircuitBreaker テスト
+# ============================================================
+class TestCircuitBreaker:
+    @pytest.fixture
+    def clock(self):
+        return MagicMock(return_value=100.0)
+
+    def test_opens_after_threshold(self, clock):
+        """window 内の連続失敗が threshold に達すると開く"""
+        breaker = CircuitBreaker(threshold=3, window=30.0, cooldown=60.0, clock=clock)
+        for _ in range(2):
+            breaker.record_failure()
+        assert breaker.state == "closed"
+        breaker.record_failure()
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+    def test_failures_outside_window_reset(self, clock):
+        """window より間隔の空いた失敗は数え直す"""
+        breaker = CircuitBreaker(threshold=2, window=30.0, clock=clock)
+        breaker.record_failure()
+        clock.return_value = 200.0
+        breaker.record_failure()
+        assert breaker.state == "closed"
+
+    def test_success_resets(self, clock):
+        """成功で連続失敗数はリセット"""
+        breaker = CircuitBreaker(threshold=2, clock=clock)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == "closed"
+
+    def test_half_open_after_cooldown(self, clock):
+        """cooldown 後は1回だけ試行を通し、失敗すれば再び開く・成功すれば閉じる"""
+        breaker = CircuitBreaker(threshold=1, cooldown=60.0, clock=clock)
+        breaker.record_failure()
+        clock.return_value = 161.0
+        breaker.before_call()
+        assert breaker.state == "half_open"
+        # 試行中は他の呼び出しを通さない
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        breaker.record_failure()
+        assert breaker.state == "open"
+
+        clock.return_value = 222.0
+        breaker.before_call()
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+    @patch("src.utils.time.sleep")
+    def test_retry_short_circuits_when_open(self, mock_sleep, clock):
+        """開いたブレーカーは残りのリトライと待機を打ち切る"""
+        breaker = CircuitBreaker(threshold=2, clock=clock)
+        calls = {"n": 0}
+
+        def always_fail():
+            calls["n"] += 1
+            raise ConnectionError("down")
+
+        with pytest.raises(CircuitOpenError):
+            retry_with_backoff(always_fail, max_retries=5, base_delay=1.0, breaker=breaker)
+        assert calls["n"] == 2
+        assert mock_sleep.call_count == 2
+
+        # 開いている間は fn を呼ばずに即座に失敗
+        with pytest.raises(CircuitOpenError):
+            retry_with_backoff(always_fail, max_retries=5, breaker=breaker)
+        assert calls["n"] == 2
+        assert mock_sleep.call_count == 2
+
+    @patch("src.utils.time.sleep")
+    def test_non_retryable_error_keeps_closed(self, mock_sleep, clock):
+        """リトライ対象外のエラーは相手の応答として扱い、失敗に数えない"""
+        breaker = CircuitBreaker(threshold=1, clock=clock)
+        error = RuntimeError("forbidden")
+        error.response = MagicMock(status_code=403)
+
+        def forbidden():
+            raise error
+
+        with pytest.raises(RuntimeError):
+            retry_with_backoff(forbidden, breaker=breaker)
+        assert breaker.state == "closed"
+
+
 # ============================================================
 # atomic_json_save テスト
 # ============================================================
@@ -103,6 +329,38 @@ class TestAtomicJsonSave:
         with open(backup, "r") as f:
             assert json.load(f) == [1, 2, 3]
 
+    def test_no_backup_when_disabled(self, tmp_path):
+        """backup=False ならバックアップを作らない"""
+        path = tmp_path / "test.json"
+        atomic_json_save(path, [1], backup=False)
+        atomic_json_save(path, [2], backup=False)
+
+        assert not path.with_suffix(".json.bak").exists()
+        with open(path, "r") as f:
+            assert json.load(f) == [2]
+
+    def test_backup_is_previous_version(self, tmp_path):
+        """バックアップは常に直前の版（リンク先が新データに変わらない）"""
+        path = tmp_path / "test.json"
+        for data in ([1], [2], [3]):
+            atomic_json_save(path, data)
+
+        with open(path.with_suffix(".json.bak"), "r") as f:
+            assert json.load(f) == [2]
+        with open(path, "r") as f:
+            assert json.load(f) == [3]
+
+    def test_fsync_only_when_durable(self, tmp_path):
+        """fsync は durable=True の時だけ"""
+        path = tmp_path / "test.json"
+        with patch("src.utils.os.fsync") as fsync:
+            atomic_json_save(path, [1])
+            fsync.assert_not_called()
+            atomic_json_save(path, [2], durable=True)
+            assert fsync.call_count >= 1
+        with open(path, "r") as f:
+            assert json.load(f) == [2]
+
     def test_tmp_file_cleaned_up(self, tmp_path):
         """一時ファイルが残らない"""
         path = tmp_path / "test.json"
@@ -110,6 +368,32 @@ class TestAtomicJsonSave:
         tmp_file = path.with_suffix(".json.tmp")
         assert not tmp_file.exists()
 
+    def test_tmpfile_link_fallback(self, tmp_path, monkeypatch):
+        """O_TMPFILE のリンクに失敗する環境では名前付き一時ファイルで保存する"""
+        import src.utils as utils
+        if not hasattr(os, "O_TMPFILE"):
+            pytest.skip("O_TMPFILE 非対応")
+        monkeypatch.setattr(utils, "_tmpfile_link_supported", True)
+        path = tmp_path / "test.json"
+        with patch("src.utils.os.link", side_effect=OSError("EXDEV")):
+            atomic_json_save(path, [1])
+            atomic_json_save(path, [2])
+        assert utils._tmpfile_link_supported is False
+        with open(path, "r") as f:
+            assert json.load(f) == [2]
+        assert not path.with_suffix(".json.tmp").exists()
+
+    def test_detects_corruption(self, tmp_path):
+        """durable 保存で読み戻した内容が一致しなければ WriteCorruption、本ファイルはそのまま"""
+        path = tmp_path / "test.json"
+        atomic_json_save(path, [1], durable=True)
+        with patch("src.utils._sha256_file", return_value=b"garbage"):
+            with pytest.raises(WriteCorruption):
+                atomic_json_save(path, [2], durable=True)
+        with open(path, "r") as f:
+            assert json.load(f) == [1]
+        assert not path.with_suffix(".json.tmp").exists()
+
     def test_japanese_content(self, tmp_path):
         """日本語が正しく保存される"""
         path = tmp_path / "test.json"
@@ -175,3 +459,44 @@ class TestSafeJsonLoad:
 
         result = safe_json_load(path)
         assert result == []
+
+    @pytest.mark.parametrize("threshold", [0, 1 << 30])
+    def test_mmap_and_read_paths_agree(self, tmp_path, threshold):
+        """mmap 経由（閾値以上）と通常読み込みで同じ結果、破損時はどちらも復元"""
+        path = tmp_path / "data.json"
+        data = [{"id": str(i), "text": "テキスト" * 10} for i in range(100)]
+        path.write_bytes(json_dumps(data))
+        with patch("src.utils.MMAP_LOAD_THRESHOLD", threshold):
+            assert safe_json_load(path) == data
+            path.write_text("{bad")
+            assert safe_json_load(path) == []
+
+
+# ============================================================
+# json_dumps / json_loads テスト
+# ============================================================
+class TestJsonHelpers:
+
+    DATA = {"キー": ["値", 1, 2.0, None, True], "nested": {"a": {}}}
+
+    def test_matches_stdlib_format(self):
+        """標準jsonのindent=2・ensure_ascii=Falseと同じ出力"""
+        expected = json.dumps(self.DATA, ensure_ascii=False, indent=2)
+        assert json_dumps(self.DATA).decode("utf-8") == expected
+
+    def test_stdlib_fallback(self):
+        """orjson未インストール時も同じ結果"""
+        with patch("src.utils.orjson", None):
+            raw = json_dumps(self.DATA)
+            assert json_loads(raw) == self.DATA
+        assert raw == json_dumps(self.DATA)
+
+    def test_non_str_keys(self):
+        """数値キーは標準jsonと同様に文字列化"""
+        data = {1: "a", "b": {2: None}}
+        assert json_dumps(data).decode("utf-8") == json.dumps(data, ensure_ascii=False, indent=2)
+
+    def test_decode_error_is_stdlib_compatible(self):
+        """パースエラーは json.JSONDecodeError として捕捉できる"""
+        with pytest.raises(json.JSONDecodeError):
+            json_loads(b"{broken")
@@ -0,0 +1,142 @@
+"""
+テスト — XPoster メディアのチャンクアップロード（INIT / APPEND / FINALIZE / STATUS）
+"""
+import json
+from unittest.mock import MagicMock, patch
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+import responses
+
+from src.post.x_poster import XPoster
+
+UPLOAD_URL = XPoster.UPLOAD_URL
+MEDIA_ID = "777"
+
+
+def _command(request) -> str:
+    """アップロードリクエストの command（フォーム・マルチパート・クエリのいずれか）"""
+    query = parse_qs(urlsplit(request.url).query)
+    if "command" in query:
+        return query["command"][0]
+    body = request.body or b""
+    if isinstance(body, str):
+        body = body.encode()
+    for command in ("INIT", "APPEND", "FINALIZE"):
+        if command.encode() in body:
+            return command
+    return ""
+
+
+class TestChunkedUpload:
+    """チャンクアップロードのテスト（X API は responses でモック）"""
+
+    @pytest.fixture
+    def poster(self):
+        config = MagicMock()
+        config.x_api_key = "key"
+        config.x_api_secret = "secret"
+        config.x_access_token = "token"
+        config.x_access_secret = "token_secret"
+        poster = XPoster(config)
+        # 小さなファイルでも複数チャンクに分かれるようにする
+        poster.CHUNK_SIZE = 4
+        return poster
+
+    @pytest.fixture
+    def video(self, tmp_path):
+        path = tmp_path / "clip.mp4"
+        path.write_bytes(b"0123456789")  # 4 + 4 + 2 バイト → 3チャンク
+        return path
+
+    @pytest.fixture(autouse=True)
+    def no_sleep(self):
+        with patch("src.post.x_poster.time.sleep") as sleep:
+            yield sleep
+
+    @pytest.fixture
+    def api(self):
+        """
+        コマンドごとの応答を差し替えられるアップロードAPI
+
+        api.replies[command] に (status, json) のリストを入れると順に返す（最後の応答は繰り返す）。
+        """
+        with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+            rsps.replies = {
+                "INIT": [(202, {"media_id_string": MEDIA_ID})],
+                "APPEND": [(204, None)],
+                "FINALIZE": [(200, {"media_id_string": MEDIA_ID})],
+                "STATUS": [(200, {"processing_info": {"state": "succeeded"}})],
+            }
+            rsps.seen = []
+
+            def reply(request):
+                command = _command(request)
+                rsps.seen.append(command)
+                queue = rsps.replies[command]
+                status, body = queue.pop(0) if len(queue) > 1 else queue[0]
+                return status, {}, "" if body is None else json.dumps(body)
+
+            rsps.add_callback(responses.POST, UPLOAD_URL, callback=reply)
+            rsps.add_callback(responses.GET, UPLOAD_URL, callback=reply)
+            yield rsps
+
+    def test_upload_without_processing(self, poster, video, api):
+        """INIT → APPEND×3 → FINALIZE で media_id を返す（処理待ちなし）"""
+        assert poster.upload_media(str(video)) == MEDIA_ID
+        assert api.seen[0] == "INIT"
+        assert api.seen[1:4] == ["APPEND"] * 3
+        assert api.seen[4:] == ["FINALIZE"]
+
+    def test_waits_for_processing(self, poster, video, api, no_sleep):
+        """FINALIZE が処理中なら STATUS をポーリングして完了を待つ"""
+        api.replies["FINALIZE"] = [(200, {"processing_info": {"state": "pending", "check_after_secs": 2}})]
+        api.replies["STATUS"] = [
+            (200, {"processing_info": {"state": "in_progress", "check_after_secs": 3}}),
+            (200, {"processing_info": {"state": "succeeded"}}),
+        ]
+        assert poster.upload_media(str(video)) == MEDIA_ID
+        assert api.seen.count("STATUS") == 2
+        assert [c.args[0] for c in no_sleep.call_args_list] == [2, 3]
+
+    def test_init_error_raises(self, poster, video, api):
+        """INIT 失敗は例外"""
+        api.replies["INIT"] = [(400, {"errors": [{"message": "bad"}]})]
+        with pytest.raises(RuntimeError, match="INIT"):
+            poster.upload_media(str(video))
+
+    def test_append_error_raises(self, poster, video, api):
+        """APPEND 失敗は例外"""
+        api.replies["APPEND"] = [(500, None)]
+        with pytest.raises(RuntimeError, match="APPEND"):
+            poster.upload_media(str(video))
+
+    def test_finalize_error_raises(self, poster, video, api):
+        """FINALIZE 失敗は例外"""
+        api.replies["FINALIZE"] = [(400, {"errors": []})]
+        with pytest.raises(RuntimeError, match="FINALIZE"):
+            poster.upload_media(str(video))
+
+    def test_status_http_error_raises(self, poster, video, api):
+        """STATUS の HTTP エラーは処理完了扱いにせず例外"""
+        api.replies["FINALIZE"] = [(200, {"processing_info": {"state": "pending", "check_after_secs": 1}})]
+        api.replies["STATUS"] = [(503, None)]
+        with pytest.raises(RuntimeError, match="STATUS"):
+            poster.upload_media(str(video))
+
+    def test_processing_failed_raises(self, poster, video, api):
+        """サーバー側の処理失敗は例外"""
+        api.replies["FINALIZE"] = [(200, {"processing_info": {"state": "pending", "check_after_secs": 1}})]
+        api.replies["STATUS"] = [(200, {"processing_info": {"state": "failed", "error": {"name": "InvalidMedia"}}})]
+        with pytest.raises(RuntimeError, match="処理失敗"):
+            poster.upload_media(str(video))
+
+    def test_processing_timeout_raises(self, poster, video, api):
+        """処理待ちは PROCESSING_TIMEOUT 秒で打ち切る"""
+        poster.PROCESSING_TIMEOUT = 5
+        api.replies["FINALIZE"] = [(200, {"processing_info": {"state": "pending", "check_after_secs": 2}})]
+        api.replies["STATUS"] = [(200, {"processing_info": {"state": "in_progress", "check_after_secs": 2}})]
+        with pytest.raises(RuntimeError, match="タイムアウト"):
+            poster.upload_media(str(video))
+        # 2秒 + 2秒 待った後、次の2秒で上限を超えるので打ち切る
+        assert api.seen.count("STATUS") == 2
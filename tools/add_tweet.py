@@ -29,10 +29,13 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.collect.tweet_parser import TweetParser, is_valid_tweet_url
-from src.collect.queue_manager import QueueManager
 
+# --list で表示するステータスアイコン
+_STATUS_ICON = {"pending": "⏳", "approved": "✅", "skipped": "⏭️", "posted": "📤"}
 
-def main():
+
+def _build_parser() -> argparse.ArgumentParser:
+    """コマンドライン引数パーサーを構築"""
     parser = argparse.ArgumentParser(
         description="海外AIバズツイートをキューに追加",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -53,8 +56,23 @@ def main():
     parser.add_argument("--approve", type=str, help="指定ツイートIDを承認")
     parser.add_argument("--skip", type=str, help="指定ツイートIDをスキップ")
     parser.add_argument("--list", "-l", action="store_true", help="pending一覧を表示")
+    return parser
+
+
+# パーサーはインポート時に1回だけ構築する
+_PARSER = _build_parser()
+
+
+def main():
+    args = _PARSER.parse_args()
+
+    # 引数なしはヘルプのみ（キューの読み込みは不要）
+    if not (args.status or args.list or args.approve_all or args.approve or args.skip or args.url):
+        _PARSER.print_help()
+        return
 
-    args = parser.parse_args()
+    # QueueManager は実際にキューを操作するときだけ読み込む
+    from src.collect.queue_manager import QueueManager
     queue = QueueManager()
 
     # === 状態表示 ===
@@ -74,14 +92,20 @@ def main():
         if not pending:
             print("キューは空です")
             return
+        # 1件ずつ print せず、全行を組み立ててからまとめて書き出す
+        lines = []
         for i, item in enumerate(pending, 1):
-            status_icon = {"pending": "⏳", "approved": "✅", "skipped": "⏭️", "posted": "📤"}.get(item["status"], "❓")
-            text_preview = item.get("text", "")[:50] or "(テキスト未設定)"
-            print(f"  {i}. {status_icon} @{item['author_username']} [{item['tweet_id']}]")
-            print(f"     {text_preview}")
-            if item.get("memo"):
-                print(f"     📝 {item['memo']}")
-            print()
+            tweet_id, author, text, memo, status = (
+                item["tweet_id"], item["author_username"],
+                item.get("text", ""), item.get("memo", ""), item["status"],
+            )
+            status_icon = _STATUS_ICON.get(status, "❓")
+            lines.append(f"  {i}. {status_icon} @{author} [{tweet_id}]")
+            lines.append(f"     {text[:50] or '(テキスト未設定)'}")
+            if memo:
+                lines.append(f"     📝 {memo}")
+            lines.append("")
+        sys.stdout.write("\n".join(lines) + "\n")
         return
 
     # === 一括承認 ===
@@ -107,10 +131,6 @@ def main():
         return
 
     # === URL追加 ===
-    if not args.url:
-        parser.print_help()
-        return
-
     url = args.url.strip()
 
     if not is_valid_tweet_url(url):
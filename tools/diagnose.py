@@ -4,6 +4,15 @@
 """
 import os, json, base64
 
+# 認証情報は1回だけ読み取り、各セクションで使い回す
+env = {k: os.environ.get(k, "") for k in (
+    "X_API_KEY",
+    "X_API_SECRET",
+    "X_ACCOUNT_1_ACCESS_TOKEN",
+    "X_ACCOUNT_1_ACCESS_SECRET",
+    "TWITTER_BEARER_TOKEN",
+)}
+
 print("🏥 X API 投稿403 — 詳細診断")
 print("=" * 60)
 
@@ -11,11 +20,15 @@ print("=" * 60)
 print("\n[1] OAuth1Session 認証詳細")
 from requests_oauthlib import OAuth1Session
 session = OAuth1Session(
-    os.getenv("X_API_KEY"),
-    client_secret=os.getenv("X_API_SECRET"),
-    resource_owner_key=os.getenv("X_ACCOUNT_1_ACCESS_TOKEN"),
-    resource_owner_secret=os.getenv("X_ACCOUNT_1_ACCESS_SECRET"),
+    env["X_API_KEY"],
+    client_secret=env["X_API_SECRET"],
+    resource_owner_key=env["X_ACCOUNT_1_ACCESS_TOKEN"],
+    resource_owner_secret=env["X_ACCOUNT_1_ACCESS_SECRET"],
 )
+# [1][3][5] の GET/POST/DELETE は同じ api.twitter.com への接続を使い回す（TLSハンドシェイクは初回のみ）
+# 診断結果を歪めないよう自動リトライはしない
+from requests.adapters import HTTPAdapter
+session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=0))
 
 # GET /2/users/me
 resp = session.get("https://api.twitter.com/2/users/me")
@@ -28,7 +41,7 @@ if resp.status_code == 200:
 # 2. アプリ情報確認（Bearer Token経由）
 print("\n[2] Bearer Token での読み取りテスト")
 import tweepy
-bt = os.getenv("TWITTER_BEARER_TOKEN", "")
+bt = env["TWITTER_BEARER_TOKEN"]
 client = tweepy.Client(bearer_token=bt)
 try:
     tweet = client.get_tweet("1585841080431321088", tweet_fields=["public_metrics"])
@@ -80,11 +93,13 @@ else:
 print("\n[4] tweepy.Client (OAuth 1.0a User Context) でのPOSTテスト")
 try:
     user_client = tweepy.Client(
-        consumer_key=os.getenv("X_API_KEY"),
-        consumer_secret=os.getenv("X_API_SECRET"),
-        access_token=os.getenv("X_ACCOUNT_1_ACCESS_TOKEN"),
-        access_token_secret=os.getenv("X_ACCOUNT_1_ACCESS_SECRET"),
+        consumer_key=env["X_API_KEY"],
+        consumer_secret=env["X_API_SECRET"],
+        access_token=env["X_ACCOUNT_1_ACCESS_TOKEN"],
+        access_token_secret=env["X_ACCOUNT_1_ACCESS_SECRET"],
     )
+    # [2] の Bearer クライアントと接続を共有する（tweepy は認証をリクエストごとに付与するため安全）
+    user_client.session = client.session
     test_text2 = f"🧪 tweepy診断 {int(time.time())}"
     result = user_client.create_tweet(text=test_text2)
     if result and result.data:
@@ -3,10 +3,206 @@
 操作リクエスト処理の診断スクリプト
 
 Firestoreの状態を確認し、操作リクエストが拾われない原因を特定する。
+Firebase初期化後の各チェック（3〜7）は互いに独立した読み取りのみなので並列に実行し、
+出力はチェックごとにまとめて番号順に表示する。
 """
 import os
 import sys
 import json
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+# 並列実行するチェックの最大数（Firestore への同時リクエスト数）
+CHECK_WORKERS = 4
+
+# 確認する環境変数（ENV_SHOWN は値をそのまま表示、それ以外は設定有無のみ）
+ENV_KEYS = (
+    "FIREBASE_CREDENTIALS_BASE64",
+    "FIREBASE_UID",
+    "X_API_KEY",
+    "X_API_SECRET",
+    "X_ACCOUNT_1_ACCESS_TOKEN",
+    "X_ACCOUNT_1_ACCESS_SECRET",
+    "TWITTER_BEARER_TOKEN",
+    "GEMINI_API_KEY",
+)
+ENV_SHOWN = {"FIREBASE_UID"}
+
+
+@dataclass(slots=True)
+class EnvStatus:
+    """環境変数1件の確認結果"""
+    name: str
+    present: bool
+    display: str
+
+    def __str__(self) -> str:
+        return f"  {'✅' if self.present else '❌'} {self.name}: {self.display}"
+
+
+def _env_statuses(env: dict[str, str]) -> list[EnvStatus]:
+    """環境変数スナップショットから表示用の確認結果を作る（秘密情報は値を出さない）"""
+    return [
+        EnvStatus(k, bool(v), (v if k in ENV_SHOWN else "設定済み") if v else "未設定")
+        for k, v in env.items()
+    ]
+
+
+def _check_users(db, fc, firebase_uid: str) -> list[str]:
+    """3. usersコレクション確認"""
+    out = ["\n--- 3. usersコレクション確認 ---"]
+    try:
+        users = list(db.collection("users").stream())
+        out.append(f"  📊 usersドキュメント数: {len(users)}")
+        for u in users:
+            data = u.to_dict() or {}
+            out.append(f"    - {u.id}: {json.dumps({k: str(v)[:50] for k, v in data.items()}, ensure_ascii=False)}")
+    except Exception as e:
+        out.append(f"  ❌ usersコレクション読み取り失敗: {e}")
+    return out
+
+
+def _check_uid_operations(db, fc, firebase_uid: str) -> list[str]:
+    """4. FIREBASE_UIDで直接取得"""
+    out = [f"\n--- 4. FIREBASE_UID直接取得 (uid={firebase_uid[:12]}...) ---"]
+    if not firebase_uid:
+        out.append("  ⚠️ FIREBASE_UID未設定")
+        return out
+    try:
+        # ユーザードキュメント存在確認（存在判定に必要なのは応答のみなので、表示する2項目だけ取得）
+        user_doc = db.collection("users").document(firebase_uid).get(field_paths=["role", "displayName"])
+        out.append(f"  📄 users/{firebase_uid[:12]}... ドキュメント存在: {user_doc.exists}")
+        if user_doc.exists:
+            data = user_doc.to_dict() or {}
+            out.append(f"    role={data.get('role', '?')}, display={data.get('displayName', '?')}")
+
+        # サブコレクション確認
+        ops = list(
+            db.collection("users").document(firebase_uid)
+            .collection("operation_requests")
+            .select(["status", "command", "requested_by", "requested_at"])
+            .stream()
+        )
+        out.append(f"  📋 operation_requests数（全件）: {len(ops)}")
+        for op in ops[-5:]:  # 最新5件
+            d = op.to_dict()
+            out.append(f"    - [{d.get('status', '?')}] {d.get('command', '?')} "
+                       f"by {d.get('requested_by', '?')} "
+                       f"at {d.get('requested_at', '?')}")
+
+        # pending のみ
+        from google.cloud.firestore_v1.base_query import FieldFilter
+        pending_ops = list(
+            db.collection("users").document(firebase_uid)
+            .collection("operation_requests")
+            .where(filter=FieldFilter("status", "==", "pending"))
+            .select(["command", "status"])
+            .stream()
+        )
+        out.append(f"  ⏳ pending数: {len(pending_ops)}")
+        for op in pending_ops:
+            d = op.to_dict()
+            out.append(f"    - id={op.id} cmd={d.get('command')} status={d.get('status')}")
+
+    except Exception as e:
+        out.append(f"  ❌ エラー: {e}")
+        out.append(traceback.format_exc())
+    return out
+
+
+def _check_pending_operations(db, fc, firebase_uid: str) -> list[str]:
+    """5. get_pending_operations() テスト"""
+    out = ["\n--- 5. get_pending_operations() テスト ---"]
+    try:
+        # uid指定なし（全ユーザー走査）
+        all_pending = fc.get_pending_operations()
+        out.append(f"  📋 uid指定なし: {len(all_pending)}件")
+        for op in all_pending:
+            out.append(f"    - [{op.get('uid', '?')[:8]}] {op.get('command')} status={op.get('status')}")
+    except Exception as e:
+        out.append(f"  ❌ uid指定なし失敗: {e}")
+        out.append(traceback.format_exc())
+
+    try:
+        # uid指定あり
+        if firebase_uid:
+            uid_pending = fc.get_pending_operations(uid=firebase_uid)
+            out.append(f"  📋 uid指定あり: {len(uid_pending)}件")
+            for op in uid_pending:
+                out.append(f"    - {op.get('command')} status={op.get('status')} id={op.get('id')}")
+    except Exception as e:
+        out.append(f"  ❌ uid指定あり失敗: {e}")
+        out.append(traceback.format_exc())
+    return out
+
+
+def _check_api_keys(db, fc, firebase_uid: str) -> list[str]:
+    """6. api_keys確認"""
+    out = ["\n--- 6. api_keys確認 ---"]
+    if not firebase_uid:
+        return out
+    try:
+        keys = fc.get_api_keys(firebase_uid)
+        if keys:
+            out.append(f"  ✅ api_keys取得成功")
+            for k, v in keys.items():
+                masked = str(v)[:8] + "..." if v else "(空)"
+                out.append(f"    - {k}: {masked}")
+        else:
+            out.append("  ⚠️ api_keysドキュメントが存在しません")
+    except Exception as e:
+        out.append(f"  ❌ api_keys取得失敗: {e}")
+    return out
+
+
+def _check_x_credentials(db, fc, firebase_uid: str) -> list[str]:
+    """7. X API認証情報テスト"""
+    out = ["\n--- 7. X API認証テスト ---"]
+    if not firebase_uid:
+        return out
+    try:
+        creds = fc.get_user_x_credentials(firebase_uid)
+        if creds:
+            out.append("  ✅ Firestore X認証情報:")
+            for k, v in creds.items():
+                masked = str(v)[:8] + "..." if v else "(空)"
+                out.append(f"    - {k}: {masked}")
+
+            # 実際にX APIで認証テスト
+            if creds.get("api_key") and creds.get("access_token"):
+                try:
+                    import tweepy
+                    client = tweepy.Client(
+                        consumer_key=creds["api_key"],
+                        consumer_secret=creds["api_secret"],
+                        access_token=creds["access_token"],
+                        access_token_secret=creds["access_token_secret"],
+                        wait_on_rate_limit=True
+                    )
+                    me = client.get_me()
+                    if me and me.data:
+                        out.append(f"  ✅ X API認証成功: @{me.data.username} (id={me.data.id})")
+                    else:
+                        out.append("  ❌ X API認証: get_me()がデータを返しませんでした")
+                except Exception as e:
+                    out.append(f"  ❌ X API認証失敗: {e}")
+        else:
+            out.append("  ⚠️ FirestoreにX認証情報なし")
+    except Exception as e:
+        out.append(f"  ❌ X認証情報取得失敗: {e}")
+    return out
+
+
+# Firebase初期化後に並列実行するチェック（表示はこの順）
+CHECKS = (
+    _check_users,
+    _check_uid_operations,
+    _check_pending_operations,
+    _check_api_keys,
+    _check_x_credentials,
+)
+
 
 def main():
     print("=" * 60)
@@ -15,20 +211,9 @@ def main():
 
     # 1. 環境変数チェック
     print("\n--- 1. 環境変数チェック ---")
-    env_vars = {
-        "FIREBASE_CREDENTIALS_BASE64": bool(os.getenv("FIREBASE_CREDENTIALS_BASE64")),
-        "FIREBASE_UID": os.getenv("FIREBASE_UID", "(未設定)"),
-        "X_API_KEY": bool(os.getenv("X_API_KEY")),
-        "X_API_SECRET": bool(os.getenv("X_API_SECRET")),
-        "X_ACCOUNT_1_ACCESS_TOKEN": bool(os.getenv("X_ACCOUNT_1_ACCESS_TOKEN")),
-        "X_ACCOUNT_1_ACCESS_SECRET": bool(os.getenv("X_ACCOUNT_1_ACCESS_SECRET")),
-        "TWITTER_BEARER_TOKEN": bool(os.getenv("TWITTER_BEARER_TOKEN")),
-        "GEMINI_API_KEY": bool(os.getenv("GEMINI_API_KEY")),
-    }
-    for k, v in env_vars.items():
-        status = "✅" if v and v is not False else "❌"
-        display = v if isinstance(v, str) else ("設定済み" if v else "未設定")
-        print(f"  {status} {k}: {display}")
+    # 環境変数は1回だけ読み取り、以降はこのスナップショットを参照する
+    env = {k: os.environ.get(k, "") for k in ENV_KEYS}
+    print("\n".join(map(str, _env_statuses(env))))
 
     # 2. Firebase初期化
     print("\n--- 2. Firebase初期化 ---")
@@ -41,134 +226,12 @@ def main():
         print(f"  ❌ Firestore接続失敗: {e}")
         return
 
-    # 3. usersコレクション確認
-    print("\n--- 3. usersコレクション確認 ---")
-    try:
-        users = list(db.collection("users").stream())
-        print(f"  📊 usersドキュメント数: {len(users)}")
-        for u in users:
-            data = u.to_dict() or {}
-            print(f"    - {u.id}: {json.dumps({k: str(v)[:50] for k, v in data.items()}, ensure_ascii=False)}")
-    except Exception as e:
-        print(f"  ❌ usersコレクション読み取り失敗: {e}")
-
-    # 4. FIREBASE_UIDで直接取得
-    firebase_uid = os.getenv("FIREBASE_UID", "")
-    print(f"\n--- 4. FIREBASE_UID直接取得 (uid={firebase_uid[:12]}...) ---")
-    if firebase_uid:
-        try:
-            # ユーザードキュメント存在確認
-            user_doc = db.collection("users").document(firebase_uid).get()
-            print(f"  📄 users/{firebase_uid[:12]}... ドキュメント存在: {user_doc.exists}")
-            if user_doc.exists:
-                print(f"    データ: {json.dumps(user_doc.to_dict() or {}, ensure_ascii=False, default=str)[:200]}")
-
-            # サブコレクション確認
-            ops = list(
-                db.collection("users").document(firebase_uid)
-                .collection("operation_requests")
-                .stream()
-            )
-            print(f"  📋 operation_requests数（全件）: {len(ops)}")
-            for op in ops[-5:]:  # 最新5件
-                d = op.to_dict()
-                print(f"    - [{d.get('status', '?')}] {d.get('command', '?')} "
-                      f"by {d.get('requested_by', '?')} "
-                      f"at {d.get('requested_at', '?')}")
-
-            # pending のみ
-            from google.cloud.firestore_v1.base_query import FieldFilter
-            pending_ops = list(
-                db.collection("users").document(firebase_uid)
-                .collection("operation_requests")
-                .where(filter=FieldFilter("status", "==", "pending"))
-                .stream()
-            )
-            print(f"  ⏳ pending数: {len(pending_ops)}")
-            for op in pending_ops:
-                d = op.to_dict()
-                print(f"    - id={op.id} cmd={d.get('command')} status={d.get('status')}")
-
-        except Exception as e:
-            print(f"  ❌ エラー: {e}")
-            import traceback
-            traceback.print_exc()
-    else:
-        print("  ⚠️ FIREBASE_UID未設定")
-
-    # 5. get_pending_operations() テスト
-    print("\n--- 5. get_pending_operations() テスト ---")
-    try:
-        # uid指定なし（全ユーザー走査）
-        all_pending = fc.get_pending_operations()
-        print(f"  📋 uid指定なし: {len(all_pending)}件")
-        for op in all_pending:
-            print(f"    - [{op.get('uid', '?')[:8]}] {op.get('command')} status={op.get('status')}")
-    except Exception as e:
-        print(f"  ❌ uid指定なし失敗: {e}")
-        import traceback
-        traceback.print_exc()
-
-    try:
-        # uid指定あり
-        if firebase_uid:
-            uid_pending = fc.get_pending_operations(uid=firebase_uid)
-            print(f"  📋 uid指定あり: {len(uid_pending)}件")
-            for op in uid_pending:
-                print(f"    - {op.get('command')} status={op.get('status')} id={op.get('id')}")
-    except Exception as e:
-        print(f"  ❌ uid指定あり失敗: {e}")
-        import traceback
-        traceback.print_exc()
-
-    # 6. api_keys確認
-    print("\n--- 6. api_keys確認 ---")
-    if firebase_uid:
-        try:
-            keys = fc.get_api_keys(firebase_uid)
-            if keys:
-                print(f"  ✅ api_keys取得成功")
-                for k, v in keys.items():
-                    masked = str(v)[:8] + "..." if v else "(空)"
-                    print(f"    - {k}: {masked}")
-            else:
-                print("  ⚠️ api_keysドキュメントが存在しません")
-        except Exception as e:
-            print(f"  ❌ api_keys取得失敗: {e}")
-
-    # 7. X API認証情報テスト
-    print("\n--- 7. X API認証テスト ---")
-    if firebase_uid:
-        try:
-            creds = fc.get_user_x_credentials(firebase_uid)
-            if creds:
-                print("  ✅ Firestore X認証情報:")
-                for k, v in creds.items():
-                    masked = str(v)[:8] + "..." if v else "(空)"
-                    print(f"    - {k}: {masked}")
-
-                # 実際にX APIで認証テスト
-                if creds.get("api_key") and creds.get("access_token"):
-                    try:
-                        import tweepy
-                        client = tweepy.Client(
-                            consumer_key=creds["api_key"],
-                            consumer_secret=creds["api_secret"],
-                            access_token=creds["access_token"],
-                            access_token_secret=creds["access_token_secret"],
-                            wait_on_rate_limit=True
-                        )
-                        me = client.get_me()
-                        if me and me.data:
-                            print(f"  ✅ X API認証成功: @{me.data.username} (id={me.data.id})")
-                        else:
-                            print("  ❌ X API認証: get_me()がデータを返しませんでした")
-                    except Exception as e:
-                        print(f"  ❌ X API認証失敗: {e}")
-            else:
-                print("  ⚠️ FirestoreにX認証情報なし")
-        except Exception as e:
-            print(f"  ❌ X認証情報取得失敗: {e}")
+    # 3〜7. 読み取りのみのチェックを並列実行（待ち時間は合計ではなく最長のチェック分）
+    firebase_uid = env["FIREBASE_UID"]
+    with ThreadPoolExecutor(max_workers=CHECK_WORKERS) as executor:
+        futures = [executor.submit(check, db, fc, firebase_uid) for check in CHECKS]
+        for future in futures:
+            print("\n".join(future.result()))
 
     print("\n" + "=" * 60)
     print("🏁 診断完了")
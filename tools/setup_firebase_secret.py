@@ -13,7 +13,6 @@ Firebase サービスアカウントキー → GitHub Secret 設定スクリプ
 """
 import base64
 import json
-import shutil
 import subprocess
 import sys
 from pathlib import Path
@@ -37,10 +36,12 @@ def main():
         print(f"❌ ファイルが見つかりません: {json_path}")
         sys.exit(1)
 
+    # ファイルは1回だけ読み、妥当性チェックと Base64 エンコードの両方に使う
+    raw = json_path.read_bytes()
+
     # JSONの妥当性チェック
     try:
-        with open(json_path, "r") as f:
-            data = json.load(f)
+        data = json.loads(raw)
 
         required_keys = ["type", "project_id", "private_key_id", "private_key", "client_email"]
         missing = [k for k in required_keys if k not in data]
@@ -55,15 +56,14 @@ def main():
         sys.exit(1)
 
     # Base64エンコード
-    with open(json_path, "rb") as f:
-        raw = f.read()
     b64_encoded = base64.b64encode(raw).decode("utf-8")
 
     print(f"📦 Base64エンコード: {len(b64_encoded)} 文字 (mod4={len(b64_encoded) % 4})")
 
-    # ローカルにコピー
+    # ローカルにコピー（読み込み済みの内容をそのまま書き出す。秘密鍵なので所有者のみ読み書き可にする）
     local_path = PROJECT_ROOT / "config" / "firebase-service-account.json"
-    shutil.copy2(json_path, local_path)
+    local_path.write_bytes(raw)
+    local_path.chmod(0o600)
     print(f"📁 ローカルにコピー: {local_path}")
 
     # .gitignore に追加されているか確認
@@ -78,17 +78,17 @@ def main():
     # GitHub Secret に設定
     print("\n🔐 GitHub Secret (FIREBASE_CREDENTIALS_BASE64) を設定中...")
     try:
+        # Base64 は ASCII のみなのでバイト列のまま渡す（stdout は端末へそのまま流し、stderr だけ受け取る）
         result = subprocess.run(
             ["gh", "secret", "set", "FIREBASE_CREDENTIALS_BASE64"],
-            input=b64_encoded,
-            capture_output=True,
-            text=True,
+            input=b64_encoded.encode("ascii"),
+            stderr=subprocess.PIPE,
             timeout=30,
         )
         if result.returncode == 0:
             print("✅ GitHub Secret を設定しました！")
         else:
-            print(f"❌ GitHub Secret 設定エラー: {result.stderr}")
+            print(f"❌ GitHub Secret 設定エラー: {result.stderr.decode(errors='replace')}")
             print(f"\n💡 手動で設定する場合:")
             print(f"   echo '{b64_encoded[:20]}...' | gh secret set FIREBASE_CREDENTIALS_BASE64")
     except FileNotFoundError:
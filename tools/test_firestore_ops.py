@@ -11,10 +11,29 @@ GitHub Actions で実行して、以下を検証する:
 """
 import os
 import sys
-import json
-import base64
-import re
-import tempfile
+from pathlib import Path
+
+# プロジェクトルートをパスに追加（認証情報のデコード・初期化は本番の FirestoreClient と共通）
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# 初期化済みの Firestore クライアント（プロセス内で1回だけ初期化し、全ステップで使い回す）
+_DB = None
+
+
+def _get_db(creds_b64: str):
+    """Firestore クライアントを取得（初回のみ本番と同じ FirestoreClient で初期化）"""
+    global _DB
+    if _DB is not None:
+        return _DB
+
+    from src.firestore.firestore_client import FirestoreClient, _certificate_from_base64
+
+    # Certificate は指紋ごとにキャッシュされるため、FirestoreClient 側の初期化でも再デコードしない
+    cred = _certificate_from_base64(creds_b64)
+    print(f"✅ Base64デコード成功 (project: {cred.project_id})")
+    _DB = FirestoreClient()._get_db()
+    return _DB
+
 
 def main():
     print("=" * 60)
@@ -39,25 +58,7 @@ def main():
     # ---- Step 2: Firebase初期化 ----
     print("\n--- Step 2: Firebase初期化 ---")
     try:
-        import firebase_admin
-        from firebase_admin import credentials, firestore
-
-        # Base64デコード
-        b64str = re.sub(r'\s+', '', creds_b64).rstrip('=')
-        missing = len(b64str) % 4
-        if missing:
-            b64str += '=' * (4 - missing)
-        cred_json = base64.b64decode(b64str, validate=False).decode("utf-8")
-        cred_dict = json.loads(cred_json)
-        print(f"✅ Base64デコード成功 (project: {cred_dict.get('project_id', '?')})")
-
-        # 初期化
-        try:
-            app = firebase_admin.get_app()
-        except ValueError:
-            cred = credentials.Certificate(cred_dict)
-            app = firebase_admin.initialize_app(cred)
-        db = firestore.client()
+        db = _get_db(creds_b64)
         print("✅ Firestore client 初期化成功")
     except Exception as e:
         print(f"❌ Firebase初期化エラー: {e}")
@@ -67,34 +68,39 @@ def main():
     print("\n--- Step 3: users コレクション ---")
     user_uids = []
     try:
-        users = list(db.collection("users").stream())
-        print(f"📋 users コレクション: {len(users)} ドキュメント")
-        for u in users:
+        # 表示する2項目だけを射影し、ページが届いた順に表示する（全件をリストに溜めない）
+        for u in db.collection("users").select(["role", "displayName"]).stream():
             data = u.to_dict()
             user_uids.append(u.id)
             print(f"  - {u.id} (role={data.get('role', '?')}, display={data.get('displayName', '?')})")
+        print(f"📋 users コレクション: {len(user_uids)} ドキュメント")
     except Exception as e:
         print(f"❌ users 取得エラー: {e}")
 
-    # ---- Step 4: 全ユーザーの operation_requests を確認 ----
-    print(f"\n--- Step 4: 全ユーザーの operation_requests ---")
-    for uid in user_uids:
-        try:
-            ops = list(
-                db.collection("users").document(uid)
-                .collection("operation_requests")
-                .limit(20)
-                .stream()
-            )
-            if ops:
-                print(f"\n  👤 {uid}: {len(ops)} 件")
-                for doc in ops:
-                    data = doc.to_dict()
-                    print(f"    - id={doc.id}, status={data.get('status')}, cmd={data.get('command')}, by={data.get('requested_by')}, at={data.get('requested_at')}")
-            else:
-                print(f"  👤 {uid}: 0 件")
-        except Exception as e:
-            print(f"  ❌ {uid}: エラー: {e}")
+    # ---- Step 4: 全ユーザーの pending operation_requests（本番と同じクエリ） ----
+    # status / requested_at の絞り込み・並べ替えは Firestore 側で行う
+    # （firestore.indexes.json の複合インデックス status + requested_at を使用）
+    print(f"\n--- Step 4: 全ユーザーの pending operation_requests ---")
+    try:
+        from google.cloud.firestore_v1.base_query import FieldFilter
+        ops = (
+            db.collection_group("operation_requests")
+            .where(filter=FieldFilter("status", "==", "pending"))
+            .order_by("requested_at")
+            .select(["status", "command", "requested_by", "requested_at"])
+            .limit(20)
+            .stream()
+        )
+        n = 0
+        for doc in ops:
+            n += 1
+            data = doc.to_dict()
+            # パスから uid を抽出: users/{uid}/operation_requests/{doc_id}
+            uid = doc.reference.path.split("/")[1]
+            print(f"    - [{uid}] id={doc.id}, cmd={data.get('command')}, by={data.get('requested_by')}, at={data.get('requested_at')}")
+        print(f"📋 pending: {n} 件（古い順、最大20件）")
+    except Exception as e:
+        print(f"  ❌ pending 取得エラー（インデックス未作成の可能性）: {e}")
 
     # ---- Step 5: FIREBASE_UID と実データの一致確認 ----
     if firebase_uid:
@@ -111,38 +117,24 @@ def main():
         print(f"\n--- Step 6: テスト書き込み＆読み戻し (uid={test_uid}) ---")
         try:
             from google.cloud import firestore as fs_module
-            test_ref = (
-                db.collection("users").document(test_uid)
-                .collection("operation_requests")
-                .document("test_doc_001")
-            )
-            test_ref.set({
+            # 同じドキュメント参照を書き込み・読み戻し・削除で使い回す
+            test_ref = db.collection("users").document(test_uid).collection("operation_requests").document("test_doc_001")
+            write_result = test_ref.set({
                 "command": "export-dashboard",
                 "status": "pending",
                 "requested_at": fs_module.SERVER_TIMESTAMP,
                 "requested_by": "test_script",
                 "requested_by_uid": test_uid,
             })
-            print("✅ テストドキュメント書き込み成功")
+            # set() は commit 完了後に戻るため、update_time が書き込み成功の確認になる
+            print(f"✅ テストドキュメント書き込み成功 (update_time={write_result.update_time})")
 
-            # 読み戻し
-            test_doc = test_ref.get()
-            if test_doc.exists:
-                print(f"✅ 読み戻し成功: {test_doc.to_dict()}")
+            # 読み戻し: 書き込んだドキュメントをキーで直接取得し status だけ確認（クエリ走査・インデックス反映待ちを避ける）
+            snap = test_ref.get(field_paths=["status"])
+            if snap.exists and snap.get("status") == "pending":
+                print("✅ 読み戻し成功（status=pending）")
             else:
-                print("❌ 書き込んだのに読み戻せない")
-
-            # pendingとして取得できるか（FieldFilter版）
-            from google.cloud.firestore_v1.base_query import FieldFilter
-            pending_after = list(
-                db.collection("users").document(test_uid)
-                .collection("operation_requests")
-                .where(filter=FieldFilter("status", "==", "pending"))
-                .limit(10)
-                .stream()
-            )
-            found = any(d.id == "test_doc_001" for d in pending_after)
-            print(f"{'✅' if found else '❌'} pending クエリで{'見つかった' if found else '見つからなかった'}")
+                print(f"❌ 読み戻し失敗 (exists={snap.exists})")
 
             # 削除
             test_ref.delete()
@@ -7,40 +7,20 @@ Step 2: tweepy.Client で get_me() (v2 OAuth1.0a)
 Step 3: OAuth1Session で GET /2/users/me (requests-oauthlib)
 Step 4: Bearer Token で GET /2/users/me
 Step 5: 投稿権限テスト (実際には投稿しない)
+
+Step 2 以降は互いに独立した疎通確認なので並列に実行し、出力はステップ順に表示する。
 """
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
+# 並列実行するステップの最大数（X API への同時リクエスト数）
+STEP_WORKERS = 5
 
-def main():
-    print("=" * 60)
-    print("🧪 X API認証 診断テスト")
-    print("=" * 60)
-
-    # ---- Step 1: 環境変数確認 ----
-    print("\n--- Step 1: 環境変数 ---")
-    keys = {
-        "X_API_KEY": os.environ.get("X_API_KEY", ""),
-        "X_API_SECRET": os.environ.get("X_API_SECRET", ""),
-        "X_ACCOUNT_1_ACCESS_TOKEN": os.environ.get("X_ACCOUNT_1_ACCESS_TOKEN", ""),
-        "X_ACCOUNT_1_ACCESS_SECRET": os.environ.get("X_ACCOUNT_1_ACCESS_SECRET", ""),
-        "TWITTER_BEARER_TOKEN": os.environ.get("TWITTER_BEARER_TOKEN", ""),
-    }
-    all_ok = True
-    for k, v in keys.items():
-        if v:
-            # 最初と最後の数文字だけ表示してマスク
-            masked = v[:4] + "..." + v[-4:] if len(v) > 10 else "***"
-            print(f"  ✅ {k}: {masked} (len={len(v)})")
-        else:
-            print(f"  ❌ {k}: 未設定")
-            all_ok = False
-
-    if not all_ok:
-        print("\n❌ 必要な環境変数が未設定です。GitHub Secrets を確認してください。")
 
-    # ---- Step 2: tweepy v2 OAuth1.0a で get_me() ----
-    print("\n--- Step 2: tweepy.Client.get_me() (OAuth1.0a) ---")
+def _step_tweepy_get_me(keys: dict) -> list[str]:
+    """Step 2: tweepy v2 OAuth1.0a で get_me()"""
+    out = ["\n--- Step 2: tweepy.Client.get_me() (OAuth1.0a) ---"]
     try:
         import tweepy
         client = tweepy.Client(
@@ -52,17 +32,20 @@ def main():
         )
         me = client.get_me()
         if me and me.data:
-            print(f"  ✅ 認証成功: @{me.data.username} (id={me.data.id})")
+            out.append(f"  ✅ 認証成功: @{me.data.username} (id={me.data.id})")
         else:
-            print(f"  ❌ get_me() が空を返した: {me}")
+            out.append(f"  ❌ get_me() が空を返した: {me}")
     except tweepy.TweepyException as e:
-        print(f"  ❌ TweepyException: {e}")
-        print(f"     → HTTPStatus: {getattr(e, 'response', None) and e.response.status_code}")
+        out.append(f"  ❌ TweepyException: {e}")
+        out.append(f"     → HTTPStatus: {getattr(e, 'response', None) and e.response.status_code}")
     except Exception as e:
-        print(f"  ❌ 予期しないエラー: {e}")
+        out.append(f"  ❌ 予期しないエラー: {e}")
+    return out
+
 
-    # ---- Step 3: requests-oauthlib で /2/users/me ----
-    print("\n--- Step 3: OAuth1Session で GET /2/users/me ---")
+def _step_oauth1_get_me(keys: dict) -> list[str]:
+    """Step 3: requests-oauthlib で /2/users/me"""
+    out = ["\n--- Step 3: OAuth1Session で GET /2/users/me ---"]
     try:
         from requests_oauthlib import OAuth1Session
         session = OAuth1Session(
@@ -72,17 +55,20 @@ def main():
             resource_owner_secret=keys["X_ACCOUNT_1_ACCESS_SECRET"],
         )
         resp = session.get("https://api.twitter.com/2/users/me")
-        print(f"  HTTP {resp.status_code}")
+        out.append(f"  HTTP {resp.status_code}")
         if resp.status_code == 200:
             data = resp.json().get("data", {})
-            print(f"  ✅ 認証成功: @{data.get('username')} (id={data.get('id')})")
+            out.append(f"  ✅ 認証成功: @{data.get('username')} (id={data.get('id')})")
         else:
-            print(f"  ❌ エラー: {resp.text[:300]}")
+            out.append(f"  ❌ エラー: {resp.text[:300]}")
     except Exception as e:
-        print(f"  ❌ 予期しないエラー: {e}")
+        out.append(f"  ❌ 予期しないエラー: {e}")
+    return out
 
-    # ---- Step 4: Bearer Token で GET /2/users/me ----
-    print("\n--- Step 4: Bearer Token で GET /2/users/me ---")
+
+def _step_bearer_get_me(keys: dict) -> list[str]:
+    """Step 4: Bearer Token で GET /2/users/me"""
+    out = ["\n--- Step 4: Bearer Token で GET /2/users/me ---"]
     bearer = keys["TWITTER_BEARER_TOKEN"]
     if bearer:
         try:
@@ -91,32 +77,38 @@ def main():
                 "https://api.twitter.com/2/users/me",
                 headers={"Authorization": f"Bearer {bearer}"},
             )
-            print(f"  HTTP {resp.status_code}")
+            out.append(f"  HTTP {resp.status_code}")
             if resp.status_code == 200:
                 data = resp.json().get("data", {})
-                print(f"  ✅ Bearer認証成功: @{data.get('username')}")
+                out.append(f"  ✅ Bearer認証成功: @{data.get('username')}")
             else:
-                print(f"  ❌ エラー: {resp.text[:300]}")
+                out.append(f"  ❌ エラー: {resp.text[:300]}")
         except Exception as e:
-            print(f"  ❌ 予期しないエラー: {e}")
+            out.append(f"  ❌ 予期しないエラー: {e}")
     else:
-        print("  ⚠️ TWITTER_BEARER_TOKEN未設定 → スキップ")
+        out.append("  ⚠️ TWITTER_BEARER_TOKEN未設定 → スキップ")
+    return out
+
 
-    # ---- Step 5: アプリ情報確認（API Key の組み合わせが正しいか） ----
-    print("\n--- Step 5: リクエストトークン取得（API Key/Secretの疎通確認） ---")
+def _step_request_token(keys: dict) -> list[str]:
+    """Step 5: アプリ情報確認（API Key の組み合わせが正しいか）"""
+    out = ["\n--- Step 5: リクエストトークン取得（API Key/Secretの疎通確認） ---"]
     try:
         from requests_oauthlib import OAuth1Session
         # request_token エンドポイント — Bearer不要、API Key/Secretのみで認証
         oauth = OAuth1Session(keys["X_API_KEY"], client_secret=keys["X_API_SECRET"])
         resp = oauth.fetch_request_token("https://api.twitter.com/oauth/request_token")
-        print(f"  ✅ API Key/Secret は有効 (oauth_token: {resp.get('oauth_token', '')[:10]}...)")
+        out.append(f"  ✅ API Key/Secret は有効 (oauth_token: {resp.get('oauth_token', '')[:10]}...)")
     except Exception as e:
-        print(f"  ❌ API Key/Secret エラー: {e}")
-        print(f"     → API KeyとSecretが間違っているか、アプリが無効化されている可能性")
+        out.append(f"  ❌ API Key/Secret エラー: {e}")
+        out.append(f"     → API KeyとSecretが間違っているか、アプリが無効化されている可能性")
+    return out
 
-    # ---- Step 6: OAuth1Session で POST /2/tweets（認証テスト） ----
-    print("\n--- Step 6: OAuth1Session で POST /2/tweets（認証のみ確認、空テストで判定） ---")
-    print("  ℹ️ 空テキストで送信 → 401=認証失敗, 400=認証OK（内容エラー）, 403=権限不足")
+
+def _step_post_auth(keys: dict) -> list[str]:
+    """Step 6: OAuth1Session で POST /2/tweets（認証テスト）"""
+    out = ["\n--- Step 6: OAuth1Session で POST /2/tweets（認証のみ確認、空テストで判定） ---"]
+    out.append("  ℹ️ 空テキストで送信 → 401=認証失敗, 400=認証OK（内容エラー）, 403=権限不足")
     try:
         from requests_oauthlib import OAuth1Session
         session6 = OAuth1Session(
@@ -129,19 +121,72 @@ def main():
             "https://api.twitter.com/2/tweets",
             json={"text": ""},  # 意図的に空 → 認証OKなら400が返る
         )
-        print(f"  HTTP {resp6.status_code}: {resp6.text[:200]}")
+        out.append(f"  HTTP {resp6.status_code}: {resp6.text[:200]}")
         if resp6.status_code == 401:
-            print("  ❌ POST 401: OAuth1.0a 認証失敗 → APIキー/アクセストークンを確認してください")
+            out.append("  ❌ POST 401: OAuth1.0a 認証失敗 → APIキー/アクセストークンを確認してください")
         elif resp6.status_code == 403:
-            print("  ❌ POST 403: アクセス権限なし → X Developer Portal のアプリ権限を確認")
+            out.append("  ❌ POST 403: アクセス権限なし → X Developer Portal のアプリ権限を確認")
         elif resp6.status_code == 400:
-            print("  ✅ POST 認証OK！（空テキスト 400エラー）→ 実際の投稿は動作します")
+            out.append("  ✅ POST 認証OK！（空テキスト 400エラー）→ 実際の投稿は動作します")
         elif resp6.status_code in (200, 201):
-            print(f"  ✅ POST 成功（空ツイートが投稿された可能性）: {resp6.text[:100]}")
+            out.append(f"  ✅ POST 成功（空ツイートが投稿された可能性）: {resp6.text[:100]}")
         else:
-            print(f"  ？ HTTP {resp6.status_code} — 詳細: {resp6.text[:200]}")
+            out.append(f"  ？ HTTP {resp6.status_code} — 詳細: {resp6.text[:200]}")
     except Exception as e:
-        print(f"  ❌ 予期しないエラー: {e}")
+        out.append(f"  ❌ 予期しないエラー: {e}")
+    return out
+
+
+# 並列実行するステップ（表示はこの順）
+STEPS = (
+    _step_tweepy_get_me,
+    _step_oauth1_get_me,
+    _step_bearer_get_me,
+    _step_request_token,
+    _step_post_auth,
+)
+
+
+def main():
+    print("=" * 60)
+    print("🧪 X API認証 診断テスト")
+    print("=" * 60)
+
+    # ---- Step 1: 環境変数確認 ----
+    print("\n--- Step 1: 環境変数 ---")
+    keys = {
+        "X_API_KEY": os.environ.get("X_API_KEY", ""),
+        "X_API_SECRET": os.environ.get("X_API_SECRET", ""),
+        "X_ACCOUNT_1_ACCESS_TOKEN": os.environ.get("X_ACCOUNT_1_ACCESS_TOKEN", ""),
+        "X_ACCOUNT_1_ACCESS_SECRET": os.environ.get("X_ACCOUNT_1_ACCESS_SECRET", ""),
+        "TWITTER_BEARER_TOKEN": os.environ.get("TWITTER_BEARER_TOKEN", ""),
+    }
+    all_ok = True
+    for k, v in keys.items():
+        if v:
+            # 最初と最後の数文字だけ表示してマスク
+            masked = v[:4] + "..." + v[-4:] if len(v) > 10 else "***"
+            print(f"  ✅ {k}: {masked} (len={len(v)})")
+        else:
+            print(f"  ❌ {k}: 未設定")
+            all_ok = False
+
+    if not all_ok:
+        print("\n❌ 必要な環境変数が未設定です。GitHub Secrets を確認してください。")
+
+    # スレッド内で requests 系を同時に初回importすると循環importで失敗するため先に読み込む
+    # （未インストールの場合は各ステップ内のimportでエラーとして表示される）
+    try:
+        import tweepy  # noqa: F401
+        import requests_oauthlib  # noqa: F401
+    except ImportError:
+        pass
+
+    # ---- Step 2〜6: 互いに独立した疎通確認を並列実行し、出力はステップ順に表示 ----
+    with ThreadPoolExecutor(max_workers=STEP_WORKERS) as executor:
+        futures = [executor.submit(step, keys) for step in STEPS]
+        for future in futures:
+            print("\n".join(future.result()))
 
     print("\n" + "=" * 60)
     print("📊 診断完了")